@@ -0,0 +1,294 @@
+"""
+Agregación en paralelo para el Sistema de Gestión de Proyectos.
+Modo map-reduce para bases muy grandes: los proyectos se parten en
+fragmentos, cada proceso de un ProcessPoolExecutor calcula los totales
+parciales de su fragmento (proyectos por estado, tareas, horas y sumas por
+cliente) y el proceso principal los combina.
+
+Donde existe fork (Linux), los procesos heredan la colección en memoria y
+solo reciben el tramo de índices a recorrer; en el resto de las plataformas,
+o si los proyectos llegan como un iterable (un archivo leído en streaming,
+el motor SQLite), se envía a cada proceso una versión reducida de sus filas.
+
+Uso:
+    python agregacion.py                  # agrega database.json con todos los núcleos
+    python agregacion.py --procesos 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import persistencia
+from data_manager import VistaProyectos
+from importacion import agrupar_en_lotes
+from utils import crear_agregados_vacios
+
+# Variable de entorno con la cantidad de procesos por defecto
+VARIABLE_PROCESOS = "GESTION_PROCESOS"
+
+# Cantidad máxima de proyectos por fragmento
+PROYECTOS_POR_FRAGMENTO = 50_000
+
+# Fragmentos en vuelo por proceso cuando las filas se envían (acota la memoria)
+FRAGMENTOS_EN_VUELO = 2
+
+# Colección que heredan los procesos creados con fork
+_PROYECTOS_COMPARTIDOS: Optional[Sequence[Mapping[str, Any]]] = None
+
+
+def procesos_configurados(procesos: Optional[int] = None) -> int:
+    """
+    Determina cuántos procesos usar: el valor indicado, la variable
+    GESTION_PROCESOS o la cantidad de núcleos del equipo.
+    
+    Args:
+        procesos (int, optional): Cantidad pedida explícitamente.
+        
+    Returns:
+        int: Cantidad de procesos (al menos 1).
+        
+    Raises:
+        ValueError: Si GESTION_PROCESOS no es un número entero.
+    """
+    if procesos is None:
+        variable = os.environ.get(VARIABLE_PROCESOS)
+        procesos = int(variable) if variable else (os.cpu_count() or 1)
+    return max(1, procesos)
+
+
+def _fila(proyecto: Mapping[str, Any]) -> Tuple[Any, Any, int, int]:
+    """
+    Reduce un proyecto a los campos que intervienen en los totales.
+    
+    Args:
+        proyecto (Mapping[str, Any]): Proyecto completo.
+        
+    Returns:
+        Tuple[Any, Any, int, int]: Estado, cliente, tareas completadas y horas estimadas.
+    """
+    return (
+        proyecto.get("estado"),
+        proyecto.get("cliente"),
+        proyecto.get("tareas_completadas", 0),
+        proyecto.get("horas_estimadas", 0)
+    )
+
+
+def _agregar_filas(filas: Iterable[Tuple[Any, Any, int, int]]) -> Dict[str, Any]:
+    """
+    Calcula los totales de un fragmento a partir de sus filas reducidas.
+    
+    Args:
+        filas (Iterable[Tuple[Any, Any, int, int]]): Filas creadas con _fila.
+        
+    Returns:
+        Dict[str, Any]: Totales con la forma de crear_agregados_vacios y
+        además "por_cliente": {cliente: {"proyectos", "tareas_completadas",
+        "horas_estimadas"}}.
+    """
+    por_estado = crear_agregados_vacios()["por_estado"]
+    por_cliente: Dict[Any, List[int]] = {}
+    total = tareas_totales = horas_totales = 0
+    
+    for estado, cliente, tareas, horas in filas:
+        total += 1
+        tareas_totales += tareas
+        horas_totales += horas
+        por_estado[estado] = por_estado.get(estado, 0) + 1
+        sumas = por_cliente.get(cliente)
+        if sumas is None:
+            por_cliente[cliente] = [1, tareas, horas]
+        else:
+            sumas[0] += 1
+            sumas[1] += tareas
+            sumas[2] += horas
+    
+    return {
+        "total_proyectos": total,
+        "tareas_completadas": tareas_totales,
+        "horas_estimadas": horas_totales,
+        "por_estado": por_estado,
+        "por_cliente": {
+            cliente: {"proyectos": proyectos, "tareas_completadas": tareas, "horas_estimadas": horas}
+            for cliente, (proyectos, tareas, horas) in por_cliente.items()
+        }
+    }
+
+
+def agregados_parciales(proyectos: Iterable[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Calcula los totales de un fragmento de proyectos (la etapa "map").
+    
+    Args:
+        proyectos (Iterable[Mapping[str, Any]]): Proyectos del fragmento.
+        
+    Returns:
+        Dict[str, Any]: Totales parciales, incluidas las sumas por cliente.
+    """
+    return _agregar_filas(map(_fila, proyectos))
+
+
+def _agregar_tramo(tramo: Tuple[int, int]) -> Dict[str, Any]:
+    """
+    Calcula los totales de un tramo de la colección heredada por fork.
+    
+    Args:
+        tramo (Tuple[int, int]): Posiciones de inicio y fin (exclusivo).
+        
+    Returns:
+        Dict[str, Any]: Totales parciales del tramo.
+    """
+    inicio, fin = tramo
+    return agregados_parciales(_PROYECTOS_COMPARTIDOS[inicio:fin])
+
+
+def _sumar_parcial(destino: Dict[str, Any], parcial: Dict[str, Any]) -> None:
+    """
+    Suma los totales de un fragmento sobre los acumulados.
+    
+    Args:
+        destino (Dict[str, Any]): Totales acumulados (se modifica).
+        parcial (Dict[str, Any]): Totales de un fragmento.
+    """
+    for clave in ("total_proyectos", "tareas_completadas", "horas_estimadas"):
+        destino[clave] += parcial[clave]
+    por_estado = destino["por_estado"]
+    for estado, cantidad in parcial["por_estado"].items():
+        por_estado[estado] = por_estado.get(estado, 0) + cantidad
+    por_cliente = destino["por_cliente"]
+    for cliente, sumas in parcial["por_cliente"].items():
+        acumulado = por_cliente.get(cliente)
+        if acumulado is None:
+            por_cliente[cliente] = dict(sumas)
+        else:
+            for clave, valor in sumas.items():
+                acumulado[clave] += valor
+
+
+def combinar_agregados(parciales: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combina los totales parciales de varios fragmentos (la etapa "reduce").
+    
+    Args:
+        parciales (Iterable[Dict[str, Any]]): Resultados de agregados_parciales.
+        
+    Returns:
+        Dict[str, Any]: Totales de todos los fragmentos juntos.
+    """
+    agregados = crear_agregados_vacios()
+    agregados["por_cliente"] = {}
+    for parcial in parciales:
+        _sumar_parcial(agregados, parcial)
+    return agregados
+
+
+def _combinar_en_orden(ejecutor: ProcessPoolExecutor, funcion: Callable[[Any], Dict[str, Any]],
+                       tareas: Iterable[Any], en_vuelo: int) -> Dict[str, Any]:
+    """
+    Reparte las tareas entre los procesos y combina cada resultado a medida
+    que llega, sin tener más de en_vuelo tareas pendientes a la vez.
+    
+    Args:
+        ejecutor (ProcessPoolExecutor): Procesos de trabajo.
+        funcion (Callable): Función que calcula los totales de una tarea.
+        tareas (Iterable[Any]): Argumento de cada tarea.
+        en_vuelo (int): Máximo de tareas enviadas y no combinadas.
+        
+    Returns:
+        Dict[str, Any]: Totales combinados.
+    """
+    pendientes: deque = deque()
+    
+    def resultados():
+        for tarea in tareas:
+            pendientes.append(ejecutor.submit(funcion, tarea))
+            if len(pendientes) >= en_vuelo:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+    
+    return combinar_agregados(resultados())
+
+
+def calcular_agregados_en_paralelo(proyectos: Iterable[Mapping[str, Any]], procesos: Optional[int] = None,
+                                   tamano_fragmento: int = PROYECTOS_POR_FRAGMENTO) -> Dict[str, Any]:
+    """
+    Calcula los totales de los proyectos repartiendo el trabajo entre procesos.
+    Con un solo proceso, o si los proyectos entran en un único fragmento,
+    se calcula en serie sin crear procesos.
+    
+    Args:
+        proyectos (Iterable[Mapping[str, Any]]): Lista o vista en memoria (se
+            comparte por fork) o cualquier iterable (se envía por fragmentos).
+        procesos (int, optional): Cantidad de procesos; ver procesos_configurados.
+        tamano_fragmento (int): Máximo de proyectos por fragmento.
+        
+    Returns:
+        Dict[str, Any]: Totales con la forma de data_manager.obtener_agregados()
+        más "por_cliente".
+    """
+    global _PROYECTOS_COMPARTIDOS
+    
+    procesos = procesos_configurados(procesos)
+    # Solo las colecciones en memoria se comparten: un resultado del motor SQLite
+    # usaría en los procesos hijos una conexión abierta antes del fork
+    compartible = (
+        isinstance(proyectos, (list, tuple, VistaProyectos))
+        and "fork" in multiprocessing.get_all_start_methods()
+    )
+    
+    if compartible:
+        # Fragmentos parejos para que ningún proceso quede sin trabajo
+        tamano_fragmento = max(1, min(tamano_fragmento, -(-len(proyectos) // procesos)))
+        if procesos == 1 or len(proyectos) <= tamano_fragmento:
+            return combinar_agregados([agregados_parciales(proyectos)])
+        
+        tramos = ((inicio, inicio + tamano_fragmento) for inicio in range(0, len(proyectos), tamano_fragmento))
+        _PROYECTOS_COMPARTIDOS = proyectos
+        try:
+            with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("fork")) as ejecutor:
+                return _combinar_en_orden(ejecutor, _agregar_tramo, tramos, procesos * FRAGMENTOS_EN_VUELO)
+        finally:
+            _PROYECTOS_COMPARTIDOS = None
+    
+    if procesos == 1:
+        return combinar_agregados([agregados_parciales(proyectos)])
+    
+    fragmentos = agrupar_en_lotes(map(_fila, proyectos), tamano_fragmento)
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        return _combinar_en_orden(ejecutor, _agregar_filas, fragmentos, procesos * FRAGMENTOS_EN_VUELO)
+
+
+def main(argumentos: List[str]) -> int:
+    """
+    Agrega una instantánea de proyectos leída en streaming y muestra los
+    totales en JSON.
+    
+    Args:
+        argumentos (List[str]): Argumentos (sin el nombre del programa).
+        
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Agregación en paralelo de una base de proyectos.")
+    parser.add_argument("archivo", nargs="?", type=Path, default=persistencia.RUTA_BASE_DATOS)
+    parser.add_argument("--procesos", type=int, help=f"por defecto {VARIABLE_PROCESOS} o un proceso por núcleo")
+    parser.add_argument("--fragmento", type=int, default=PROYECTOS_POR_FRAGMENTO,
+                        help="proyectos por fragmento")
+    args = parser.parse_args(argumentos)
+    
+    with persistencia.LectorInstantanea(args.archivo) as lector:
+        agregados = calcular_agregados_en_paralelo(lector.proyectos(), args.procesos, args.fragmento)
+    print(json.dumps(agregados, ensure_ascii=False, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
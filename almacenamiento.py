@@ -0,0 +1,872 @@
+"""
+Motores de almacenamiento alternativos para el Sistema de Gestión de Proyectos.
+data_manager guarda los proyectos en memoria por defecto; cuando se elige
+otro motor, sus funciones públicas delegan en un objeto con la interfaz
+Almacen y los llamadores (main.py, cli.py, servidor.py) no cambian.
+
+El motor SQLite guarda proyectos, usuarios y metadatos en tablas creadas a
+partir del esquema de database.json, con índices sobre estado, cliente,
+prioridad y fechas. Los filtros y los totales de los reportes se resuelven
+en SQL (WHERE / GROUP BY), sin cargar los proyectos en memoria. La búsqueda
+de texto usa una tabla FTS5 sobre nombre y cliente que los triggers
+mantienen al día.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from derivados import CAMPOS_DERIVADOS, actualizar_derivados
+from persistencia import LectorInstantanea
+from utils import PRIORIDADES_VALIDAS, crear_agregados_vacios, crear_totales_cliente
+
+# Ruta por defecto de la base SQLite, junto a database.json
+RUTA_SQLITE = Path(__file__).parent / "database.sqlite"
+
+# Filas que se leen por cada viaje a la base al recorrer un resultado
+FILAS_POR_LECTURA = 1000
+
+# Columnas propias de la tabla de proyectos; cualquier otro campo se guarda
+# como JSON en la columna "extra"
+_COLUMNAS = (
+    "id",
+    "nombre",
+    "cliente",
+    "estado",
+    "horas_estimadas",
+    "tareas_completadas",
+    "prioridad_nombre",
+    "prioridad_nivel",
+    "fecha_inicio",
+    "fecha_fin",
+    "fecha_actualizacion",
+    "extra"
+)
+_CAMPOS_PROPIOS = frozenset(_COLUMNAS[:6] + ("prioridad",) + _COLUMNAS[8:11])
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS proyectos (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT,
+    cliente TEXT,
+    estado TEXT,
+    horas_estimadas INTEGER NOT NULL DEFAULT 0,
+    tareas_completadas INTEGER NOT NULL DEFAULT 0,
+    prioridad_nombre TEXT,
+    prioridad_nivel INTEGER,
+    fecha_inicio TEXT,
+    fecha_fin TEXT,
+    fecha_actualizacion TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_proyectos_estado ON proyectos (estado);
+CREATE INDEX IF NOT EXISTS idx_proyectos_cliente ON proyectos (cliente);
+CREATE INDEX IF NOT EXISTS idx_proyectos_prioridad ON proyectos (prioridad_nivel);
+CREATE INDEX IF NOT EXISTS idx_proyectos_fecha_inicio ON proyectos (fecha_inicio);
+CREATE INDEX IF NOT EXISTS idx_proyectos_fecha_fin ON proyectos (fecha_fin);
+CREATE VIRTUAL TABLE IF NOT EXISTS proyectos_texto USING fts5(
+    nombre, cliente, content='proyectos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS proyectos_texto_alta AFTER INSERT ON proyectos BEGIN
+    INSERT INTO proyectos_texto (rowid, nombre, cliente) VALUES (new.id, new.nombre, new.cliente);
+END;
+CREATE TRIGGER IF NOT EXISTS proyectos_texto_baja AFTER DELETE ON proyectos BEGIN
+    INSERT INTO proyectos_texto (proyectos_texto, rowid, nombre, cliente)
+    VALUES ('delete', old.id, old.nombre, old.cliente);
+END;
+CREATE TRIGGER IF NOT EXISTS proyectos_texto_cambio AFTER UPDATE OF nombre, cliente ON proyectos BEGIN
+    INSERT INTO proyectos_texto (proyectos_texto, rowid, nombre, cliente)
+    VALUES ('delete', old.id, old.nombre, old.cliente);
+    INSERT INTO proyectos_texto (rowid, nombre, cliente) VALUES (new.id, new.nombre, new.cliente);
+END;
+CREATE TABLE IF NOT EXISTS usuarios (
+    usuario TEXT PRIMARY KEY,
+    contrasena TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+# Porcentaje de avance calculado en SQL, igual que derivados.calcular_porcentaje_avance
+_PROGRESO = (
+    "MIN(CASE WHEN horas_estimadas = 0 THEN 0.0 "
+    "ELSE tareas_completadas * 100.0 / horas_estimadas END, 100.0)"
+)
+
+# Nivel usado para ordenar los proyectos sin prioridad al final
+_NIVEL_SIN_PRIORIDAD = len(PRIORIDADES_VALIDAS) + 1
+
+# Expresiones ORDER BY de los criterios de orden de data_manager
+_NIVEL = f"COALESCE(prioridad_nivel, {_NIVEL_SIN_PRIORIDAD})"
+_ORDENES = {
+    None: ("id",),
+    "prioridad": (_NIVEL, _PROGRESO, "id"),
+    "progreso": (_PROGRESO, _NIVEL, "id")
+}
+
+# Criterios de rango de data_manager.consultar y su condición SQL
+_RANGOS = (
+    ("horas_min", "horas_estimadas >= ?"),
+    ("horas_max", "horas_estimadas <= ?"),
+    ("progreso_min", f"{_PROGRESO} >= ?"),
+    ("progreso_max", f"{_PROGRESO} <= ?"),
+    ("fecha_desde", "fecha_inicio >= ?"),
+    ("fecha_hasta", "fecha_inicio <= ?")
+)
+
+
+def proyecto_a_fila(proyecto: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Convierte un proyecto al orden de columnas de la tabla.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto en formato diccionario.
+        
+    Returns:
+        Tuple[Any, ...]: Valores en el orden de _COLUMNAS.
+    """
+    prioridad = proyecto.get("prioridad") or (None, None)
+    extra = {
+        clave: valor for clave, valor in proyecto.items()
+        if clave not in _CAMPOS_PROPIOS and clave not in CAMPOS_DERIVADOS
+    }
+    return (
+        proyecto.get("id"),
+        proyecto.get("nombre"),
+        proyecto.get("cliente"),
+        proyecto.get("estado"),
+        proyecto.get("horas_estimadas", 0),
+        proyecto.get("tareas_completadas", 0),
+        prioridad[0],
+        prioridad[1],
+        proyecto.get("fecha_inicio"),
+        proyecto.get("fecha_fin"),
+        proyecto.get("fecha_actualizacion"),
+        json.dumps(extra, ensure_ascii=False) if extra else None
+    )
+
+
+def fila_a_proyecto(fila: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Reconstruye el diccionario de un proyecto a partir de una fila y
+    calcula sus campos derivados. Las columnas nulas se omiten, igual que
+    los campos ausentes en memoria.
+    
+    Args:
+        fila (Tuple[Any, ...]): Valores en el orden de _COLUMNAS.
+        
+    Returns:
+        Dict[str, Any]: Proyecto con la prioridad como tupla (nombre, nivel).
+    """
+    (id_proyecto, nombre, cliente, estado, horas_estimadas, tareas_completadas,
+     prioridad_nombre, prioridad_nivel, fecha_inicio, fecha_fin, fecha_actualizacion, extra) = fila
+    proyecto = {
+        "id": id_proyecto,
+        "nombre": nombre,
+        "cliente": cliente,
+        "estado": estado,
+        "horas_estimadas": horas_estimadas,
+        "tareas_completadas": tareas_completadas
+    }
+    if prioridad_nombre is not None:
+        proyecto["prioridad"] = (prioridad_nombre, prioridad_nivel)
+    if fecha_inicio is not None:
+        proyecto["fecha_inicio"] = fecha_inicio
+    if fecha_fin is not None:
+        proyecto["fecha_fin"] = fecha_fin
+    if fecha_actualizacion is not None:
+        proyecto["fecha_actualizacion"] = fecha_actualizacion
+    if extra:
+        proyecto.update(json.loads(extra))
+    actualizar_derivados(proyecto)
+    return proyecto
+
+
+def condiciones_sql(criterios: Dict[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Traduce criterios ya normalizados de data_manager.consultar a una
+    cláusula WHERE parametrizada.
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios; estado, cliente y prioridad
+            llegan como listas (la prioridad como niveles).
+            
+    Returns:
+        Tuple[str, List[Any]]: Condición SQL y sus parámetros.
+    """
+    partes: List[str] = []
+    parametros: List[Any] = []
+    for criterio, columna in (("estado", "estado"), ("cliente", "cliente"), ("prioridad", "prioridad_nivel")):
+        valores = criterios.get(criterio)
+        if valores is None:
+            continue
+        partes.append(f"{columna} IN ({', '.join('?' * len(valores))})")
+        parametros.extend(valores)
+    for criterio, condicion in _RANGOS:
+        if criterios.get(criterio) is not None:
+            partes.append(condicion)
+            parametros.append(criterios[criterio])
+    return " AND ".join(partes) or "1", parametros
+
+
+class Almacen:
+    """
+    Interfaz de un motor de almacenamiento. data_manager delega en estos
+    métodos cuando hay un motor activo; los criterios llegan validados y
+    normalizados. Los resultados de varias filas son secuencias de
+    mapeos de solo lectura, como VistaProyectos.
+    """
+    
+    def cantidad(self) -> int:
+        """
+        Cuenta los proyectos guardados.
+        
+        Returns:
+            int: Cantidad de proyectos guardados.
+        """
+        raise NotImplementedError
+    
+    def contiene(self, id_proyecto: int) -> bool:
+        """
+        Indica si existe un proyecto con el ID dado.
+        
+        Returns:
+            bool: True si existe un proyecto con ese ID.
+        """
+        raise NotImplementedError
+    
+    def ids(self) -> Iterator[int]:
+        """
+        Recorre los IDs de todos los proyectos.
+        
+        Returns:
+            Iterator[int]: IDs de todos los proyectos.
+        """
+        raise NotImplementedError
+    
+    def siguiente_id(self) -> int:
+        """
+        Calcula el primer ID libre.
+        
+        Returns:
+            int: Primer ID libre después del mayor ID guardado.
+        """
+        raise NotImplementedError
+    
+    def agregar(self, proyecto: Dict[str, Any]) -> bool:
+        """
+        Guarda un proyecto si su ID no existe.
+        
+        Returns:
+            bool: True si se guardó, False si el ID ya existía.
+        """
+        raise NotImplementedError
+    
+    def agregar_lote(self, lote: List[Dict[str, Any]]) -> List[int]:
+        """
+        Guarda un lote de proyectos.
+        
+        Returns:
+            List[int]: IDs rechazados por duplicados.
+        """
+        raise NotImplementedError
+    
+    def aplicar_cambios(self, modificados: List[Dict[str, Any]], eliminados: List[int]) -> None:
+        """
+        Reemplaza y elimina proyectos como una sola transacción.
+        
+        Args:
+            modificados (List[Dict[str, Any]]): Versiones nuevas (por ID existente).
+            eliminados (List[int]): IDs a eliminar.
+        """
+        raise NotImplementedError
+    
+    def buscar(self, terminos: List[str], limite: int, prefijo: bool) -> Sequence:
+        """
+        Busca proyectos que contienen todos los términos en el nombre o el cliente.
+        
+        Args:
+            terminos (List[str]): Términos normalizados (ver busqueda.tokenizar).
+            limite (int): Cantidad máxima de resultados.
+            prefijo (bool): True para completar el último término.
+            
+        Returns:
+            Sequence: Proyectos de solo lectura, del más relevante al menos.
+        """
+        raise NotImplementedError
+    
+    def version_datos(self) -> int:
+        """
+        Identifica el estado de los datos para detectar cambios hechos por
+        otras conexiones u otros procesos.
+        
+        Returns:
+            int: Valor que cambia cada vez que se confirman cambios.
+        """
+        raise NotImplementedError
+    
+    def obtener(self, id_proyecto: int) -> Optional[Dict[str, Any]]:
+        """
+        Busca un proyecto por ID.
+        
+        Returns:
+            Optional[Dict[str, Any]]: El proyecto, o None si no existe.
+        """
+        raise NotImplementedError
+    
+    def consultar(self, criterios: Dict[str, Any], orden: Optional[str] = None,
+                  descendente: bool = False, limite: Optional[int] = None) -> Sequence:
+        """
+        Consulta proyectos con los criterios de data_manager.consultar.
+        
+        Returns:
+            Sequence: Proyectos que cumplen los criterios, en el orden pedido.
+        """
+        raise NotImplementedError
+    
+    def explicar(self, criterios: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Describe cómo el motor resolvería una consulta.
+        
+        Returns:
+            Dict[str, Any]: Plan de la consulta, sin ejecutarla.
+        """
+        raise NotImplementedError
+    
+    def por_fecha(self, campo: str, desde: Optional[str], hasta: Optional[str]) -> Sequence:
+        """
+        Obtiene los proyectos con una fecha dentro de un rango.
+        
+        Returns:
+            Sequence: Proyectos con la fecha dentro del rango, en orden cronológico.
+        """
+        raise NotImplementedError
+    
+    def conteos_por_fecha(self, campo: str, desde: Optional[str],
+                          hasta: Optional[str]) -> Iterable[Tuple[str, int, int]]:
+        """
+        Agrupa los proyectos por fecha.
+        
+        Returns:
+            Iterable[Tuple[str, int, int]]: (fecha, proyectos, tareas completadas)
+            por fecha distinta, en orden.
+        """
+        raise NotImplementedError
+    
+    def agregados(self) -> Dict[str, Any]:
+        """
+        Calcula los totales del reporte de productividad.
+        
+        Returns:
+            Dict[str, Any]: Totales con la forma de crear_agregados_vacios.
+        """
+        raise NotImplementedError
+    
+    def agregados_por_cliente(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula los totales de cada cliente.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Totales con la forma de crear_totales_cliente.
+        """
+        raise NotImplementedError
+    
+    def usuarios(self) -> Dict[str, str]:
+        """
+        Obtiene los usuarios guardados.
+        
+        Returns:
+            Dict[str, str]: Usuarios guardados (usuario: contraseña).
+        """
+        raise NotImplementedError
+    
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Obtiene los metadatos guardados.
+        
+        Returns:
+            Dict[str, Any]: Metadatos guardados.
+        """
+        raise NotImplementedError
+    
+    def importar(self, instantanea: LectorInstantanea) -> int:
+        """
+        Carga el contenido de database.json.
+        
+        Args:
+            instantanea (LectorInstantanea): Lector abierto sobre el archivo.
+            
+        Returns:
+            int: Cantidad de proyectos cargados.
+        """
+        raise NotImplementedError
+    
+    def cerrar(self) -> None:
+        """
+        Libera las conexiones o archivos del motor.
+        """
+        raise NotImplementedError
+
+
+class ResultadoSQL(Sequence):
+    """
+    Resultado perezoso de una consulta: no trae filas hasta que se recorre
+    o se recorta, y recortarlo (resultado[a:b]) agrega LIMIT/OFFSET a la
+    consulta en lugar de leer todo. La cantidad de filas se cuenta una vez.
+    """
+    
+    __slots__ = ("_almacen", "_condicion", "_parametros", "_orden", "_rango", "_total")
+    
+    def __init__(self, almacen: "AlmacenSQLite", condicion: str, parametros: List[Any],
+                 orden: str = "id", rango: Optional[range] = None, total: Optional[int] = None):
+        """
+        Crea el resultado.
+        
+        Args:
+            almacen (AlmacenSQLite): Motor que ejecuta la consulta.
+            condicion (str): Cláusula WHERE.
+            parametros (List[Any]): Parámetros de la condición.
+            orden (str): Cláusula ORDER BY.
+            rango (Optional[range]): Posiciones visibles (None = todas).
+            total (Optional[int]): Límite de filas (None = sin límite).
+        """
+        self._almacen = almacen
+        self._condicion = condicion
+        self._parametros = parametros
+        self._orden = orden
+        self._rango = rango
+        self._total = total
+    
+    def _posiciones(self) -> range:
+        """
+        Calcula (una sola vez) el rango de filas visibles.
+        
+        Returns:
+            range: Posiciones visibles dentro del resultado completo.
+        """
+        if self._rango is None:
+            cantidad = self._almacen.contar(self._condicion, self._parametros)
+            if self._total is not None:
+                cantidad = min(cantidad, self._total)
+            self._rango = range(cantidad)
+        return self._rango
+    
+    def __len__(self) -> int:
+        return len(self._posiciones())
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            rango = self._posiciones()[posicion]
+            if rango.step != 1:
+                return [self[indice] for indice in range(*posicion.indices(len(self)))]
+            return ResultadoSQL(self._almacen, self._condicion, self._parametros, self._orden, rango)
+        fila = self._posiciones()[posicion]
+        return MappingProxyType(self._almacen.leer(self._condicion, self._parametros, self._orden, 1, fila)[0])
+    
+    def __iter__(self) -> Iterator[Mapping]:
+        # Una sola consulta: con LIMIT/OFFSET por tramo cada tramo volvería
+        # a saltar todas las filas anteriores y el recorrido sería cuadrático
+        rango = self._posiciones()
+        for proyecto in self._almacen.recorrer(self._condicion, self._parametros, self._orden, len(rango), rango.start):
+            yield MappingProxyType(proyecto)
+    
+    def __repr__(self) -> str:
+        return f"ResultadoSQL(WHERE {self._condicion} ORDER BY {self._orden})"
+
+
+class AlmacenSQLite(Almacen):
+    """
+    Motor de almacenamiento sobre sqlite3 en modo WAL. Las escrituras usan
+    una conexión propia (data_manager las serializa con su bloqueo) y cada
+    hilo lee con su propia conexión, de modo que las lecturas no esperan a
+    las escrituras.
+    """
+    
+    def __init__(self, ruta: Path = RUTA_SQLITE):
+        """
+        Abre (o crea) la base y su esquema.
+        
+        Args:
+            ruta (Path): Ruta del archivo SQLite.
+        """
+        self.ruta = Path(ruta)
+        self._local = threading.local()
+        self._escritura = self._conectar(check_same_thread=False)
+        tenia_texto = self._escritura.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'proyectos_texto'"
+        ).fetchone()
+        self._escritura.executescript(_ESQUEMA)
+        if tenia_texto is None:
+            # Bases creadas antes del índice de texto: se llena con lo existente
+            self._escritura.execute("INSERT INTO proyectos_texto (proyectos_texto) VALUES ('rebuild')")
+        self._escritura.commit()
+    
+    def _conectar(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """
+        Abre una conexión configurada para el motor.
+        
+        Args:
+            check_same_thread (bool): False para la conexión de escritura compartida.
+            
+        Returns:
+            sqlite3.Connection: Conexión abierta.
+        """
+        conexion = sqlite3.connect(str(self.ruta), check_same_thread=check_same_thread)
+        conexion.execute("PRAGMA journal_mode=WAL")
+        conexion.execute("PRAGMA synchronous=NORMAL")
+        return conexion
+    
+    def _lectura(self) -> sqlite3.Connection:
+        """
+        Retorna la conexión de lectura del hilo actual, abriéndola si hace falta.
+        
+        Returns:
+            sqlite3.Connection: Conexión de lectura.
+        """
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = self._local.conexion = self._conectar()
+        return conexion
+    
+    def contar(self, condicion: str, parametros: List[Any]) -> int:
+        """
+        Cuenta las filas que cumplen una condición.
+        
+        Args:
+            condicion (str): Cláusula WHERE.
+            parametros (List[Any]): Parámetros de la condición.
+            
+        Returns:
+            int: Cantidad de filas.
+        """
+        return self._lectura().execute(
+            f"SELECT COUNT(*) FROM proyectos WHERE {condicion}", parametros
+        ).fetchone()[0]
+    
+    def leer(self, condicion: str, parametros: List[Any], orden: str,
+             cantidad: int, desde: int) -> List[Dict[str, Any]]:
+        """
+        Lee un tramo de filas de una consulta.
+        
+        Args:
+            condicion (str): Cláusula WHERE.
+            parametros (List[Any]): Parámetros de la condición.
+            orden (str): Cláusula ORDER BY.
+            cantidad (int): Filas a leer.
+            desde (int): Posición de la primera fila.
+            
+        Returns:
+            List[Dict[str, Any]]: Proyectos leídos.
+        """
+        cursor = self._lectura().execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM proyectos WHERE {condicion} "
+            f"ORDER BY {orden} LIMIT ? OFFSET ?",
+            list(parametros) + [cantidad, desde]
+        )
+        return [fila_a_proyecto(fila) for fila in cursor]
+    
+    def recorrer(self, condicion: str, parametros: List[Any], orden: str,
+                 cantidad: int, desde: int) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre un tramo de filas de una consulta con un solo cursor, trayendo
+        FILAS_POR_LECTURA filas por vez.
+        
+        Args:
+            condicion (str): Cláusula WHERE.
+            parametros (List[Any]): Parámetros de la condición.
+            orden (str): Cláusula ORDER BY.
+            cantidad (int): Filas a recorrer.
+            desde (int): Posición de la primera fila.
+            
+        Yields:
+            Dict[str, Any]: Proyectos en el orden de la consulta.
+        """
+        cursor = self._lectura().execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM proyectos WHERE {condicion} "
+            f"ORDER BY {orden} LIMIT ? OFFSET ?",
+            list(parametros) + [cantidad, desde]
+        )
+        while True:
+            filas = cursor.fetchmany(FILAS_POR_LECTURA)
+            if not filas:
+                return
+            for fila in filas:
+                yield fila_a_proyecto(fila)
+    
+    def cantidad(self) -> int:
+        return self.contar("1", [])
+    
+    def contiene(self, id_proyecto: int) -> bool:
+        return self._lectura().execute(
+            "SELECT 1 FROM proyectos WHERE id = ?", (id_proyecto,)
+        ).fetchone() is not None
+    
+    def ids(self) -> Iterator[int]:
+        for (id_proyecto,) in self._lectura().execute("SELECT id FROM proyectos ORDER BY id"):
+            yield id_proyecto
+    
+    def siguiente_id(self) -> int:
+        return self._lectura().execute("SELECT COALESCE(MAX(id), 0) + 1 FROM proyectos").fetchone()[0]
+    
+    def agregar(self, proyecto: Dict[str, Any]) -> bool:
+        with self._escritura:
+            cursor = self._escritura.execute(
+                f"INSERT OR IGNORE INTO proyectos VALUES ({', '.join('?' * len(_COLUMNAS))})",
+                proyecto_a_fila(proyecto)
+            )
+        return cursor.rowcount == 1
+    
+    def agregar_lote(self, lote: List[Dict[str, Any]]) -> List[int]:
+        """
+        Inserta un lote en una sola transacción con executemany.
+        
+        Args:
+            lote (List[Dict[str, Any]]): Proyectos a insertar.
+            
+        Returns:
+            List[int]: IDs rechazados por existir en la base o repetirse en el lote.
+        """
+        rechazados: List[int] = []
+        nuevos: Dict[Any, Dict[str, Any]] = {}
+        for proyecto in lote:
+            id_proyecto = proyecto.get("id")
+            if id_proyecto is None or id_proyecto in nuevos:
+                rechazados.append(id_proyecto)
+            else:
+                nuevos[id_proyecto] = proyecto
+        
+        # Los IDs ya guardados se buscan en tandas para no exceder el
+        # límite de parámetros de SQLite
+        ids = list(nuevos)
+        for inicio in range(0, len(ids), 500):
+            tanda = ids[inicio:inicio + 500]
+            for (id_proyecto,) in self._escritura.execute(
+                f"SELECT id FROM proyectos WHERE id IN ({', '.join('?' * len(tanda))})", tanda
+            ):
+                rechazados.append(id_proyecto)
+                del nuevos[id_proyecto]
+        
+        with self._escritura:
+            self._escritura.executemany(
+                f"INSERT INTO proyectos VALUES ({', '.join('?' * len(_COLUMNAS))})",
+                (proyecto_a_fila(proyecto) for proyecto in nuevos.values())
+            )
+        return rechazados
+    
+    def aplicar_cambios(self, modificados: List[Dict[str, Any]], eliminados: List[int]) -> None:
+        """
+        Aplica un lote de UPDATE y DELETE con executemany en una sola
+        transacción: si alguna sentencia falla, se revierte todo el lote.
+        
+        Args:
+            modificados (List[Dict[str, Any]]): Versiones nuevas (por ID existente).
+            eliminados (List[int]): IDs a eliminar.
+        """
+        asignaciones = ", ".join(f"{columna} = ?" for columna in _COLUMNAS[1:])
+        with self._escritura:
+            self._escritura.executemany(
+                f"UPDATE proyectos SET {asignaciones} WHERE id = ?",
+                (fila[1:] + fila[:1] for fila in map(proyecto_a_fila, modificados))
+            )
+            self._escritura.executemany(
+                "DELETE FROM proyectos WHERE id = ?", ((id_proyecto,) for id_proyecto in eliminados)
+            )
+    
+    def buscar(self, terminos: List[str], limite: int, prefijo: bool) -> List[Mapping]:
+        if not terminos or limite <= 0:
+            return []
+        # Los términos solo tienen letras y dígitos: entre comillas son literales
+        consulta = " ".join(f'"{termino}"' for termino in terminos) + ("*" if prefijo else "")
+        columnas = ", ".join(f"proyectos.{columna}" for columna in _COLUMNAS)
+        filas = self._lectura().execute(
+            f"SELECT {columnas} FROM proyectos_texto JOIN proyectos ON proyectos.id = proyectos_texto.rowid "
+            f"WHERE proyectos_texto MATCH ? ORDER BY bm25(proyectos_texto, 2.0, 1.0), proyectos.id LIMIT ?",
+            (consulta, limite)
+        )
+        return [MappingProxyType(fila_a_proyecto(fila)) for fila in filas]
+    
+    def version_datos(self) -> int:
+        # PRAGMA data_version cambia cuando otra conexión (incluida la de
+        # escritura de este proceso) confirma cambios en la base
+        return self._lectura().execute("PRAGMA data_version").fetchone()[0]
+    
+    def obtener(self, id_proyecto: int) -> Optional[Dict[str, Any]]:
+        fila = self._lectura().execute(
+            f"SELECT {', '.join(_COLUMNAS)} FROM proyectos WHERE id = ?", (id_proyecto,)
+        ).fetchone()
+        return None if fila is None else fila_a_proyecto(fila)
+    
+    def consultar(self, criterios: Dict[str, Any], orden: Optional[str] = None,
+                  descendente: bool = False, limite: Optional[int] = None) -> ResultadoSQL:
+        """
+        Consulta proyectos con los criterios de data_manager.consultar.
+        
+        Args:
+            criterios (Dict[str, Any]): Criterios normalizados.
+            orden (Optional[str]): Criterio de orden ("prioridad" o "progreso");
+                None mantiene el orden de los IDs.
+            descendente (bool): True para invertir el orden.
+            limite (Optional[int]): Cantidad máxima de filas.
+            
+        Returns:
+            ResultadoSQL: Resultado perezoso.
+        """
+        condicion, parametros = condiciones_sql(criterios)
+        sufijo = " DESC" if descendente else ""
+        clausula = ", ".join(expresion + sufijo for expresion in _ORDENES[orden])
+        return ResultadoSQL(self, condicion, parametros, clausula, total=limite)
+    
+    def explicar(self, criterios: Dict[str, Any]) -> Dict[str, Any]:
+        condicion, parametros = condiciones_sql(criterios)
+        sql = f"SELECT * FROM proyectos WHERE {condicion}"
+        plan = self._lectura().execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+        return {
+            "estrategia": "sqlite",
+            "sql": sql,
+            "parametros": parametros,
+            "plan": [fila[-1] for fila in plan],
+            "candidatos": self.contar(condicion, parametros),
+            "total_proyectos": self.cantidad()
+        }
+    
+    def por_fecha(self, campo: str, desde: Optional[str], hasta: Optional[str]) -> ResultadoSQL:
+        condicion, parametros = _condicion_fechas(campo, desde, hasta)
+        return ResultadoSQL(self, condicion, parametros, f"{campo}, id")
+    
+    def conteos_por_fecha(self, campo: str, desde: Optional[str],
+                          hasta: Optional[str]) -> List[Tuple[str, int, int]]:
+        """
+        Agrupa en SQL los proyectos por fecha: una fila por fecha distinta.
+        
+        Args:
+            campo (str): Columna de fecha.
+            desde (Optional[str]): Fecha mínima, inclusive.
+            hasta (Optional[str]): Fecha máxima, inclusive.
+            
+        Returns:
+            List[Tuple[str, int, int]]: (fecha, proyectos, tareas completadas) en orden.
+        """
+        condicion, parametros = _condicion_fechas(campo, desde, hasta)
+        return self._lectura().execute(
+            f"SELECT {campo}, COUNT(*), COALESCE(SUM(tareas_completadas), 0) FROM proyectos "
+            f"WHERE {condicion} GROUP BY {campo} ORDER BY {campo}",
+            parametros
+        ).fetchall()
+    
+    def agregados(self) -> Dict[str, Any]:
+        """
+        Calcula los totales del reporte con un GROUP BY por estado.
+        
+        Returns:
+            Dict[str, Any]: Totales con la forma de crear_agregados_vacios.
+        """
+        agregados = crear_agregados_vacios()
+        for estado, cantidad, tareas, horas in self._lectura().execute(
+            "SELECT estado, COUNT(*), COALESCE(SUM(tareas_completadas), 0), "
+            "COALESCE(SUM(horas_estimadas), 0) FROM proyectos GROUP BY estado"
+        ):
+            agregados["total_proyectos"] += cantidad
+            agregados["tareas_completadas"] += tareas
+            agregados["horas_estimadas"] += horas
+            agregados["por_estado"][estado] = agregados["por_estado"].get(estado, 0) + cantidad
+        return agregados
+    
+    def agregados_por_cliente(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula los totales por cliente con un GROUP BY por cliente y estado,
+        usando el índice de cliente. El avance se calcula igual que
+        derivados.calcular_porcentaje_avance.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Totales con la forma de crear_totales_cliente.
+        """
+        por_cliente: Dict[str, Dict[str, Any]] = {}
+        for cliente, estado, cantidad, horas, tareas, avance in self._lectura().execute(
+            "SELECT cliente, estado, COUNT(*), COALESCE(SUM(horas_estimadas), 0), "
+            "COALESCE(SUM(tareas_completadas), 0), "
+            "TOTAL(CASE WHEN horas_estimadas = 0 THEN 0.0 "
+            "ELSE MIN(tareas_completadas * 100.0 / horas_estimadas, 100.0) END) "
+            "FROM proyectos GROUP BY cliente, estado"
+        ):
+            totales = por_cliente.get(cliente)
+            if totales is None:
+                totales = por_cliente[cliente] = crear_totales_cliente()
+            totales["proyectos"] += cantidad
+            totales["horas_estimadas"] += horas
+            totales["tareas_completadas"] += tareas
+            totales["suma_avance"] += avance
+            totales["por_estado"][estado] = totales["por_estado"].get(estado, 0) + cantidad
+        return por_cliente
+    
+    def usuarios(self) -> Dict[str, str]:
+        return dict(self._lectura().execute("SELECT usuario, contrasena FROM usuarios"))
+    
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            clave: json.loads(valor)
+            for clave, valor in self._lectura().execute("SELECT clave, valor FROM metadata")
+        }
+    
+    def importar(self, instantanea: LectorInstantanea) -> int:
+        """
+        Carga el contenido de database.json en las tablas, en una sola
+        transacción con executemany. Los proyectos se insertan a medida que
+        se leen del archivo, sin cargarlo completo en memoria.
+        
+        Args:
+            instantanea (LectorInstantanea): Lector abierto sobre el archivo.
+            
+        Returns:
+            int: Cantidad de proyectos insertados.
+        """
+        antes = self.cantidad()
+        with self._escritura:
+            self._escritura.executemany(
+                f"INSERT OR IGNORE INTO proyectos VALUES ({', '.join('?' * len(_COLUMNAS))})",
+                (proyecto_a_fila(proyecto) for proyecto in instantanea.proyectos())
+            )
+            self._escritura.executemany(
+                "INSERT OR REPLACE INTO usuarios VALUES (?, ?)",
+                instantanea.usuarios.items()
+            )
+            self._escritura.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+                ((clave, json.dumps(valor)) for clave, valor in instantanea.metadata.items())
+            )
+        return self.cantidad() - antes
+    
+    def cerrar(self) -> None:
+        self._escritura.close()
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
+
+
+def _condicion_fechas(campo: str, desde: Optional[str], hasta: Optional[str]) -> Tuple[str, List[Any]]:
+    """
+    Arma la condición de un rango de fechas (ambos extremos inclusive).
+    
+    Args:
+        campo (str): Columna de fecha.
+        desde (Optional[str]): Fecha mínima.
+        hasta (Optional[str]): Fecha máxima.
+        
+    Returns:
+        Tuple[str, List[Any]]: Condición SQL y parámetros.
+    """
+    partes, parametros = [f"{campo} IS NOT NULL"], []
+    if desde:
+        partes.append(f"{campo} >= ?")
+        parametros.append(desde)
+    if hasta:
+        partes.append(f"{campo} <= ?")
+        parametros.append(hasta)
+    return " AND ".join(partes), parametros
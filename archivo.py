@@ -0,0 +1,439 @@
+"""
+Archivo de proyectos finalizados para el Sistema de Gestión de Proyectos.
+Los proyectos finalizados hace tiempo casi no se consultan, pero ocupan
+memoria y alargan cada recorrido del almacén. data_manager.archivar_finalizados()
+los mueve a un archivo comprimido (database.archivo.jsonl.gz, junto a
+database.json) y en memoria quedan solo sus totales: globales, por cliente
+y por fecha de inicio y de fin, de modo que los reportes los siguen
+incluyendo sin leer el archivo. También quedan sus IDs, que siguen
+reservados: ninguna alta puede reutilizar el ID de un proyecto archivado.
+
+El archivo es una sucesión de miembros gzip de hasta PROYECTOS_POR_BLOQUE
+proyectos cada uno (JSON Lines). Con el índice de bloques (posición, bytes y
+cantidad) se descomprime solo el bloque que contiene la posición pedida, así
+que recorrer los finalizados página por página lee un bloque por vez.
+"""
+
+import gzip
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Sequence
+from itertools import accumulate, chain
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from derivados import actualizar_derivados, sin_derivados
+from metricas import contar
+from persistencia import deserializar_proyecto
+from utils import acumular_cliente, acumular_proyecto, crear_agregados_vacios
+
+# Proyectos por miembro gzip: la unidad que se descomprime al leer
+PROYECTOS_POR_BLOQUE = 1000
+
+# Bloques descomprimidos que se conservan en memoria
+BLOQUES_EN_CACHE = 4
+
+# Nivel de compresión gzip (1 es el más rápido, 9 el más chico)
+NIVEL_COMPRESION = 6
+
+# Fechas cuyos conteos diarios se conservan para reporte_por_periodo
+CAMPOS_RESUMIDOS = ("fecha_inicio", "fecha_fin")
+
+# Bloque del archivo: posición en bytes, longitud comprimida y cantidad de proyectos
+Bloque = Tuple[int, int, int]
+
+
+def _rangos(ids: Iterable[int]) -> List[List[int]]:
+    """
+    Resume IDs ordenados en rangos inclusivos [primero, último]: los IDs
+    archivados suelen ser consecutivos, así que el resumen queda chico.
+    
+    Args:
+        ids (Iterable[int]): IDs en orden creciente.
+        
+    Returns:
+        List[List[int]]: Rangos inclusivos.
+    """
+    rangos: List[List[int]] = []
+    for id_proyecto in ids:
+        if rangos and rangos[-1][1] + 1 == id_proyecto:
+            rangos[-1][1] = id_proyecto
+        else:
+            rangos.append([id_proyecto, id_proyecto])
+    return rangos
+
+
+class ArchivoProyectos:
+    """
+    Proyectos archivados: el archivo comprimido en disco y, en memoria, sus
+    totales y el índice de bloques. Las escrituras (escribir e incorporar)
+    las hace data_manager con su bloqueo de escritura tomado; las lecturas de
+    bloques pueden venir de varios hilos a la vez.
+    """
+    
+    def __init__(self, ruta: Path, resumen: Optional[Dict[str, Any]] = None):
+        """
+        Abre el archivo a partir del resumen guardado en la instantánea.
+        
+        Args:
+            ruta (Path): Ruta del archivo comprimido.
+            resumen (Optional[Dict[str, Any]]): Resultado de resumen() guardado
+                en los metadatos de database.json; None si no hay archivados.
+        """
+        resumen = resumen or {}
+        self.ruta = Path(ruta)
+        self.agregados: Dict[str, Any] = resumen.get("agregados") or crear_agregados_vacios()
+        self.por_cliente: Dict[str, Dict[str, Any]] = resumen.get("por_cliente", {})
+        por_fecha = resumen.get("por_fecha", {})
+        self.por_fecha: Dict[str, Dict[str, List[int]]] = {
+            campo: por_fecha.get(campo, {}) for campo in CAMPOS_RESUMIDOS
+        }
+        self.bloques: List[Bloque] = [tuple(bloque) for bloque in resumen.get("bloques", [])]
+        self.tamano: int = resumen.get("tamano", 0)
+        # Proyectos acumulados al final de cada bloque, para ubicar una posición
+        self._acumulados = list(accumulate(cantidad for _, _, cantidad in self.bloques))
+        self._cache: OrderedDict = OrderedDict()
+        self._bloqueo = threading.Lock()
+        # IDs archivados en orden, 8 bytes cada uno: siguen reservados para
+        # que ningún alta reutilice el ID de un proyecto archivado
+        self._ids = array("q")
+        if "ids" in resumen:
+            for primero, ultimo in resumen["ids"]:
+                self._ids.extend(range(primero, ultimo + 1))
+        elif self.bloques:
+            # Resumen anterior a los IDs reservados: se leen una sola vez
+            self._ids.extend(sorted(proyecto["id"] for proyecto in self.proyectos()))
+        # Posición en el archivo de cada ID de _ids; se arma en el primer buscar()
+        self._posiciones: Optional[array] = None
+    
+    def __len__(self) -> int:
+        return self._acumulados[-1] if self._acumulados else 0
+    
+    def __contains__(self, id_proyecto: object) -> bool:
+        if not isinstance(id_proyecto, int):
+            return False
+        posicion = bisect_left(self._ids, id_proyecto)
+        return posicion < len(self._ids) and self._ids[posicion] == id_proyecto
+    
+    def ids(self) -> Iterator[int]:
+        """
+        Recorre los IDs archivados sin leer el archivo.
+        
+        Returns:
+            Iterator[int]: IDs en orden creciente.
+        """
+        return iter(self._ids)
+    
+    def buscar(self, id_proyecto: int) -> Optional[Dict[str, Any]]:
+        """
+        Lee un proyecto archivado por su ID. La primera búsqueda recorre el
+        archivo una vez para anotar la posición de cada ID (8 bytes por
+        proyecto); desde entonces se descomprime solo el bloque que lo
+        contiene.
+        
+        Args:
+            id_proyecto (int): ID buscado.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Proyecto archivado, o None si no está.
+        """
+        if id_proyecto not in self:
+            return None
+        posiciones = self._posiciones
+        if posiciones is None:
+            ids = array("q", (proyecto["id"] for proyecto in self.proyectos(len(self))))
+            posiciones = self._posiciones = array("q", sorted(range(len(ids)), key=ids.__getitem__))
+        return self.proyecto(posiciones[bisect_left(self._ids, id_proyecto)])
+    
+    @property
+    def mayor_id(self) -> int:
+        """
+        Mayor ID archivado, o 0 si no hay archivados.
+        """
+        return self._ids[-1] if self._ids else 0
+    
+    def resumen(self) -> Dict[str, Any]:
+        """
+        Retorna lo que hay que guardar en la instantánea para volver a abrir
+        el archivo sin leerlo.
+        
+        Returns:
+            Dict[str, Any]: Totales, conteos por fecha, rangos de IDs, bloques
+                y tamaño en bytes.
+        """
+        return {
+            "agregados": self.agregados,
+            "por_cliente": self.por_cliente,
+            "por_fecha": self.por_fecha,
+            "ids": _rangos(self._ids),
+            "bloques": [list(bloque) for bloque in self.bloques],
+            "tamano": self.tamano
+        }
+    
+    def escribir(self, proyectos: List[Mapping[str, Any]]) -> Tuple[List[Bloque], int]:
+        """
+        Agrega los proyectos al final del archivo, comprimidos por bloques, y
+        sincroniza a disco. Los totales no cambian hasta incorporar(): si el
+        lote no llega a confirmarse, la próxima escritura lo descarta. Como
+        descarta todo lo que siga a self.tamano, se llama con el diario
+        bloqueado en modo exclusivo y con los lotes de otros procesos ya
+        incorporados.
+        
+        Args:
+            proyectos (List[Mapping[str, Any]]): Proyectos a archivar.
+            
+        Returns:
+            Tuple[List[Bloque], int]: Bloques escritos y tamaño final del archivo.
+            
+        Raises:
+            ValueError: Si el archivo es más corto de lo que indica el resumen.
+        """
+        existe = self.ruta.exists()
+        if (self.ruta.stat().st_size if existe else 0) < self.tamano:
+            raise ValueError(f"{self.ruta} está incompleto: se esperaban {self.tamano} bytes")
+        
+        bloques: List[Bloque] = []
+        with open(self.ruta, "r+b" if existe else "wb") as archivo:
+            # Lo que siga a self.tamano es un lote que nunca llegó al diario
+            archivo.truncate(self.tamano)
+            archivo.seek(self.tamano)
+            posicion = self.tamano
+            for inicio in range(0, len(proyectos), PROYECTOS_POR_BLOQUE):
+                tramo = proyectos[inicio:inicio + PROYECTOS_POR_BLOQUE]
+                lineas = "".join(json.dumps(sin_derivados(proyecto), ensure_ascii=False) + "\n" for proyecto in tramo)
+                datos = gzip.compress(lineas.encode("utf-8"), NIVEL_COMPRESION)
+                archivo.write(datos)
+                bloques.append((posicion, len(datos), len(tramo)))
+                posicion += len(datos)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        return bloques, posicion
+    
+    def incorporar(self, proyectos: List[Mapping[str, Any]], bloques: List[Bloque], tamano: int) -> None:
+        """
+        Suma a los totales los proyectos de un lote ya escrito y registra sus
+        bloques e IDs. Se llama al confirmar el lote y al reaplicarlo desde el
+        diario.
+        
+        Args:
+            proyectos (List[Mapping[str, Any]]): Proyectos archivados.
+            bloques (List[Bloque]): Bloques que retornó escribir().
+            tamano (int): Tamaño del archivo después del lote.
+        """
+        for proyecto in proyectos:
+            acumular_proyecto(self.agregados, proyecto)
+            acumular_cliente(self.por_cliente, proyecto)
+            for campo in CAMPOS_RESUMIDOS:
+                fecha = proyecto.get(campo)
+                if fecha:
+                    conteo = self.por_fecha[campo].setdefault(fecha, [0, 0])
+                    conteo[0] += 1
+                    conteo[1] += proyecto.get("tareas_completadas", 0)
+        self._ids = array("q", sorted(chain(self._ids, (proyecto["id"] for proyecto in proyectos))))
+        self._posiciones = None
+        
+        total = len(self)
+        for bloque in bloques:
+            total += bloque[2]
+            self.bloques.append(tuple(bloque))
+            self._acumulados.append(total)
+        self.tamano = tamano
+    
+    def sumar_agregados(self, agregados: Dict[str, Any]) -> None:
+        """
+        Suma los totales de los archivados a unos totales con la forma de
+        utils.crear_agregados_vacios.
+        
+        Args:
+            agregados (Dict[str, Any]): Totales a completar (se modifican).
+        """
+        for clave in ("total_proyectos", "tareas_completadas", "horas_estimadas"):
+            agregados[clave] += self.agregados[clave]
+        por_estado = agregados["por_estado"]
+        for estado, cantidad in self.agregados["por_estado"].items():
+            por_estado[estado] = por_estado.get(estado, 0) + cantidad
+    
+    def sumar_por_cliente(self, por_cliente: Mapping[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Combina unos totales por cliente con los de los archivados.
+        
+        Args:
+            por_cliente (Mapping[str, Dict[str, Any]]): Totales de los proyectos activos.
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Totales nuevos (los recibidos no se modifican).
+        """
+        combinados = {
+            cliente: {**totales, "por_estado": dict(totales["por_estado"])}
+            for cliente, totales in por_cliente.items()
+        }
+        for cliente, archivados in self.por_cliente.items():
+            totales = combinados.get(cliente)
+            if totales is None:
+                combinados[cliente] = {**archivados, "por_estado": dict(archivados["por_estado"])}
+                continue
+            for clave in ("proyectos", "horas_estimadas", "tareas_completadas", "suma_avance"):
+                totales[clave] += archivados[clave]
+            for estado, cantidad in archivados["por_estado"].items():
+                totales["por_estado"][estado] = totales["por_estado"].get(estado, 0) + cantidad
+        return combinados
+    
+    def conteos_por_fecha(self, campo: str, desde: Optional[str] = None,
+                          hasta: Optional[str] = None) -> Iterator[Tuple[str, int, int]]:
+        """
+        Recorre los conteos diarios de los archivados dentro de un rango.
+        
+        Args:
+            campo (str): Campo de CAMPOS_RESUMIDOS.
+            desde (Optional[str]): Fecha mínima, inclusive.
+            hasta (Optional[str]): Fecha máxima, inclusive.
+            
+        Yields:
+            Tuple[str, int, int]: Fecha, cantidad de proyectos y tareas completadas.
+        """
+        for fecha, (cantidad, tareas) in self.por_fecha.get(campo, {}).items():
+            if (not desde or fecha >= desde) and (not hasta or fecha <= hasta):
+                yield fecha, cantidad, tareas
+    
+    def leer_bloque(self, numero: int) -> List[Dict[str, Any]]:
+        """
+        Descomprime un bloque, o lo toma de la caché si se leyó hace poco.
+        
+        Args:
+            numero (int): Posición del bloque en self.bloques.
+            
+        Returns:
+            List[Dict[str, Any]]: Proyectos del bloque, con sus campos derivados.
+        """
+        with self._bloqueo:
+            proyectos = self._cache.get(numero)
+            if proyectos is not None:
+                self._cache.move_to_end(numero)
+                return proyectos
+        
+        posicion, longitud, _ = self.bloques[numero]
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(posicion)
+            datos = gzip.decompress(archivo.read(longitud))
+        proyectos = []
+        for linea in datos.decode("utf-8").splitlines():
+            proyecto = deserializar_proyecto(json.loads(linea))
+            actualizar_derivados(proyecto)
+            proyectos.append(proyecto)
+        contar("archivo.bloques_leidos")
+        
+        with self._bloqueo:
+            self._cache[numero] = proyectos
+            while len(self._cache) > BLOQUES_EN_CACHE:
+                self._cache.popitem(last=False)
+        return proyectos
+    
+    def proyecto(self, posicion: int) -> Dict[str, Any]:
+        """
+        Lee el proyecto archivado en una posición.
+        
+        Args:
+            posicion (int): Posición entre 0 y len(self) - 1.
+            
+        Returns:
+            Dict[str, Any]: Proyecto archivado.
+        """
+        numero = bisect_right(self._acumulados, posicion)
+        inicio = self._acumulados[numero - 1] if numero else 0
+        return self.leer_bloque(numero)[posicion - inicio]
+    
+    def proyectos(self, cantidad: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre los proyectos archivados en orden, un bloque por vez.
+        
+        Args:
+            cantidad (Optional[int]): Cantidad a recorrer; None recorre todos.
+            
+        Yields:
+            Dict[str, Any]: Proyecto archivado.
+        """
+        restantes = len(self) if cantidad is None else cantidad
+        for numero in range(len(self.bloques)):
+            if restantes <= 0:
+                return
+            bloque = self.leer_bloque(numero)[:restantes]
+            restantes -= len(bloque)
+            yield from bloque
+
+
+class VistaConArchivados(Sequence):
+    """
+    Vista de solo lectura con los proyectos activos seguidos de los
+    archivados. Los archivados se leen del archivo recién cuando se piden,
+    un bloque por vez; los que se archiven después de crear la vista no
+    aparecen en ella.
+    
+    Con un filtro solo se incluyen los archivados que lo cumplen: recorrer
+    la vista los filtra al vuelo, y len() o el acceso por posición leen el
+    archivo completo una vez para anotar las posiciones de los que pasan.
+    """
+    
+    __slots__ = ("_activos", "_archivo", "_cantidad", "_filtro", "_posiciones", "version")
+    
+    def __init__(self, activos: Sequence, archivo: ArchivoProyectos,
+                 filtro: Optional[Callable[[Mapping[str, Any]], bool]] = None):
+        """
+        Crea la vista.
+        
+        Args:
+            activos (Sequence): Proyectos activos (por ejemplo, una VistaProyectos).
+            archivo (ArchivoProyectos): Archivo con los proyectos archivados.
+            filtro (Optional[Callable[[Mapping[str, Any]], bool]]): Condición
+                que deben cumplir los archivados; None para incluirlos todos.
+        """
+        self._activos = activos
+        self._archivo = archivo
+        self._cantidad = len(archivo)
+        self._filtro = filtro
+        self._posiciones: Optional[List[int]] = None
+        self.version = getattr(activos, "version", 0)
+    
+    def _archivados(self) -> Sequence:
+        """
+        Retorna las posiciones en el archivo de los archivados incluidos.
+        
+        Returns:
+            Sequence: Posiciones en orden (un range si no hay filtro).
+        """
+        if self._filtro is None:
+            return range(self._cantidad)
+        if self._posiciones is None:
+            self._posiciones = [
+                posicion for posicion, proyecto in enumerate(self._archivo.proyectos(self._cantidad))
+                if self._filtro(proyecto)
+            ]
+        return self._posiciones
+    
+    def __len__(self) -> int:
+        return len(self._activos) + len(self._archivados())
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[indice] for indice in range(*posicion.indices(len(self)))]
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError("posición fuera de la vista")
+        activos = len(self._activos)
+        if posicion < activos:
+            return self._activos[posicion]
+        return MappingProxyType(self._archivo.proyecto(self._archivados()[posicion - activos]))
+    
+    def __iter__(self):
+        yield from self._activos
+        for proyecto in self._archivo.proyectos(self._cantidad):
+            if self._filtro is None or self._filtro(proyecto):
+                yield MappingProxyType(proyecto)
+    
+    def __repr__(self) -> str:
+        return f"VistaConArchivados(activos={len(self._activos)}, archivados={self._cantidad})"
@@ -25,6 +25,20 @@ def mostrar_encabezado():
     print("=" * 60 + "\n")
 
 
+def verificar_credenciales(usuario: str, contraseña: str) -> bool:
+    """
+    Verifica si el par usuario/contraseña corresponde a un usuario registrado.
+    
+    Args:
+        usuario (str): Nombre de usuario.
+        contraseña (str): Contraseña ingresada.
+        
+    Returns:
+        bool: True si las credenciales son válidas.
+    """
+    return usuario in USUARIOS and USUARIOS[usuario] == contraseña
+
+
 def login():
     """
     Función de login que solicita credenciales al usuario.
@@ -46,7 +60,7 @@ def login():
         contraseña = input("Contraseña: ").strip()
         
         # Validar credenciales
-        if usuario in USUARIOS and USUARIOS[usuario] == contraseña:
+        if verificar_credenciales(usuario, contraseña):
             print("\n" + "=" * 60)
             print(f"✅ ¡Bienvenido, {usuario}!")
             print("=" * 60 + "\n")
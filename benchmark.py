@@ -0,0 +1,368 @@
+"""
+Suite de benchmarks para el Sistema de Gestión de Proyectos.
+Genera bases de datos sintéticas de distintos tamaños, mide las operaciones
+principales y compara los tiempos contra una línea base guardada para
+detectar regresiones.
+
+Uso:
+    python benchmark.py                          # tamaños 10³, 10⁴ y 10⁵
+    python benchmark.py --tamanos 1000 1000000   # tamaños a elección
+    python benchmark.py --guardar-base           # guarda los resultados como línea base
+    python benchmark.py --memoria-compacta 100000
+    python benchmark.py --agregacion 1000000 --procesos 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import data_manager
+from agregacion import agregados_parciales, calcular_agregados_en_paralelo
+from proyecto_compacto import ProyectoCompacto
+from reports import mostrar_tabla
+from restore_database import crear_base_datos_json, generar_proyectos_sinteticos
+from utils import ESTADOS_VALIDOS, calcular_total_tareas_completadas
+
+# Archivo con los resultados de referencia
+RUTA_LINEA_BASE = Path(__file__).parent / "benchmark_baseline.json"
+
+# Margen permitido sobre la línea base antes de marcar una regresión (25%)
+TOLERANCIA = 0.25
+
+# Cantidad de operaciones individuales que se miden por tamaño
+OPERACIONES_POR_MEDICION = 10_000
+
+# Proyectos que muestra una página de la tabla del menú
+PROYECTOS_PRIMERA_PAGINA = 20
+
+
+def cronometrar(funcion: Callable[[], Any]) -> float:
+    """
+    Mide el tiempo de ejecución de una función.
+    
+    Args:
+        funcion (Callable[[], Any]): Función sin argumentos a medir.
+        
+    Returns:
+        float: Segundos transcurridos.
+    """
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def medir_pico_memoria(funcion: Callable[[], Any]) -> int:
+    """
+    Mide el pico de memoria asignada durante la ejecución de una función.
+    
+    Args:
+        funcion (Callable[[], Any]): Función sin argumentos a medir.
+        
+    Returns:
+        int: Pico de bytes asignados.
+    """
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def ejecutar_benchmark(tamano: int, semilla: int, medir_memoria: bool = True) -> Dict[str, float]:
+    """
+    Ejecuta todas las mediciones sobre una base sintética del tamaño indicado.
+    Los tiempos de operaciones individuales se informan en microsegundos por
+    operación; los de operaciones completas, en segundos.
+    
+    Args:
+        tamano (int): Cantidad total de proyectos de la base.
+        semilla (int): Semilla del generador de datos.
+        medir_memoria (bool): Si es True se mide además el pico de memoria de la carga.
+        
+    Returns:
+        Dict[str, float]: Resultado de cada medición.
+    """
+    resultados: Dict[str, float] = {}
+    aleatorio = random.Random(semilla)
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_base = Path(directorio) / "database.json"
+        ruta_diario = Path(directorio) / "database.journal"
+        crear_base_datos_json(max(0, tamano - 3), semilla, ruta_base, mostrar_resumen=False)
+        
+        # Carga de database.json (reemplaza el contenido del almacén)
+        resultados["carga_s"] = cronometrar(
+            lambda: data_manager.inicializar_persistencia(ruta_base, ruta_diario)
+        )
+        
+        # Carga en segundo plano: tiempo hasta tener la primera página del menú
+        def cargar_primera_pagina():
+            data_manager.inicializar_persistencia(ruta_base, ruta_diario, en_segundo_plano=True)
+            data_manager.esperar_carga(PROYECTOS_PRIMERA_PAGINA)
+        
+        resultados["primera_pagina_s"] = cronometrar(cargar_primera_pagina)
+        data_manager.esperar_carga()
+        
+        # Guardado: consolidación completa en una instantánea nueva
+        resultados["guardado_s"] = cronometrar(data_manager.compactar_base_datos)
+        data_manager.cerrar_persistencia(compactar=False)
+        
+        operaciones = min(OPERACIONES_POR_MEDICION, tamano)
+        
+        # Altas nuevas a continuación de los IDs existentes
+        nuevos = list(generar_proyectos_sinteticos(operaciones, semilla + 1, id_inicial=tamano + 1))
+        for proyecto in nuevos:
+            proyecto["prioridad"] = tuple(proyecto["prioridad"])
+        resultados["agregar_proyecto_us"] = cronometrar(
+            lambda: [data_manager.agregar_proyecto(proyecto) for proyecto in nuevos]
+        ) / operaciones * 1e6
+        
+        # Búsquedas puntuales por ID
+        ids = [aleatorio.randint(1, tamano) for _ in range(operaciones)]
+        resultados["obtener_por_id_us"] = cronometrar(
+            lambda: [data_manager.obtener_proyecto_por_id(id_proyecto) for id_proyecto in ids]
+        ) / operaciones * 1e6
+        
+        # Filtros por estado (un filtro por cada estado)
+        resultados["filtrar_por_estado_s"] = cronometrar(
+            lambda: [data_manager.filtrar_por_estado(estado) for estado in ESTADOS_VALIDOS]
+        ) / len(ESTADOS_VALIDOS)
+        
+        # Recálculo completo del total de tareas
+        resultados["total_tareas_s"] = cronometrar(
+            lambda: calcular_total_tareas_completadas(data_manager.obtener_proyectos())
+        )
+        
+        # Reporte mensual de rendimiento sobre los índices de fechas
+        resultados["reporte_mensual_s"] = cronometrar(
+            lambda: data_manager.reporte_por_periodo("mes")
+        )
+        
+        # Índice de texto: lo construye la primera búsqueda
+        resultados["indice_texto_s"] = cronometrar(lambda: data_manager.buscar_proyectos(""))
+        
+        # Autocompletado: el nombre de un proyecto con el último término a medio escribir
+        consultas = [data_manager.obtener_proyecto_por_id(id_proyecto)["nombre"][:-2] for id_proyecto in ids]
+        resultados["buscar_us"] = cronometrar(
+            lambda: [data_manager.buscar_proyectos(consulta) for consulta in consultas]
+        ) / operaciones * 1e6
+        
+        # Renderizado completo de la tabla hacia un sumidero nulo
+        with open(os.devnull, "w", encoding="utf-8") as nulo:
+            resultados["mostrar_tabla_s"] = cronometrar(
+                lambda: mostrar_tabla(data_manager.obtener_proyectos(), salida=nulo)
+            )
+        
+        if medir_memoria:
+            resultados["pico_memoria_carga_mb"] = medir_pico_memoria(
+                lambda: data_manager.inicializar_persistencia(ruta_base, ruta_diario)
+            ) / 2**20
+            data_manager.cerrar_persistencia(compactar=False)
+    
+    return resultados
+
+
+def comparar_con_linea_base(tamano: int, resultados: Dict[str, float],
+                            linea_base: Dict[str, Any], tolerancia: float) -> List[str]:
+    """
+    Compara los resultados de un tamaño con la línea base.
+    
+    Args:
+        tamano (int): Tamaño medido.
+        resultados (Dict[str, float]): Mediciones actuales.
+        linea_base (Dict[str, Any]): Contenido de benchmark_baseline.json.
+        tolerancia (float): Aumento relativo permitido (0.25 = 25%).
+        
+    Returns:
+        List[str]: Descripción de cada medición que empeoró más de lo permitido.
+    """
+    regresiones = []
+    referencia = linea_base.get(str(tamano), {})
+    for medicion, valor in resultados.items():
+        base = referencia.get(medicion)
+        if base and valor > base * (1 + tolerancia):
+            regresiones.append(
+                f"{tamano:>9,} {medicion}: {valor:.4g} vs base {base:.4g} (+{(valor / base - 1) * 100:.0f}%)"
+            )
+    return regresiones
+
+
+def mostrar_resultados(tamano: int, resultados: Dict[str, float], linea_base: Dict[str, Any]) -> None:
+    """
+    Muestra la tabla de resultados de un tamaño junto a la línea base.
+    
+    Args:
+        tamano (int): Tamaño medido.
+        resultados (Dict[str, float]): Mediciones actuales.
+        linea_base (Dict[str, Any]): Contenido de benchmark_baseline.json.
+    """
+    referencia = linea_base.get(str(tamano), {})
+    print("\n" + "=" * 70)
+    print(f"{f'BENCHMARK: {tamano:,} PROYECTOS':^70}")
+    print("=" * 70)
+    print(f"{'Medición':<28} {'Actual':>14} {'Base':>14} {'Cambio':>10}")
+    print("-" * 70)
+    for medicion, valor in resultados.items():
+        base = referencia.get(medicion)
+        if base:
+            print(f"{medicion:<28} {valor:>14.4g} {base:>14.4g} {(valor / base - 1) * 100:>+9.0f}%")
+        else:
+            print(f"{medicion:<28} {valor:>14.4g} {'-':>14} {'-':>10}")
+    print("=" * 70)
+
+
+def medir_memoria(construir: Callable[[Dict[str, Any]], Any], cantidad: int) -> int:
+    """
+    Mide los bytes retenidos por una colección de proyectos. Cada proyecto
+    pasa por JSON para que tenga sus propias cadenas, igual que al cargar
+    database.json.
+    
+    Args:
+        construir (Callable): Convierte el diccionario de entrada en el registro a guardar.
+        cantidad (int): Cantidad de proyectos.
+        
+    Returns:
+        int: Bytes asignados que siguen vivos al terminar la construcción.
+    """
+    # Los datos de entrada se generan antes de empezar a medir
+    lineas = [json.dumps(proyecto) for proyecto in generar_proyectos_sinteticos(cantidad)]
+    
+    tracemalloc.start()
+    registros: List[Any] = [construir(json.loads(linea)) for linea in lineas]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    return actual
+
+
+def _como_diccionario(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte la entrada al formato diccionario usado por defecto.
+    
+    Args:
+        datos (Dict[str, Any]): Proyecto leído.
+        
+    Returns:
+        Dict[str, Any]: Proyecto con la prioridad como tupla.
+    """
+    datos["prioridad"] = tuple(datos["prioridad"])
+    return datos
+
+
+def benchmark_memoria(cantidad: int) -> None:
+    """
+    Compara la memoria de diccionarios y registros compactos.
+    
+    Args:
+        cantidad (int): Cantidad de proyectos a generar.
+    """
+    bytes_dict = medir_memoria(_como_diccionario, cantidad)
+    bytes_compacto = medir_memoria(ProyectoCompacto, cantidad)
+    ahorro = (1 - bytes_compacto / bytes_dict) * 100
+    
+    print("=" * 70)
+    print(f"{'MEMORIA POR REPRESENTACIÓN':^70}")
+    print("=" * 70)
+    print(f"{'Proyectos:':<30} {cantidad:>15,}")
+    print(f"{'Diccionarios:':<30} {bytes_dict / 2**20:>12.1f} MiB  ({bytes_dict / cantidad:>6.0f} B/proyecto)")
+    print(f"{'ProyectoCompacto:':<30} {bytes_compacto / 2**20:>12.1f} MiB  ({bytes_compacto / cantidad:>6.0f} B/proyecto)")
+    print(f"{'Ahorro:':<30} {ahorro:>14.1f}%")
+    print("=" * 70)
+
+
+def benchmark_agregacion(cantidad: int, procesos: List[int], semilla: int, repeticiones: int = 3) -> None:
+    """
+    Compara la agregación en serie contra el modo map-reduce con distintas
+    cantidades de procesos. Se informa el mejor tiempo de cada variante.
+    
+    Args:
+        cantidad (int): Cantidad de proyectos a generar.
+        procesos (List[int]): Cantidades de procesos a probar.
+        semilla (int): Semilla del generador de datos.
+        repeticiones (int): Mediciones por variante.
+    """
+    proyectos = list(generar_proyectos_sinteticos(cantidad, semilla))
+    serie = min(cronometrar(lambda: agregados_parciales(proyectos)) for _ in range(repeticiones))
+    
+    print("=" * 70)
+    print(f"{f'AGREGACIÓN MAP-REDUCE: {cantidad:,} PROYECTOS ({os.cpu_count()} núcleos)':^70}")
+    print("=" * 70)
+    print(f"{'Variante':<28} {'Segundos':>14} {'Aceleración':>14}")
+    print("-" * 70)
+    print(f"{'serie':<28} {serie:>14.4g} {1:>13.2f}x")
+    for cantidad_procesos in procesos:
+        paralelo = min(
+            cronometrar(lambda: calcular_agregados_en_paralelo(proyectos, cantidad_procesos))
+            for _ in range(repeticiones)
+        )
+        print(f"{f'{cantidad_procesos} procesos':<28} {paralelo:>14.4g} {serie / paralelo:>13.2f}x")
+    print("=" * 70)
+
+
+def main(argumentos: List[str]) -> int:
+    """
+    Ejecuta la suite según los argumentos de línea de comandos.
+    
+    Args:
+        argumentos (List[str]): Argumentos (sin el nombre del programa).
+        
+    Returns:
+        int: 0 si no hubo regresiones, 1 si alguna medición superó la tolerancia.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks del Sistema de Gestión de Proyectos.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="guarda los resultados en benchmark_baseline.json")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="omite la medición del pico de memoria")
+    parser.add_argument("--memoria-compacta", type=int, metavar="N",
+                        help="solo compara la memoria de diccionarios y registros compactos")
+    parser.add_argument("--agregacion", type=int, metavar="N",
+                        help="solo compara la agregación en serie y en paralelo sobre N proyectos")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1],
+                        help="cantidades de procesos para --agregacion")
+    args = parser.parse_args(argumentos)
+    
+    if args.memoria_compacta:
+        benchmark_memoria(args.memoria_compacta)
+        return 0
+    
+    if args.agregacion:
+        benchmark_agregacion(args.agregacion, sorted(set(args.procesos)), args.semilla)
+        return 0
+    
+    linea_base: Dict[str, Any] = {}
+    if RUTA_LINEA_BASE.exists():
+        linea_base = json.loads(RUTA_LINEA_BASE.read_text(encoding="utf-8"))
+    
+    regresiones: List[str] = []
+    for tamano in args.tamanos:
+        resultados = ejecutar_benchmark(tamano, args.semilla, not args.sin_memoria)
+        mostrar_resultados(tamano, resultados, linea_base)
+        regresiones.extend(comparar_con_linea_base(tamano, resultados, linea_base, args.tolerancia))
+        if args.guardar_base:
+            linea_base[str(tamano)] = resultados
+    
+    if args.guardar_base:
+        RUTA_LINEA_BASE.write_text(json.dumps(linea_base, indent=4), encoding="utf-8")
+        print(f"\n💾 Línea base guardada en {RUTA_LINEA_BASE}")
+    elif regresiones:
+        print("\n⚠️ Regresiones detectadas:")
+        for regresion in regresiones:
+            print(f"   - {regresion}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
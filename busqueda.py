@@ -0,0 +1,368 @@
+"""
+Búsqueda de texto para el Sistema de Gestión de Proyectos.
+Índice invertido sobre el nombre y el cliente de los proyectos, sin
+distinguir mayúsculas ni acentos ("gestión", "Gestion" y "GESTIÓN" son el
+mismo término), con búsqueda por prefijo para autocompletar mientras se
+escribe.
+
+El vocabulario se guarda como una lista ordenada: los términos que empiezan
+con un prefijo ocupan un tramo contiguo que se ubica con dos búsquedas
+binarias, igual que recorrer la rama de un árbol de prefijos (trie) pero
+sin un nodo por letra. Como en los índices ordenados de data_manager, los
+términos nuevos o eliminados se anotan y se incorporan a la lista en la
+siguiente búsqueda.
+
+Los clientes se indexan por nombre de cliente y no por proyecto: sus
+proyectos se leen del índice secundario por cliente de data_manager.
+"""
+
+import functools
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from itertools import chain
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+# Un término es una secuencia de letras o dígitos (el guion y el guion bajo separan)
+_PATRON_TERMINO = re.compile(r"[^\W_]+")
+
+# Peso de un término según el campo donde aparece
+PESO_NOMBRE = 2
+PESO_CLIENTE = 1
+
+# Términos pendientes a partir de los cuales el vocabulario se rearma en una pasada
+UMBRAL_REORDENAMIENTO = 64
+
+# Resultados por defecto de una búsqueda
+RESULTADOS_POR_DEFECTO = 20
+
+
+def normalizar(texto: str) -> str:
+    """
+    Pasa un texto a minúsculas y le quita los acentos y diacríticos.
+    
+    Args:
+        texto (str): Texto original.
+        
+    Returns:
+        str: Texto normalizado ("Gestión Ñandú" -> "gestion nandu").
+    """
+    if texto.isascii():
+        return texto.casefold()
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(caracter for caracter in descompuesto if not unicodedata.combining(caracter)).casefold()
+
+
+@functools.lru_cache(maxsize=2**16)
+def tokenizar(texto: Optional[str]) -> Tuple[str, ...]:
+    """
+    Divide un texto en términos normalizados, sin repetidos y en orden de
+    aparición. Los nombres y clientes se repiten mucho, así que los
+    resultados se guardan en un caché.
+    
+    Args:
+        texto (Optional[str]): Texto a dividir.
+        
+    Returns:
+        Tuple[str, ...]: Términos del texto.
+    """
+    if not texto:
+        return ()
+    return tuple(dict.fromkeys(_PATRON_TERMINO.findall(normalizar(texto))))
+
+
+class _Condicion(NamedTuple):
+    """
+    Un término de la consulta resuelto contra el índice.
+    """
+    termino: str
+    es_prefijo: bool
+    terminos: List[str]
+    clientes: FrozenSet[str]
+    en_nombres: int
+    cantidad: int
+
+
+def _coincide(termino: str, es_prefijo: bool, terminos: Tuple[str, ...]) -> bool:
+    """
+    Indica si un término de la consulta aparece entre los de un campo.
+    
+    Args:
+        termino (str): Término buscado.
+        es_prefijo (bool): True si alcanza con que algún término empiece así.
+        terminos (Tuple[str, ...]): Términos del campo.
+        
+    Returns:
+        bool: True si coincide.
+    """
+    if es_prefijo:
+        return any(candidato.startswith(termino) for candidato in terminos)
+    return termino in terminos
+
+
+def puntaje(terminos: Tuple[str, ...], proyecto: Mapping[str, Any], prefijo: bool = True) -> int:
+    """
+    Calcula la relevancia de un proyecto con los mismos pesos que
+    IndiceTexto.buscar, revisando su nombre y su cliente. Sirve para los
+    proyectos que no están en el índice (los archivados), que se recorren
+    uno por uno.
+    
+    Args:
+        terminos (Tuple[str, ...]): Términos de la consulta (ver tokenizar).
+        proyecto (Mapping[str, Any]): Proyecto a puntuar.
+        prefijo (bool): True para completar el último término.
+        
+    Returns:
+        int: Relevancia, o 0 si falta algún término.
+    """
+    nombre = tokenizar(proyecto.get("nombre"))
+    cliente = tokenizar(proyecto.get("cliente"))
+    total = 0
+    for posicion, termino in enumerate(terminos):
+        es_prefijo = prefijo and posicion == len(terminos) - 1
+        peso = PESO_NOMBRE * _coincide(termino, es_prefijo, nombre) + PESO_CLIENTE * _coincide(termino, es_prefijo, cliente)
+        if not peso:
+            return 0
+        total += peso
+    return total
+
+
+class IndiceTexto:
+    """
+    Índice invertido de nombres y clientes. data_manager lo actualiza en cada
+    alta, modificación y baja (con el bloqueo de escritura tomado) y lo
+    consulta con el de lectura; la incorporación de términos pendientes al
+    vocabulario tiene su propio bloqueo porque ocurre durante las lecturas.
+    """
+    
+    def __init__(self, proyectos: Mapping[int, Mapping[str, Any]],
+                 por_cliente: Mapping[Any, Mapping[int, Any]]):
+        """
+        Crea un índice vacío.
+        
+        Args:
+            proyectos (Mapping[int, Mapping[str, Any]]): Índice primario (ID -> proyecto).
+            por_cliente (Mapping[Any, Mapping[int, Any]]): Índice secundario por cliente.
+        """
+        self._proyectos = proyectos
+        self._por_cliente = por_cliente
+        # Término -> ID (si está en un solo nombre, el caso más común) o conjunto de IDs
+        self._nombres: Dict[str, Union[int, Set[int]]] = {}
+        # Término -> cliente -> cantidad de proyectos de ese cliente
+        self._clientes: Dict[str, Dict[str, int]] = {}
+        self._vocabulario: List[str] = []
+        self._revisar: Set[str] = set()
+        self._bloqueo = threading.Lock()
+    
+    def agregar(self, proyecto: Mapping[str, Any]) -> None:
+        """
+        Indexa el nombre y el cliente de un proyecto.
+        
+        Args:
+            proyecto (Mapping[str, Any]): Proyecto a indexar.
+        """
+        id_proyecto = proyecto["id"]
+        for termino in tokenizar(proyecto.get("nombre")):
+            ids = self._nombres.get(termino)
+            if ids is None:
+                self._nombres[termino] = id_proyecto
+                self._revisar.add(termino)
+            elif isinstance(ids, set):
+                ids.add(id_proyecto)
+            elif ids != id_proyecto:
+                self._nombres[termino] = {ids, id_proyecto}
+        
+        cliente = proyecto.get("cliente")
+        for termino in tokenizar(cliente):
+            clientes = self._clientes.get(termino)
+            if clientes is None:
+                clientes = self._clientes[termino] = {}
+                self._revisar.add(termino)
+            clientes[cliente] = clientes.get(cliente, 0) + 1
+    
+    def quitar(self, proyecto: Mapping[str, Any]) -> None:
+        """
+        Quita del índice el nombre y el cliente de un proyecto.
+        
+        Args:
+            proyecto (Mapping[str, Any]): Proyecto tal como se indexó.
+        """
+        id_proyecto = proyecto["id"]
+        for termino in tokenizar(proyecto.get("nombre")):
+            ids = self._nombres.get(termino)
+            if isinstance(ids, set):
+                ids.discard(id_proyecto)
+                if len(ids) == 1:
+                    self._nombres[termino] = next(iter(ids))
+            elif ids == id_proyecto:
+                del self._nombres[termino]
+                self._revisar.add(termino)
+        
+        cliente = proyecto.get("cliente")
+        for termino in tokenizar(cliente):
+            clientes = self._clientes.get(termino, {})
+            if clientes.get(cliente, 0) > 1:
+                clientes[cliente] -= 1
+                continue
+            clientes.pop(cliente, None)
+            if not clientes:
+                self._clientes.pop(termino, None)
+                self._revisar.add(termino)
+    
+    def _vocabulario_actualizado(self) -> List[str]:
+        """
+        Incorpora al vocabulario ordenado los términos nuevos y quita los que
+        ya no aparecen: de a uno si son pocos o con una mezcla en una pasada.
+        
+        Returns:
+            List[str]: Vocabulario ordenado.
+        """
+        with self._bloqueo:
+            if not self._revisar:
+                return self._vocabulario
+            revisar, self._revisar = self._revisar, set()
+            vocabulario = self._vocabulario
+            if len(revisar) <= UMBRAL_REORDENAMIENTO:
+                for termino in revisar:
+                    posicion = bisect_left(vocabulario, termino)
+                    presente = posicion < len(vocabulario) and vocabulario[posicion] == termino
+                    vigente = termino in self._nombres or termino in self._clientes
+                    if vigente and not presente:
+                        vocabulario.insert(posicion, termino)
+                    elif presente and not vigente:
+                        del vocabulario[posicion]
+            else:
+                nuevos = sorted(
+                    termino for termino in revisar if termino in self._nombres or termino in self._clientes
+                )
+                conservados = (termino for termino in vocabulario if termino not in revisar)
+                self._vocabulario = list(heapq.merge(conservados, nuevos))
+            return self._vocabulario
+    
+    def _terminos(self, termino: str, es_prefijo: bool) -> List[str]:
+        """
+        Busca los términos del vocabulario que coinciden con uno de la consulta.
+        
+        Args:
+            termino (str): Término buscado.
+            es_prefijo (bool): True para incluir los que empiezan así.
+            
+        Returns:
+            List[str]: Términos del índice que coinciden.
+        """
+        if not es_prefijo:
+            return [termino] if termino in self._nombres or termino in self._clientes else []
+        vocabulario = self._vocabulario_actualizado()
+        inicio = bisect_left(vocabulario, termino)
+        # Todos los términos con el prefijo quedan antes de prefijo + el mayor carácter
+        fin = bisect_left(vocabulario, termino + "\U0010ffff", inicio)
+        return vocabulario[inicio:fin]
+    
+    def _ids_por_nombre(self, terminos: List[str]) -> Iterator[int]:
+        """
+        Recorre los IDs de los proyectos cuyo nombre contiene alguno de los términos.
+        
+        Args:
+            terminos (List[str]): Términos del índice.
+            
+        Yields:
+            int: ID de proyecto (puede repetirse).
+        """
+        for termino in terminos:
+            ids = self._nombres.get(termino)
+            if isinstance(ids, int):
+                yield ids
+            elif ids is not None:
+                yield from ids
+    
+    def _condicion(self, termino: str, es_prefijo: bool) -> _Condicion:
+        """
+        Reúne lo que el índice sabe de un término de la consulta.
+        
+        Args:
+            termino (str): Término buscado.
+            es_prefijo (bool): True para incluir los términos que empiezan así.
+            
+        Returns:
+            _Condicion: Términos del índice, clientes y cantidad estimada de proyectos.
+        """
+        terminos = self._terminos(termino, es_prefijo)
+        en_nombres = 0
+        for termino_indice in terminos:
+            ids = self._nombres.get(termino_indice)
+            if ids is not None:
+                en_nombres += len(ids) if isinstance(ids, set) else 1
+        clientes = frozenset(cliente for termino_indice in terminos for cliente in self._clientes.get(termino_indice, ()))
+        cantidad = en_nombres + sum(len(self._por_cliente.get(cliente, ())) for cliente in clientes)
+        return _Condicion(termino, es_prefijo, terminos, clientes, en_nombres, cantidad)
+    
+    def buscar(self, texto: str, limite: int = RESULTADOS_POR_DEFECTO,
+               prefijo: bool = True) -> List[Mapping[str, Any]]:
+        """
+        Busca los proyectos cuyo nombre o cliente contiene todos los términos
+        del texto. El último término se toma como prefijo (autocompletado)
+        salvo que prefijo sea False. Los resultados se ordenan por relevancia:
+        cada término suma PESO_NOMBRE si está en el nombre y PESO_CLIENTE si
+        está en el cliente; a igual relevancia, por ID.
+        
+        El término con menos proyectos genera los candidatos y los demás se
+        comprueban sobre cada candidato, así que el costo depende de las
+        coincidencias del término más selectivo y no del total de proyectos.
+        
+        Args:
+            texto (str): Texto buscado.
+            limite (int): Cantidad máxima de resultados.
+            prefijo (bool): True para completar el último término.
+            
+        Returns:
+            List[Mapping[str, Any]]: Proyectos encontrados, del más relevante al menos.
+        """
+        terminos = tokenizar(texto)
+        if not terminos or limite <= 0:
+            return []
+        condiciones = sorted(
+            (self._condicion(termino, es_prefijo) for termino, es_prefijo in
+             [(termino, False) for termino in terminos[:-1]] + [(terminos[-1], prefijo)]),
+            key=lambda condicion: condicion.cantidad
+        )
+        conductora = condiciones[0]
+        if not conductora.cantidad:
+            return []
+        
+        grupos = [self._por_cliente.get(cliente, {}) for cliente in conductora.clientes]
+        if len(condiciones) == 1 and not conductora.en_nombres:
+            # Un término que solo aparece en clientes (lo habitual al empezar a
+            # escribir un cliente): todos valen lo mismo y se ordenan por ID
+            ids = heapq.nsmallest(limite, chain.from_iterable(grupos))
+            return [self._proyectos[id_proyecto] for id_proyecto in ids]
+        
+        nombres_conductora = set(self._ids_por_nombre(conductora.terminos))
+        candidatos = nombres_conductora.union(*grupos)
+        # Para cada término, el conjunto de IDs por nombre si no supera a los
+        # candidatos; si no, se revisa el nombre de cada candidato
+        evaluadas = [(conductora, nombres_conductora)] + [
+            (condicion, set(self._ids_por_nombre(condicion.terminos))
+             if condicion.en_nombres <= len(candidatos) else None)
+            for condicion in condiciones[1:]
+        ]
+        
+        puntuados: List[Tuple[int, int]] = []
+        for id_proyecto in candidatos:
+            proyecto = self._proyectos[id_proyecto]
+            cliente = proyecto.get("cliente")
+            puntaje = 0
+            for condicion, ids_nombre in evaluadas:
+                if ids_nombre is not None:
+                    en_nombre = id_proyecto in ids_nombre
+                else:
+                    en_nombre = _coincide(condicion.termino, condicion.es_prefijo, tokenizar(proyecto.get("nombre")))
+                peso = PESO_NOMBRE * en_nombre + PESO_CLIENTE * (cliente in condicion.clientes)
+                if not peso:
+                    break
+                puntaje += peso
+            else:
+                puntuados.append((-puntaje, id_proyecto))
+        
+        return [self._proyectos[id_proyecto] for _, id_proyecto in heapq.nsmallest(limite, puntuados)]
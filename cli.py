@@ -0,0 +1,602 @@
+"""
+Interfaz de línea de comandos no interactiva del Sistema de Gestión de Proyectos.
+Ejecuta una operación (o un lote leído de stdin) y escribe el resultado en
+JSON/JSONL, para que los scripts no tengan que manejar el menú interactivo.
+
+Ejemplos:
+    python main.py list
+    python main.py filter --estado "En Progreso"
+    python main.py add --nombre "Tienda" --cliente "Nike" --estado Pendiente
+    python main.py query --estado "En Progreso" --prioridad Alta --desde 2025-01-01 --explicar
+    python main.py top -k 10 --estado "En Progreso"
+    python main.py search "tienda nik" -k 10
+    python main.py search "blog" --incluir-archivados
+    python main.py report
+    python main.py report --procesos 4
+    python main.py report --por-cliente
+    python main.py throughput --periodo semana --desde 2025-01-01
+    python main.py watch --intervalo 5
+    python main.py update --estado Pendiente --cliente Nike --set estado="En Progreso" --set prioridad=Alta
+    python main.py delete --ids 12 13 14
+    python main.py import datos_prueba.csv
+    python main.py export proyectos --estado Pendiente --formato csv > pendientes.csv
+    python main.py export reporte --salida reporte.jsonl
+    python main.py archive --dias 180
+    python main.py batch < operaciones.jsonl
+
+Los subcomandos que consultan escriben los datos directamente (proyectos en
+JSONL o JSON, reportes en JSON). Los que ejecutan una operación responden
+{"ok": true, "resultado": ...}, como cada línea de batch, o
+{"ok": false, "error": ...} si falla.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, TextIO
+
+from agregacion import calcular_agregados_en_paralelo
+from auth import verificar_credenciales
+from busqueda import RESULTADOS_POR_DEFECTO
+from derivados import sin_derivados
+from data_manager import (
+    obtener_proyectos,
+    obtener_proyecto_por_id,
+    agregar_proyecto,
+    actualizar_proyectos,
+    eliminar_proyectos,
+    archivar_finalizados,
+    filtrar_por_estado,
+    filtrar_por_cliente,
+    filtrar_por_prioridad,
+    consultar,
+    explicar_consulta,
+    top_proyectos,
+    buscar_proyectos,
+    obtener_agregados,
+    obtener_agregados_por_cliente,
+    reporte_por_periodo,
+    asignar_id,
+    inicializar_persistencia,
+    cerrar_persistencia,
+    compactar_base_datos,
+    CRITERIOS_CONSULTA,
+    CRITERIOS_ORDEN
+)
+from exportacion import (
+    FORMATOS,
+    exportar_proyectos,
+    exportar_reporte_productividad,
+    exportar_reporte_periodos,
+    formato_por_extension
+)
+from importacion import importar_csv
+from tablero import INTERVALO_REDIBUJO, Tablero
+from utils import ESTADOS_VALIDOS, PERIODOS, validar_prioridad
+
+# Variables de entorno con las credenciales para uso desde scripts
+VARIABLE_USUARIO = "GESTION_USUARIO"
+VARIABLE_CONTRASENA = "GESTION_CONTRASENA"
+
+
+class ErrorOperacion(Exception):
+    """
+    Error de validación de una operación; se informa como JSON sin abortar el lote.
+    """
+
+
+def _escribir_json(datos: Any, salida: TextIO) -> None:
+    """
+    Escribe un valor como una línea JSON.
+    
+    Args:
+        datos (Any): Valor serializable (los proyectos se convierten a dict).
+        salida (TextIO): Flujo de salida.
+    """
+    salida.write(json.dumps(datos, ensure_ascii=False) + "\n")
+
+
+def _escribir_resultado(resultado: Any, salida: TextIO) -> None:
+    """
+    Escribe la respuesta de un subcomando que ejecuta una operación (add,
+    update, delete, archive, compact, export --salida) con la misma forma
+    que cada línea de batch: {"ok": true, "resultado": ...}.
+    
+    Args:
+        resultado (Any): Resultado de la operación.
+        salida (TextIO): Flujo de salida.
+    """
+    _escribir_json({"ok": True, "resultado": resultado}, salida)
+
+
+def _escribir_proyectos(proyectos: Iterable[Dict[str, Any]], formato: str, salida: TextIO) -> None:
+    """
+    Escribe proyectos como JSONL (uno por línea) o como un único arreglo JSON.
+    
+    Args:
+        proyectos (Iterable[Dict[str, Any]]): Proyectos a escribir.
+        formato (str): "jsonl" o "json".
+        salida (TextIO): Flujo de salida.
+    """
+    if formato == "json":
+        _escribir_json([sin_derivados(proyecto) for proyecto in proyectos], salida)
+        return
+    for proyecto in proyectos:
+        _escribir_json(sin_derivados(proyecto), salida)
+
+
+def construir_proyecto(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida los datos de un alta y construye el diccionario del proyecto.
+    
+    Args:
+        datos (Dict[str, Any]): Campos recibidos (id opcional; si falta, se
+            asigna uno de la secuencia de IDs).
+            
+    Returns:
+        Dict[str, Any]: Proyecto listo para agregar.
+        
+    Raises:
+        ErrorOperacion: Si falta un campo obligatorio o un valor es inválido.
+    """
+    nombre = str(datos.get("nombre") or "").strip()
+    cliente = str(datos.get("cliente") or "").strip()
+    estado = str(datos.get("estado") or "Pendiente").strip()
+    
+    if not nombre or not cliente:
+        raise ErrorOperacion("nombre y cliente son obligatorios")
+    if estado not in ESTADOS_VALIDOS:
+        raise ErrorOperacion(f"estado inválido: '{estado}'")
+    
+    try:
+        horas_estimadas = int(datos.get("horas_estimadas") or 0)
+        tareas_completadas = int(datos.get("tareas_completadas") or 0)
+    except (TypeError, ValueError):
+        raise ErrorOperacion("horas_estimadas y tareas_completadas deben ser enteros")
+    
+    prioridad = datos.get("prioridad") or ""
+    if isinstance(prioridad, (list, tuple)):
+        prioridad = prioridad[0]
+    
+    proyecto = {
+        "id": int(datos["id"]) if datos.get("id") else asignar_id(),
+        "nombre": nombre,
+        "cliente": cliente,
+        "estado": estado,
+        "horas_estimadas": horas_estimadas,
+        "tareas_completadas": tareas_completadas,
+        "prioridad": validar_prioridad(str(prioridad))
+    }
+    if datos.get("fecha_inicio"):
+        proyecto["fecha_inicio"] = str(datos["fecha_inicio"])
+    return proyecto
+
+
+def ejecutar_operacion(operacion: Dict[str, Any]) -> Any:
+    """
+    Ejecuta una operación descrita como diccionario y retorna su resultado.
+    
+    Args:
+        operacion (Dict[str, Any]): Operación con la clave "op" ("list", "get",
+            "add", "update", "delete", "archive", "filter", "query", "top",
+            "search", "report" o "throughput") y sus parámetros.
+            
+    Returns:
+        Any: Resultado serializable a JSON.
+        
+    Raises:
+        ErrorOperacion: Si la operación no existe o sus datos son inválidos.
+    """
+    tipo = operacion.get("op")
+    
+    if tipo == "list":
+        return [sin_derivados(proyecto) for proyecto in obtener_proyectos()]
+    if tipo == "get":
+        proyecto = obtener_proyecto_por_id(operacion.get("id"))
+        if proyecto is None:
+            raise ErrorOperacion(f"no existe el proyecto {operacion.get('id')}")
+        return sin_derivados(proyecto)
+    if tipo == "add":
+        proyecto = construir_proyecto(operacion.get("proyecto", operacion))
+        if not agregar_proyecto(proyecto):
+            raise ErrorOperacion(f"el ID {proyecto['id']} ya existe")
+        return {"id": proyecto["id"]}
+    if tipo in ("update", "delete"):
+        try:
+            if tipo == "update":
+                modificados = actualizar_proyectos(
+                    dict(operacion.get("cambios") or {}), operacion.get("ids"), **operacion.get("criterios", {})
+                )
+                return {"actualizados": len(modificados)}
+            return {"eliminados": len(eliminar_proyectos(operacion.get("ids"), **operacion.get("criterios", {})))}
+        except ValueError as e:
+            raise ErrorOperacion(str(e))
+    if tipo == "archive":
+        try:
+            return {"archivados": archivar_finalizados(operacion.get("dias"), operacion.get("hoy"))}
+        except ValueError as e:
+            raise ErrorOperacion(str(e))
+    if tipo == "filter":
+        return [sin_derivados(proyecto) for proyecto in _filtrar(operacion)]
+    if tipo == "query":
+        criterios = operacion.get("criterios", {})
+        if operacion.get("explicar"):
+            return explicar_consulta(**criterios)
+        return [sin_derivados(proyecto) for proyecto in consultar(**criterios)]
+    if tipo == "top":
+        proyectos = top_proyectos(
+            int(operacion.get("k", 20)),
+            operacion.get("criterio", "prioridad"),
+            **operacion.get("criterios", {})
+        )
+        return [sin_derivados(proyecto) for proyecto in proyectos]
+    if tipo == "search":
+        proyectos = buscar_proyectos(
+            str(operacion.get("texto", "")),
+            int(operacion.get("k", RESULTADOS_POR_DEFECTO)),
+            not operacion.get("exacto", False),
+            bool(operacion.get("incluir_archivados", False))
+        )
+        return [sin_derivados(proyecto) for proyecto in proyectos]
+    if tipo == "report":
+        return obtener_agregados_por_cliente() if operacion.get("por_cliente") else obtener_agregados()
+    if tipo == "throughput":
+        return reporte_por_periodo(
+            operacion.get("periodo", "mes"), operacion.get("desde"), operacion.get("hasta")
+        )
+    
+    raise ErrorOperacion(f"operación desconocida: {tipo!r}")
+
+
+def _exportar(args: argparse.Namespace, formato: str, salida: TextIO) -> int:
+    """
+    Escribe el contenido pedido por el subcomando export.
+    
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando.
+        formato (str): "csv" o "jsonl".
+        salida (TextIO): Flujo de destino.
+        
+    Returns:
+        int: Cantidad de filas escritas.
+    """
+    if args.contenido == "reporte":
+        return exportar_reporte_productividad(obtener_agregados(), salida, formato)
+    if args.contenido == "throughput":
+        return exportar_reporte_periodos(
+            reporte_por_periodo(args.periodo, args.desde, args.hasta), salida, formato
+        )
+    criterios = {
+        criterio: valor for criterio, valor in (
+            ("estado", args.estado), ("cliente", args.cliente), ("prioridad", args.prioridad),
+            ("fecha_desde", args.desde), ("fecha_hasta", args.hasta)
+        )
+        if valor
+    }
+    proyectos = consultar(**criterios) if criterios else obtener_proyectos()
+    return exportar_proyectos(proyectos, salida, formato)
+
+
+def _leer_cambios(asignaciones: List[str]) -> Dict[str, Any]:
+    """
+    Convierte los --set campo=valor del subcomando update en un diccionario
+    de cambios. Un valor vacío elimina el campo (p. ej. "--set fecha_fin=").
+    
+    Args:
+        asignaciones (List[str]): Textos "campo=valor".
+        
+    Returns:
+        Dict[str, Any]: Cambios para data_manager.actualizar_proyectos.
+        
+    Raises:
+        ErrorOperacion: Si una asignación no tiene "=" o un número es inválido.
+    """
+    cambios: Dict[str, Any] = {}
+    for asignacion in asignaciones:
+        campo, separador, valor = asignacion.partition("=")
+        campo = campo.strip().replace("-", "_")
+        if not separador or not campo:
+            raise ErrorOperacion(f"asignación inválida: '{asignacion}' (usa campo=valor)")
+        valor = valor.strip()
+        if not valor:
+            cambios[campo] = None
+        elif campo in ("horas_estimadas", "tareas_completadas"):
+            try:
+                cambios[campo] = int(valor)
+            except ValueError:
+                raise ErrorOperacion(f"{campo} debe ser un entero")
+        else:
+            cambios[campo] = valor
+    return cambios
+
+
+def _seleccion(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Arma la operación de lote equivalente a la selección de update/delete.
+    
+    Args:
+        args (argparse.Namespace): Argumentos del subcomando.
+        
+    Returns:
+        Dict[str, Any]: Claves "ids" y "criterios".
+    """
+    criterios = {
+        criterio: valor for criterio, valor in (
+            ("estado", args.estado), ("cliente", args.cliente), ("prioridad", args.prioridad),
+            ("fecha_desde", args.desde), ("fecha_hasta", args.hasta)
+        )
+        if valor
+    }
+    return {"ids": args.ids, "criterios": criterios}
+
+
+def _filtrar(criterios: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Aplica el filtro indexado correspondiente al criterio recibido.
+    
+    Args:
+        criterios (Dict[str, Any]): Claves "estado", "cliente" o "prioridad".
+        
+    Returns:
+        List[Dict[str, Any]]: Proyectos que coinciden.
+        
+    Raises:
+        ErrorOperacion: Si no se indicó ningún criterio.
+    """
+    if criterios.get("estado"):
+        return filtrar_por_estado(criterios["estado"])
+    if criterios.get("cliente"):
+        return filtrar_por_cliente(criterios["cliente"])
+    if criterios.get("prioridad"):
+        return filtrar_por_prioridad(validar_prioridad(str(criterios["prioridad"]))[1])
+    raise ErrorOperacion("indica --estado, --cliente o --prioridad")
+
+
+def ejecutar_lote(entrada: TextIO, salida: TextIO) -> int:
+    """
+    Ejecuta operaciones JSONL leídas de la entrada, una por línea, y escribe
+    una línea de resultado por operación. Un error no detiene el lote.
+    
+    Args:
+        entrada (TextIO): Flujo con una operación JSON por línea.
+        salida (TextIO): Flujo donde se escriben los resultados.
+        
+    Returns:
+        int: Cantidad de operaciones con error.
+    """
+    errores = 0
+    
+    for numero, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            resultado = ejecutar_operacion(json.loads(linea))
+            _escribir_json({"ok": True, "linea": numero, "resultado": resultado}, salida)
+        except (ErrorOperacion, ValueError, TypeError, AttributeError) as e:
+            errores += 1
+            _escribir_json({"ok": False, "linea": numero, "error": str(e)}, salida)
+    
+    return errores
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos con un subcomando por operación.
+    
+    Returns:
+        argparse.ArgumentParser: Parser configurado.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Sistema de Gestión de Proyectos (modo no interactivo)."
+    )
+    parser.add_argument("--usuario", default=os.environ.get(VARIABLE_USUARIO),
+                        help=f"usuario (por defecto ${VARIABLE_USUARIO})")
+    parser.add_argument("--contrasena", default=os.environ.get(VARIABLE_CONTRASENA),
+                        help=f"contraseña (por defecto ${VARIABLE_CONTRASENA})")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+    
+    listar = subparsers.add_parser("list", help="lista todos los proyectos")
+    listar.add_argument("--formato", choices=("jsonl", "json"), default="jsonl")
+    
+    agregar = subparsers.add_parser("add", help="agrega un proyecto")
+    agregar.add_argument("--id", type=int, help="ID (si se omite se asigna el siguiente libre)")
+    agregar.add_argument("--nombre", required=True)
+    agregar.add_argument("--cliente", required=True)
+    agregar.add_argument("--estado", default="Pendiente", choices=sorted(ESTADOS_VALIDOS))
+    agregar.add_argument("--horas-estimadas", type=int, default=0)
+    agregar.add_argument("--tareas-completadas", type=int, default=0)
+    agregar.add_argument("--prioridad", default="Media")
+    agregar.add_argument("--fecha-inicio")
+    
+    actualizar = subparsers.add_parser("update", help="modifica en bloque los proyectos seleccionados")
+    eliminar = subparsers.add_parser("delete", help="elimina en bloque los proyectos seleccionados")
+    for seleccion in (actualizar, eliminar):
+        seleccion.add_argument("--ids", type=int, nargs="+", help="IDs (excluyente con los filtros)")
+        seleccion.add_argument("--estado", action="append", choices=sorted(ESTADOS_VALIDOS))
+        seleccion.add_argument("--cliente", action="append")
+        seleccion.add_argument("--prioridad", action="append", help="Alta, Media o Baja")
+        seleccion.add_argument("--desde", help="fecha_inicio mínima (YYYY-MM-DD)")
+        seleccion.add_argument("--hasta", help="fecha_inicio máxima (YYYY-MM-DD)")
+    actualizar.add_argument("--set", dest="cambios", action="append", required=True, metavar="CAMPO=VALOR",
+                            help="campo a modificar (puede repetirse; valor vacío lo elimina)")
+    
+    filtrar = subparsers.add_parser("filter", help="filtra proyectos por un campo indexado")
+    filtrar.add_argument("--estado", choices=sorted(ESTADOS_VALIDOS))
+    filtrar.add_argument("--cliente")
+    filtrar.add_argument("--prioridad", help="Alta, Media o Baja")
+    filtrar.add_argument("--formato", choices=("jsonl", "json"), default="jsonl")
+    
+    consulta = subparsers.add_parser("query", help="consulta con criterios combinados")
+    consulta.add_argument("--estado", action="append", choices=sorted(ESTADOS_VALIDOS),
+                          help="puede repetirse para aceptar varios estados")
+    consulta.add_argument("--cliente", action="append", help="puede repetirse")
+    consulta.add_argument("--prioridad", action="append", help="Alta, Media o Baja (puede repetirse)")
+    consulta.add_argument("--horas-min", type=int)
+    consulta.add_argument("--horas-max", type=int)
+    consulta.add_argument("--progreso-min", type=float)
+    consulta.add_argument("--progreso-max", type=float)
+    consulta.add_argument("--desde", dest="fecha_desde", help="fecha_inicio mínima (YYYY-MM-DD)")
+    consulta.add_argument("--hasta", dest="fecha_hasta", help="fecha_inicio máxima (YYYY-MM-DD)")
+    consulta.add_argument("--explicar", action="store_true", help="muestra el plan sin ejecutar")
+    consulta.add_argument("--formato", choices=("jsonl", "json"), default="jsonl")
+    
+    top = subparsers.add_parser("top", help="proyectos de mayor prioridad y menor avance")
+    top.add_argument("-k", type=int, default=20, help="cantidad de proyectos (por defecto 20)")
+    top.add_argument("--criterio", choices=CRITERIOS_ORDEN, default="prioridad")
+    top.add_argument("--estado", action="append", choices=sorted(ESTADOS_VALIDOS))
+    top.add_argument("--cliente", action="append")
+    top.add_argument("--formato", choices=("jsonl", "json"), default="jsonl")
+    
+    buscar = subparsers.add_parser("search", help="busca por palabras del nombre o del cliente")
+    buscar.add_argument("texto", help="palabras a buscar; la última se completa como prefijo")
+    buscar.add_argument("-k", type=int, default=RESULTADOS_POR_DEFECTO,
+                        help=f"cantidad máxima de resultados (por defecto {RESULTADOS_POR_DEFECTO})")
+    buscar.add_argument("--exacto", action="store_true", help="no completa la última palabra")
+    buscar.add_argument("--incluir-archivados", action="store_true",
+                        help="busca también entre los proyectos archivados (lee el archivo completo)")
+    buscar.add_argument("--formato", choices=("jsonl", "json"), default="jsonl")
+    
+    reporte = subparsers.add_parser("report", help="muestra el reporte de productividad")
+    reporte.add_argument("--procesos", type=int,
+                         help="recalcula recorriendo los proyectos con N procesos e incluye los totales por cliente")
+    reporte.add_argument("--por-cliente", action="store_true",
+                         help="una fila por cliente con sus totales, avance promedio y estados")
+    
+    vigilar = subparsers.add_parser("watch", help="reporte de productividad en vivo (una línea JSON por cambio)")
+    vigilar.add_argument("--intervalo", type=float, default=INTERVALO_REDIBUJO,
+                         help="segundos mínimos entre dos líneas")
+    vigilar.add_argument("--duracion", type=float, help="segundos a vigilar (por defecto hasta Ctrl+C)")
+    
+    rendimiento = subparsers.add_parser("throughput", help="iniciados/finalizados por semana o mes")
+    rendimiento.add_argument("--periodo", choices=PERIODOS, default="mes")
+    rendimiento.add_argument("--desde", help="fecha mínima (YYYY-MM-DD)")
+    rendimiento.add_argument("--hasta", help="fecha máxima (YYYY-MM-DD)")
+    
+    importar = subparsers.add_parser("import", help="importa proyectos desde un CSV")
+    importar.add_argument("archivo", type=Path)
+    
+    exportar = subparsers.add_parser("export", help="exporta proyectos o reportes a CSV/JSONL")
+    exportar.add_argument("contenido", choices=("proyectos", "reporte", "throughput"))
+    exportar.add_argument("--formato", choices=FORMATOS,
+                          help="por defecto según la extensión de --salida, o csv")
+    exportar.add_argument("--salida", type=Path, help="archivo de destino (por defecto stdout)")
+    exportar.add_argument("--estado", action="append", choices=sorted(ESTADOS_VALIDOS))
+    exportar.add_argument("--cliente", action="append")
+    exportar.add_argument("--prioridad", action="append", help="Alta, Media o Baja")
+    exportar.add_argument("--periodo", choices=PERIODOS, default="mes", help="para throughput")
+    exportar.add_argument("--desde", help="fecha mínima (YYYY-MM-DD)")
+    exportar.add_argument("--hasta", help="fecha máxima (YYYY-MM-DD)")
+    
+    archivar = subparsers.add_parser("archive", help="archiva comprimidos los proyectos finalizados antiguos")
+    archivar.add_argument("--dias", type=int,
+                          help="días desde fecha_fin (por defecto GESTION_DIAS_ARCHIVO o 180)")
+    archivar.add_argument("--hoy", help="fecha de referencia (YYYY-MM-DD, por defecto hoy)")
+    
+    subparsers.add_parser("batch", help="ejecuta operaciones JSONL leídas de stdin")
+    subparsers.add_parser("compact", help="consolida el diario en database.json")
+    
+    return parser
+
+
+def ejecutar(argumentos: List[str], entrada: TextIO = sys.stdin, salida: TextIO = sys.stdout) -> int:
+    """
+    Punto de entrada del modo no interactivo.
+    
+    Args:
+        argumentos (List[str]): Argumentos de línea de comandos (sin el programa).
+        entrada (TextIO): Entrada para el subcomando batch.
+        salida (TextIO): Salida donde se escribe el JSON.
+        
+    Returns:
+        int: Código de salida (0 éxito, 1 error de operación, 2 sin autenticar).
+    """
+    args = crear_parser().parse_args(argumentos)
+    
+    if not verificar_credenciales(args.usuario or "", args.contrasena or ""):
+        _escribir_json({"ok": False, "error": "credenciales inválidas"}, salida)
+        return 2
+    
+    inicializar_persistencia()
+    try:
+        if args.comando == "list":
+            _escribir_proyectos(obtener_proyectos(), args.formato, salida)
+        elif args.comando == "filter":
+            _escribir_proyectos(_filtrar(vars(args)), args.formato, salida)
+        elif args.comando == "query":
+            criterios = {
+                criterio: valor for criterio, valor in vars(args).items()
+                if criterio in CRITERIOS_CONSULTA and valor is not None
+            }
+            if args.explicar:
+                _escribir_json(explicar_consulta(**criterios), salida)
+            else:
+                _escribir_proyectos(consultar(**criterios), args.formato, salida)
+        elif args.comando == "top":
+            criterios = {
+                criterio: valor for criterio, valor in (("estado", args.estado), ("cliente", args.cliente))
+                if valor
+            }
+            _escribir_proyectos(top_proyectos(args.k, args.criterio, **criterios), args.formato, salida)
+        elif args.comando == "search":
+            _escribir_proyectos(
+                buscar_proyectos(args.texto, args.k, not args.exacto, args.incluir_archivados), args.formato, salida
+            )
+        elif args.comando == "report":
+            if args.por_cliente:
+                _escribir_json(obtener_agregados_por_cliente(), salida)
+            elif args.procesos is None:
+                _escribir_json(obtener_agregados(), salida)
+            else:
+                _escribir_json(calcular_agregados_en_paralelo(obtener_proyectos(), args.procesos), salida)
+        elif args.comando == "watch":
+            def escribir_totales(agregados: Dict[str, Any]) -> None:
+                _escribir_json(agregados, salida)
+                salida.flush()
+            
+            Tablero(args.intervalo, escribir_totales).ejecutar(args.duracion)
+        elif args.comando == "throughput":
+            _escribir_json(reporte_por_periodo(args.periodo, args.desde, args.hasta), salida)
+        elif args.comando == "add":
+            _escribir_resultado(ejecutar_operacion({"op": "add", **vars(args)}), salida)
+        elif args.comando == "update":
+            resultado = ejecutar_operacion(
+                {"op": "update", "cambios": _leer_cambios(args.cambios), **_seleccion(args)}
+            )
+            _escribir_resultado(resultado, salida)
+        elif args.comando == "delete":
+            _escribir_resultado(ejecutar_operacion({"op": "delete", **_seleccion(args)}), salida)
+        elif args.comando == "archive":
+            _escribir_resultado(ejecutar_operacion({"op": "archive", "dias": args.dias, "hoy": args.hoy}), salida)
+        elif args.comando == "import":
+            for reporte in importar_csv(args.archivo):
+                _escribir_json(reporte, salida)
+        elif args.comando == "export":
+            if args.salida is None:
+                try:
+                    _exportar(args, args.formato or "csv", salida)
+                    salida.flush()
+                except BrokenPipeError:
+                    # El lector cerró la tubería (p. ej. "| head"): se descarta el resto
+                    # y stdout se redirige a /dev/null para que el cierre no vuelva a fallar
+                    if salida is sys.stdout:
+                        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            else:
+                formato = args.formato or formato_por_extension(args.salida)
+                with open(args.salida, "w", encoding="utf-8", newline="") as archivo:
+                    filas = _exportar(args, formato, archivo)
+                _escribir_resultado({"filas": filas, "archivo": str(args.salida)}, salida)
+        elif args.comando == "batch":
+            return 1 if ejecutar_lote(entrada, salida) else 0
+        elif args.comando == "compact":
+            _escribir_resultado({"proyectos": compactar_base_datos()}, salida)
+        return 0
+    except ErrorOperacion as e:
+        _escribir_json({"ok": False, "error": str(e)}, salida)
+        return 1
+    finally:
+        # El diario ya deja cada cambio persistido; la compactación es explícita
+        cerrar_persistencia(compactar=False)
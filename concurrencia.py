@@ -0,0 +1,185 @@
+"""
+Control de concurrencia para el Sistema de Gestión de Proyectos.
+Bloqueo de lectores-escritor: varias lecturas pueden ejecutarse en paralelo
+y cada escritura se ejecuta sola. Las escrituras en espera tienen prioridad
+sobre las lecturas nuevas, para que un flujo constante de lecturas no las
+postergue indefinidamente.
+
+El bloqueo nace inactivo: en el menú de terminal hay un solo hilo y cada
+llamada protegida solo agrega la comprobación de un booleano. El servidor
+HTTP lo activa antes de empezar a atender pedidos.
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+
+class BloqueoLectoresEscritor:
+    """
+    Bloqueo de lectores-escritor reentrante por hilo: un hilo que ya tiene
+    el bloqueo (de lectura o de escritura) puede volver a pedir lectura, y
+    uno que tiene la escritura puede volver a pedirla, sin bloquearse a sí
+    mismo. Pasar de lectura a escritura no está permitido.
+    """
+    
+    def __init__(self):
+        self.activo = False
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escritor = None
+        self._escritores_en_espera = 0
+        self._local = threading.local()
+    
+    def activar(self, estado: bool = True) -> None:
+        """
+        Activa o desactiva el bloqueo. Debe llamarse cuando ningún hilo lo
+        tiene tomado (al iniciar o detener el servidor).
+        
+        Args:
+            estado (bool): True para que las secciones protegidas se excluyan.
+        """
+        self.activo = estado
+    
+    def _profundidad(self) -> int:
+        """
+        Retorna cuántas lecturas anidadas tiene abiertas el hilo actual.
+        
+        Returns:
+            int: Profundidad de lectura del hilo.
+        """
+        return getattr(self._local, "lecturas", 0)
+    
+    def adquirir_lectura(self) -> None:
+        """
+        Adquiere el bloqueo en modo compartido.
+        """
+        yo = threading.get_ident()
+        if self._escritor == yo or self._profundidad():
+            self._local.lecturas = self._profundidad() + 1
+            return
+        with self._condicion:
+            while self._escritor is not None or self._escritores_en_espera:
+                self._condicion.wait()
+            self._lectores += 1
+        self._local.lecturas = 1
+    
+    def liberar_lectura(self) -> None:
+        """
+        Libera el bloqueo compartido adquirido con adquirir_lectura().
+        """
+        self._local.lecturas = self._profundidad() - 1
+        if self._local.lecturas or self._escritor == threading.get_ident():
+            return
+        with self._condicion:
+            self._lectores -= 1
+            if not self._lectores:
+                self._condicion.notify_all()
+    
+    def adquirir_escritura(self) -> None:
+        """
+        Adquiere el bloqueo en modo exclusivo.
+        
+        Raises:
+            RuntimeError: Si el hilo tiene una lectura abierta (no se puede
+            pasar de lectura a escritura sin riesgo de bloqueo mutuo).
+        """
+        yo = threading.get_ident()
+        if self._escritor == yo:
+            self._local.escrituras += 1
+            return
+        if self._profundidad():
+            raise RuntimeError("No se puede pasar de lectura a escritura")
+        with self._condicion:
+            self._escritores_en_espera += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_en_espera -= 1
+            self._escritor = yo
+        self._local.escrituras = 1
+    
+    def liberar_escritura(self) -> None:
+        """
+        Libera el bloqueo exclusivo adquirido con adquirir_escritura().
+        """
+        self._local.escrituras -= 1
+        if self._local.escrituras:
+            return
+        with self._condicion:
+            self._escritor = None
+            self._condicion.notify_all()
+    
+    @contextmanager
+    def lectura(self) -> Iterator[None]:
+        """
+        Administrador de contexto para una sección de lectura.
+        """
+        if not self.activo:
+            yield
+            return
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+    
+    @contextmanager
+    def escritura(self) -> Iterator[None]:
+        """
+        Administrador de contexto para una sección de escritura.
+        """
+        if not self.activo:
+            yield
+            return
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+    
+    def lector(self, funcion: Callable) -> Callable:
+        """
+        Decorador que ejecuta la función con el bloqueo de lectura.
+        
+        Args:
+            funcion (Callable): Función que solo lee el estado compartido.
+            
+        Returns:
+            Callable: Función envuelta.
+        """
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not self.activo:
+                return funcion(*args, **kwargs)
+            self.adquirir_lectura()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self.liberar_lectura()
+        
+        return envoltura
+    
+    def escritor(self, funcion: Callable) -> Callable:
+        """
+        Decorador que ejecuta la función con el bloqueo de escritura.
+        
+        Args:
+            funcion (Callable): Función que modifica el estado compartido.
+            
+        Returns:
+            Callable: Función envuelta.
+        """
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not self.activo:
+                return funcion(*args, **kwargs)
+            self.adquirir_escritura()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self.liberar_escritura()
+        
+        return envoltura
@@ -3,10 +3,41 @@ Módulo de gestión de datos para el Sistema de Gestión de Proyectos.
 Maneja las operaciones CRUD y las estructuras de datos principales.
 """
 
-from typing import List, Dict, Optional, Any
+import functools
+import heapq
+import math
+import os
+import threading
+from datetime import date, timedelta
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping, Sequence, Set
+from itertools import chain, groupby, islice
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Tuple
+
+from archivo import ArchivoProyectos, VistaConArchivados
+from busqueda import IndiceTexto, puntaje, tokenizar, RESULTADOS_POR_DEFECTO
+from derivados import actualizar_derivados, avance, sin_derivados
+from utils import (
+    crear_agregados_vacios,
+    acumular_proyecto,
+    acumular_cliente,
+    calcular_agregados,
+    calcular_agregados_por_cliente,
+    clave_periodo,
+    ESTADOS_VALIDOS,
+    PERIODOS,
+    PRIORIDADES_VALIDAS
+)
+from proyecto_compacto import ProyectoCompacto
+from metricas import medir, contar
+from concurrencia import BloqueoLectoresEscritor
+from almacenamiento import Almacen, AlmacenSQLite, RUTA_SQLITE
+import persistencia
 
 # Lista constante pre-cargada con 3 proyectos de prueba de una agencia web
-PROYECTOS = [
+_PROYECTOS_INICIALES = [
     {
         "id": 1,
         "nombre": "E-commerce Zapatillas",
@@ -36,23 +67,424 @@ PROYECTOS = [
     }
 ]
 
-# Conjunto para validaciones rápidas de ID duplicados
-IDS_EXISTENTES = {proyecto["id"] for proyecto in PROYECTOS}
+# Bloqueo de lectores-escritor del almacén: las funciones públicas de
+# consulta toman la lectura (en paralelo entre sí) y las que modifican el
+# almacén o la persistencia toman la escritura (de a una)
+BLOQUEO = BloqueoLectoresEscritor()
+
+# Índice primario: ID -> proyecto (el diccionario conserva el orden de inserción)
+PROYECTOS: Dict[int, Dict[str, Any]] = {}
+
+# Proyectos en orden de inserción. Las altas solo anexan al final; cualquier
+# cambio que modifique o quite elementos debe reemplazar la lista por una
+# copia nueva (copy-on-write) para no alterar las vistas ya entregadas.
+_REGISTRO: List[Dict[str, Any]] = []
+
+# Versión del almacén: aumenta con cada escritura
+_VERSION = 0
+
+# Motor de almacenamiento activo: None usa las estructuras en memoria de
+# este módulo; un Almacen (por ejemplo SQLite) recibe todas las operaciones
+MOTORES = ("memoria", "sqlite")
+VARIABLE_MOTOR = "GESTION_MOTOR"
+_MOTOR: Optional[Almacen] = None
+
+# Antigüedad (días desde fecha_fin) a partir de la cual archivar_finalizados
+# mueve un proyecto finalizado al archivo comprimido
+DIAS_ARCHIVO = 180
+VARIABLE_DIAS_ARCHIVO = "GESTION_DIAS_ARCHIVO"
+
+
+class _IdsExistentes(Set):
+    """
+    Conjunto de solo lectura con los IDs registrados, usado para validar
+    IDs duplicados. Consulta el motor activo y el archivo de finalizados,
+    así que se mantiene al día con cada alta sin copiar nada.
+    """
+    
+    __slots__ = ()
+    
+    def __contains__(self, id_proyecto: object) -> bool:
+        if _MOTOR is not None:
+            return _MOTOR.contiene(id_proyecto)
+        return id_proyecto in PROYECTOS or (_ARCHIVO is not None and id_proyecto in _ARCHIVO)
+    
+    def __iter__(self):
+        if _MOTOR is not None:
+            return _MOTOR.ids()
+        if _ARCHIVO is not None:
+            return chain(PROYECTOS, _ARCHIVO.ids())
+        return iter(PROYECTOS)
+    
+    def __len__(self) -> int:
+        if _MOTOR is not None:
+            return _MOTOR.cantidad()
+        return len(PROYECTOS) + (len(_ARCHIVO) if _ARCHIVO is not None else 0)
+
+
+# IDs registrados, para validaciones rápidas de ID duplicados
+IDS_EXISTENTES = _IdsExistentes()
+
+# Campos con índice secundario: valor del campo -> {ID: proyecto}
+CAMPOS_INDEXADOS = ("estado", "cliente", "prioridad")
+INDICES_SECUNDARIOS: Dict[str, Dict[Any, Dict[int, Dict[str, Any]]]] = {
+    campo: {} for campo in CAMPOS_INDEXADOS
+}
+
+# Índices ordenados: listas de claves (tuplas terminadas en el ID) que se
+# mantienen ordenadas con bisect. "prioridad" ordena por (nivel, progreso)
+# y "progreso" por (progreso, nivel). Las altas se acumulan en pendientes y
+# se incorporan al leer: de a una con insort si son pocas, o con un único
+# sort (que aprovecha los tramos ya ordenados) si llegan en lote.
+# Las fechas usan el mismo mecanismo con claves (fecha, id): como las fechas
+# están en formato YYYY-MM-DD, el orden de texto coincide con el cronológico
+# y un rango se resuelve con dos búsquedas binarias.
+CRITERIOS_ORDEN = ("prioridad", "progreso")
+CAMPOS_FECHA = ("fecha_inicio", "fecha_fin", "fecha_actualizacion")
+_ORDENES: Dict[str, List[Tuple[Any, ...]]] = {
+    criterio: [] for criterio in CRITERIOS_ORDEN + CAMPOS_FECHA
+}
+_ORDENES_PENDIENTES: Dict[str, List[Tuple[Any, ...]]] = {
+    criterio: [] for criterio in CRITERIOS_ORDEN + CAMPOS_FECHA
+}
+UMBRAL_REORDENAMIENTO = 64
+
+# Incorporar las altas pendientes modifica el índice durante una lectura:
+# este bloqueo evita que dos lectores concurrentes lo hagan a la vez
+_BLOQUEO_ORDENES = threading.Lock()
+
+# Totales acumulados que se actualizan en cada alta (reporte en O(1))
+AGREGADOS: Dict[str, Any] = crear_agregados_vacios()
+
+# Totales por cliente, también incrementales: el reporte por cliente cuesta
+# O(clientes) en lugar de O(proyectos)
+AGREGADOS_POR_CLIENTE: Dict[str, Dict[str, Any]] = {}
+
+# Índice de texto de nombres y clientes: se construye en la primera búsqueda
+# y desde entonces se mantiene con cada cambio (None si nunca se buscó)
+_INDICE_TEXTO: Optional[IndiceTexto] = None
+
+# Si está activo, los proyectos se guardan como ProyectoCompacto (__slots__)
+# en lugar de diccionarios, reduciendo la memoria por registro
+_ALMACEN_COMPACTO = False
+
+# Estado de la persistencia: diario abierto y datos de la instantánea que
+# no son proyectos (usuarios y metadatos), para reescribirlos al compactar
+_DIARIO: Optional[persistencia.Diario] = None
+_RUTA_BASE_DATOS: Path = persistencia.RUTA_BASE_DATOS
+_USUARIOS_BASE: Dict[str, str] = {}
+_METADATA_BASE: Dict[str, Any] = {}
+
+# Secuencia de IDs de las altas (database.ids); se abre al terminar la carga,
+# cuando el mayor ID del almacén ya se conoce
+_SECUENCIA: Optional[persistencia.SecuenciaIds] = None
+
+# Proyectos finalizados archivados (database.archivo.jsonl.gz): fuera de los
+# índices, con sus totales en memoria; None con el motor SQLite
+_ARCHIVO: Optional[ArchivoProyectos] = None
+
+# Carga en segundo plano: el hilo agrega los proyectos en tandas, tomando el
+# bloqueo de escritura una vez por tanda, y entre tandas las consultas ven lo
+# ya cargado. Las funciones que modifican el almacén esperan a que termine.
+PROYECTOS_POR_TANDA = 1000
+_HILO_CARGA: Optional[threading.Thread] = None
+_CONDICION_CARGA = threading.Condition()
+_CARGA: Dict[str, Any] = {"en_curso": False, "cargados": 0, "total": None, "error": None}
+
+# Suscriptores de los cambios del almacén: reciben pares (anterior, nuevo)
+# de cada cambio confirmado, o None si el almacén se reemplazó por completo
+Cambio = Tuple[Optional[Mapping], Optional[Mapping]]
+_SUSCRIPTORES: List[Callable[[Optional[List[Cambio]]], None]] = []
+
+# Seguimiento de los cambios de otros procesos: posición leída del diario,
+# firma de la instantánea y versión de la base SQLite vistas por última vez
+_SEGUIMIENTO: Dict[str, Any] = {"posicion": None, "firma": None, "version": None}
+
+# Lo que el almacén en memoria ya refleja de la base en disco: firma de la
+# instantánea cargada y posición del diario hasta la que se reaplicó. Lo
+# que otros procesos anexen después se incorpora al compactar.
+_CARGADO: Dict[str, Any] = {"posicion": 0, "firma": None}
+
+
+def _tras_la_carga(funcion: Callable) -> Callable:
+    """
+    Decorador que espera a que termine la carga en segundo plano antes de
+    ejecutar la función (salvo en el propio hilo de carga). Debe aplicarse
+    por fuera de BLOQUEO.escritor para no esperar con el bloqueo tomado.
+    
+    Args:
+        funcion (Callable): Función que modifica el almacén.
+        
+    Returns:
+        Callable: Función envuelta.
+    """
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        hilo = _HILO_CARGA
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+        return funcion(*args, **kwargs)
+    
+    return envoltura
+
+
+class VistaProyectos(Sequence):
+    """
+    Vista inmutable y sin copia sobre una lista de proyectos.
+    Guarda la lista y el rango de posiciones visibles al crearse, así que las
+    altas posteriores no la modifican, y entrega cada proyecto envuelto en un
+    MappingProxyType de solo lectura. Recortarla (vista[a:b]) crea otra vista
+    sobre la misma lista, también sin copiar.
+    """
+    
+    __slots__ = ("_lista", "_rango", "version")
+    
+    def __init__(self, lista: List[Dict[str, Any]], rango: Optional[range] = None, version: int = 0):
+        """
+        Crea la vista.
+        
+        Args:
+            lista (List[Dict[str, Any]]): Lista de proyectos que se expone.
+            rango (Optional[range]): Posiciones visibles (por defecto toda la lista actual).
+            version (int): Versión del almacén en el momento de la lectura.
+        """
+        self._lista = lista
+        self._rango = range(len(lista)) if rango is None else rango
+        self.version = version
+    
+    def __len__(self) -> int:
+        return len(self._rango)
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return VistaProyectos(self._lista, self._rango[posicion], self.version)
+        return MappingProxyType(self._lista[self._rango[posicion]])
+    
+    def __iter__(self):
+        lista = self._lista
+        for posicion in self._rango:
+            yield MappingProxyType(lista[posicion])
+    
+    def __repr__(self) -> str:
+        return f"VistaProyectos(version={self.version}, proyectos={len(self)})"
+
+
+def _clave_indice(proyecto: Dict[str, Any], campo: str) -> Any:
+    """
+    Obtiene la clave con la que un proyecto se registra en un índice secundario.
+    La prioridad se indexa por su nivel numérico (1=Alta, 2=Media, 3=Baja).
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a indexar.
+        campo (str): Nombre del campo indexado.
+        
+    Returns:
+        Any: Valor hashable usado como clave del índice.
+    """
+    valor = proyecto.get(campo)
+    if campo == "prioridad" and valor is not None:
+        return valor[1]
+    return valor
+
+
+def _claves_orden(proyecto: Dict[str, Any]) -> Dict[str, Tuple[Any, ...]]:
+    """
+    Calcula las claves con las que un proyecto se ubica en los índices ordenados.
+    Los proyectos sin prioridad quedan al final del orden por prioridad y
+    los que no tienen una fecha no figuran en el índice de esa fecha.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a ordenar.
+        
+    Returns:
+        Dict[str, Tuple[Any, ...]]: Clave por cada índice ordenado que aplica.
+    """
+    nivel = _clave_indice(proyecto, "prioridad")
+    if nivel is None:
+        nivel = len(PRIORIDADES_VALIDAS) + 1
+    progreso = avance(proyecto)
+    claves = {
+        "prioridad": (nivel, progreso, proyecto["id"]),
+        "progreso": (progreso, nivel, proyecto["id"])
+    }
+    for campo in CAMPOS_FECHA:
+        fecha = proyecto.get(campo)
+        if fecha:
+            claves[campo] = (fecha, proyecto["id"])
+    return claves
+
+
+def _indexar_proyecto(proyecto: Dict[str, Any]) -> None:
+    """
+    Calcula los campos derivados del proyecto y lo registra en el índice
+    primario, en los índices secundarios y en los índices ordenados.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a registrar.
+    """
+    actualizar_derivados(proyecto)
+    id_proyecto = proyecto["id"]
+    PROYECTOS[id_proyecto] = proyecto
+    _REGISTRO.append(proyecto)
+    for campo in CAMPOS_INDEXADOS:
+        indice = INDICES_SECUNDARIOS[campo]
+        indice.setdefault(_clave_indice(proyecto, campo), {})[id_proyecto] = proyecto
+    for criterio, clave in _claves_orden(proyecto).items():
+        _ORDENES_PENDIENTES[criterio].append(clave)
+    if _INDICE_TEXTO is not None:
+        _INDICE_TEXTO.agregar(proyecto)
+
+
+def _acumular_totales(proyecto: Dict[str, Any], signo: int = 1) -> None:
+    """
+    Suma o resta un proyecto de los totales globales y de los de su cliente.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a sumar o restar.
+        signo (int): 1 para sumar, -1 para restar.
+    """
+    acumular_proyecto(AGREGADOS, proyecto, signo)
+    acumular_cliente(AGREGADOS_POR_CLIENTE, proyecto, signo)
+
+
+def _orden_actualizado(criterio: str) -> List[Tuple[Any, ...]]:
+    """
+    Incorpora las altas pendientes al índice ordenado y lo retorna.
+    
+    Args:
+        criterio (str): Criterio de CRITERIOS_ORDEN o campo de CAMPOS_FECHA.
+        
+    Returns:
+        List[Tuple[Any, ...]]: Claves ordenadas de menor a mayor.
+    """
+    orden = _ORDENES[criterio]
+    pendientes = _ORDENES_PENDIENTES[criterio]
+    if pendientes:
+        with _BLOQUEO_ORDENES:
+            if len(pendientes) <= UMBRAL_REORDENAMIENTO:
+                for clave in pendientes:
+                    insort(orden, clave)
+            else:
+                orden.extend(pendientes)
+                orden.sort()
+            pendientes.clear()
+    return orden
+
+
+def _tramo_fechas(campo: str, desde: Optional[str] = None,
+                  hasta: Optional[str] = None) -> Tuple[List[Tuple[Any, ...]], int, int]:
+    """
+    Ubica con búsqueda binaria el tramo del índice de fechas comprendido
+    entre dos fechas (ambas inclusive), en O(log n).
+    
+    Args:
+        campo (str): Campo de CAMPOS_FECHA.
+        desde (Optional[str]): Fecha mínima YYYY-MM-DD (None = sin límite).
+        hasta (Optional[str]): Fecha máxima YYYY-MM-DD (None = sin límite).
+        
+    Returns:
+        Tuple[List[Tuple[Any, ...]], int, int]: Índice ordenado y posiciones
+        [inicio, fin) del tramo.
+        
+    Raises:
+        ValueError: Si el campo no es una fecha indexada.
+    """
+    if campo not in CAMPOS_FECHA:
+        raise ValueError(f"Campo de fecha inválido: {campo!r}")
+    orden = _orden_actualizado(campo)
+    inicio = bisect_left(orden, (desde,)) if desde else 0
+    fin = bisect_right(orden, (hasta, float("inf"))) if hasta else len(orden)
+    return orden, inicio, max(inicio, fin)
+
+
+# Cargar los proyectos iniciales en los índices y en los totales
+for _proyecto in _PROYECTOS_INICIALES:
+    _indexar_proyecto(_proyecto)
+    _acumular_totales(_proyecto)
+
+
+@medir()
+@BLOQUEO.lector
+def obtener_proyectos() -> VistaProyectos:
+    """
+    Retorna una vista de solo lectura de todos los proyectos, sin copiar la lista.
+    La vista refleja el estado al momento de la llamada aunque luego se
+    agreguen proyectos.
+    
+    Returns:
+        VistaProyectos: Secuencia de proyectos (cada uno como mapeo de solo lectura).
+    """
+    if _MOTOR is not None:
+        return _MOTOR.consultar({})
+    return VistaProyectos(_REGISTRO, version=_VERSION)
 
 
-def obtener_proyectos() -> List[Dict[str, Any]]:
+def obtener_version() -> int:
     """
-    Retorna la lista completa de proyectos.
+    Retorna la versión actual del almacén (aumenta con cada escritura).
     
     Returns:
-        List[Dict[str, Any]]: Lista de diccionarios con información de proyectos.
+        int: Número de versión.
+    """
+    return _VERSION
+
+
+def suscribir_cambios(funcion: Callable[[Optional[List[Cambio]]], None]) -> None:
+    """
+    Registra una función que recibe cada cambio confirmado en el almacén,
+    para mantener al día una vista derivada (por ejemplo, un tablero) sin
+    volver a recorrer los proyectos. Se llama con el bloqueo de escritura
+    tomado, así que debe ser breve (por ejemplo, encolar el cambio).
+    
+    La función recibe una lista de pares (anterior, nuevo) de solo lectura:
+    anterior es None en las altas y nuevo es None en las bajas. None en lugar
+    de la lista indica que el almacén se reemplazó por completo (recarga,
+    reversión de un lote o cambio de motor) y que hay que releer los totales.
+    
+    Args:
+        funcion (Callable): Función a llamar con cada cambio.
+    """
+    _SUSCRIPTORES.append(funcion)
+
+
+def cancelar_suscripcion(funcion: Callable[[Optional[List[Cambio]]], None]) -> None:
+    """
+    Deja de enviar cambios a una función registrada con suscribir_cambios.
+    
+    Args:
+        funcion (Callable): Función registrada.
+    """
+    if funcion in _SUSCRIPTORES:
+        _SUSCRIPTORES.remove(funcion)
+
+
+def _notificar(cambios: Optional[List[Tuple[Any, Any]]]) -> None:
     """
-    return PROYECTOS.copy()
+    Envía un cambio confirmado a los suscriptores.
+    
+    Args:
+        cambios (Optional[List[Tuple[Any, Any]]]): Pares (anterior, nuevo), o
+            None si el almacén se reemplazó por completo.
+    """
+    if cambios is not None:
+        cambios = [
+            tuple(None if proyecto is None else MappingProxyType(proyecto) for proyecto in par)
+            for par in cambios
+        ]
+    for funcion in list(_SUSCRIPTORES):
+        funcion(cambios)
 
 
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
 def agregar_proyecto(nuevo_proyecto: Dict[str, Any]) -> bool:
     """
-    Agrega un nuevo proyecto a la lista validando que el ID no exista.
+    Agrega un nuevo proyecto validando que el ID no exista, ni entre los
+    activos ni entre los archivados.
+    El proyecto queda registrado en el índice primario y en los secundarios.
+    Si se da de alta ya finalizado y sin fecha_fin, se cierra con la fecha
+    de hoy (ver _con_fecha_fin).
     
     Args:
         nuevo_proyecto (Dict[str, Any]): Diccionario con la información del proyecto.
@@ -60,49 +492,1804 @@ def agregar_proyecto(nuevo_proyecto: Dict[str, Any]) -> bool:
     Returns:
         bool: True si se agregó exitosamente, False si el ID ya existe.
     """
+    global _VERSION
+    
     id_proyecto = nuevo_proyecto.get("id")
     
     if id_proyecto is None:
         return False
+    nuevo_proyecto = _con_fecha_fin(nuevo_proyecto, date.today().isoformat())
     
-    # Validación rápida usando el conjunto
-    if id_proyecto in IDS_EXISTENTES:
+    if _MOTOR is not None:
+        if not _MOTOR.agregar(nuevo_proyecto):
+            contar("data_manager.altas_rechazadas")
+            return False
+        _VERSION += 1
+        if _SECUENCIA is not None:
+            _SECUENCIA.registrar(id_proyecto)
+        if _SUSCRIPTORES:
+            _notificar([(None, nuevo_proyecto)])
+        return True
+    
+    # Validación rápida usando el índice primario y los IDs archivados
+    if id_proyecto in PROYECTOS or (_ARCHIVO is not None and id_proyecto in _ARCHIVO):
+        contar("data_manager.altas_rechazadas")
         return False
     
-    # Agregar el proyecto a la lista
-    PROYECTOS.append(nuevo_proyecto)
+    # Anexar el alta al diario si la persistencia está activa
+    if _DIARIO is not None:
+        _DIARIO.registrar("alta", {"proyecto": sin_derivados(nuevo_proyecto)})
+    
+    # El almacén guarda su propia copia: los campos derivados que se le
+    # agregan al registrarla no aparecen en el diccionario de quien llama
+    if _ALMACEN_COMPACTO and not isinstance(nuevo_proyecto, ProyectoCompacto):
+        nuevo_proyecto = ProyectoCompacto(nuevo_proyecto)
+    elif not _ALMACEN_COMPACTO:
+        nuevo_proyecto = dict(nuevo_proyecto)
     
-    # Actualizar el conjunto de IDs existentes
-    IDS_EXISTENTES.add(id_proyecto)
+    # Registrar el proyecto en todos los índices y en los totales
+    _indexar_proyecto(nuevo_proyecto)
+    _acumular_totales(nuevo_proyecto)
+    _VERSION += 1
     
+    if _SECUENCIA is not None:
+        _SECUENCIA.registrar(id_proyecto)
+    if _SUSCRIPTORES:
+        _notificar([(None, nuevo_proyecto)])
     return True
 
 
-def filtrar_por_estado(estado: str) -> List[Dict[str, Any]]:
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def agregar_proyectos(lote: List[Dict[str, Any]]) -> List[int]:
     """
-    Filtra los proyectos por estado.
+    Agrega un lote de proyectos y sincroniza el diario una sola vez al final.
     
     Args:
-        estado (str): Estado a filtrar ("Pendiente", "En Progreso", "Finalizado").
+        lote (List[Dict[str, Any]]): Proyectos a agregar.
+        
+    Returns:
+        List[int]: IDs de los proyectos rechazados por estar duplicados.
+    """
+    global _VERSION
+    
+    if _MOTOR is not None:
+        hoy = date.today().isoformat()
+        lote = [_con_fecha_fin(proyecto, hoy) for proyecto in lote]
+        # Un solo executemany en una transacción
+        rechazados = _MOTOR.agregar_lote(lote)
+        _VERSION += 1
+        if _SECUENCIA is not None and lote:
+            _SECUENCIA.registrar(max(proyecto["id"] for proyecto in lote))
+        if _SUSCRIPTORES:
+            ids_rechazados = set(rechazados)
+            _notificar([(None, proyecto) for proyecto in lote if proyecto.get("id") not in ids_rechazados])
+        return rechazados
+    
+    rechazados = [
+        proyecto.get("id") for proyecto in lote if not agregar_proyecto(proyecto)
+    ]
+    
+    if _DIARIO is not None:
+        _DIARIO.sincronizar()
+    
+    return rechazados
+
+
+@BLOQUEO.lector
+def siguiente_id() -> int:
+    """
+    Calcula el primer ID libre después del mayor ID registrado, activo o
+    archivado.
+    
+    Returns:
+        int: ID disponible para un proyecto nuevo.
+    """
+    if _MOTOR is not None:
+        return _MOTOR.siguiente_id()
+    mayor_archivado = _ARCHIVO.mayor_id if _ARCHIVO is not None else 0
+    return max(max(PROYECTOS, default=0), mayor_archivado) + 1
+
+
+def _secuencia() -> persistencia.SecuenciaIds:
+    """
+    Retorna la secuencia de IDs abierta. Sin persistencia se crea una solo
+    en memoria a partir del mayor ID registrado.
+    
+    Returns:
+        persistencia.SecuenciaIds: Secuencia de IDs.
+    """
+    global _SECUENCIA
+    
+    secuencia = _SECUENCIA
+    if secuencia is None:
+        with BLOQUEO.escritura():
+            if _SECUENCIA is None:
+                _SECUENCIA = persistencia.SecuenciaIds(None, siguiente_id())
+            secuencia = _SECUENCIA
+    return secuencia
+
+
+@_tras_la_carga
+def asignar_id() -> int:
+    """
+    Entrega un ID para un proyecto nuevo. Cada proceso reserva los IDs por
+    bloques en database.ids, de modo que las sesiones concurrentes (menú,
+    servidor, CLI) nunca reciben el mismo ID y el alta no necesita comprobar
+    antes si el ID está libre.
+    
+    Returns:
+        int: ID sin usar.
+    """
+    return _secuencia().siguiente()
+
+
+@_tras_la_carga
+def reservar_ids(cantidad: int, minimo: int = 0) -> range:
+    """
+    Reserva de una vez IDs consecutivos para un lote de altas.
+    
+    Args:
+        cantidad (int): IDs a reservar.
+        minimo (int): Primer ID aceptable.
+        
+    Returns:
+        range: IDs reservados para el lote.
+    """
+    return _secuencia().reservar(cantidad, minimo)
+
+
+# Campos que se pueden modificar en lote (el ID y los campos derivados no)
+CAMPOS_MODIFICABLES = (
+    "nombre",
+    "cliente",
+    "estado",
+    "horas_estimadas",
+    "tareas_completadas",
+    "prioridad",
+    "fecha_inicio",
+    "fecha_fin",
+    "fecha_actualizacion"
+)
+
+
+def _normalizar_cambios(cambios: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida los cambios de una modificación en lote y los lleva al formato
+    en memoria. Un valor None en una fecha o en la prioridad quita el campo.
+    
+    Args:
+        cambios (Dict[str, Any]): Campo -> valor nuevo.
         
     Returns:
-        List[Dict[str, Any]]: Lista de proyectos que coinciden con el estado especificado.
+        Dict[str, Any]: Cambios validados (la prioridad como tupla).
+        
+    Raises:
+        ValueError: Si no hay cambios, algún campo no es modificable o algún
+            valor es inválido.
     """
-    return [proyecto for proyecto in PROYECTOS if proyecto.get("estado") == estado]
+    if not cambios:
+        raise ValueError("No hay cambios para aplicar")
+    
+    normalizados = {}
+    for campo, valor in cambios.items():
+        if campo not in CAMPOS_MODIFICABLES:
+            raise ValueError(f"Campo no modificable: {campo!r}")
+        if campo in ("nombre", "cliente"):
+            valor = str(valor or "").strip()
+            if not valor:
+                raise ValueError(f"El campo {campo} no puede quedar vacío")
+        elif campo == "estado":
+            if valor not in ESTADOS_VALIDOS:
+                raise ValueError(f"Estado inválido: {valor!r}")
+        elif campo in ("horas_estimadas", "tareas_completadas"):
+            if isinstance(valor, bool) or not isinstance(valor, int) or valor < 0:
+                raise ValueError(f"El campo {campo} debe ser un entero no negativo")
+        elif campo == "prioridad" and valor is not None:
+            nombre = str(valor[0] if isinstance(valor, (list, tuple)) else valor).strip().capitalize()
+            if nombre not in PRIORIDADES_VALIDAS:
+                raise ValueError(f"Prioridad inválida: {valor!r}")
+            valor = (nombre, PRIORIDADES_VALIDAS[nombre])
+        elif campo.startswith("fecha_") and valor is not None:
+            try:
+                date.fromisoformat(valor)
+            except (TypeError, ValueError):
+                raise ValueError(f"Fecha inválida en {campo}: {valor!r} (formato YYYY-MM-DD)")
+        normalizados[campo] = valor
+    return normalizados
 
 
-def obtener_proyecto_por_id(id_proyecto: int) -> Optional[Dict[str, Any]]:
+def _con_fecha_fin(proyecto: Mapping, hoy: str) -> Mapping:
     """
-    Obtiene un proyecto específico por su ID.
+    Completa fecha_fin de un proyecto finalizado que no la tiene, tanto en
+    las altas como al pasar a "Finalizado" en una modificación: sin ella el
+    proyecto no cuenta en reporte_por_periodo ni lo alcanza
+    archivar_finalizados.
     
     Args:
-        id_proyecto (int): ID del proyecto a buscar.
+        proyecto (Mapping): Proyecto nuevo o modificado.
+        hoy (str): Fecha del alta o del cambio (YYYY-MM-DD).
+        
+    Returns:
+        Mapping: El mismo proyecto, o una copia con fecha_fin si le faltaba.
+    """
+    if proyecto.get("estado") == "Finalizado" and not proyecto.get("fecha_fin"):
+        return dict(proyecto, fecha_fin=hoy)
+    return proyecto
+
+
+def _nueva_version(proyecto: Mapping, cambios: Dict[str, Any], hoy: str) -> Dict[str, Any]:
+    """
+    Crea la versión modificada de un proyecto sin tocar el original, que
+    puede seguir visible en vistas ya entregadas. Al pasar a "Finalizado"
+    se completa fecha_fin si el proyecto no la tenía (ver _con_fecha_fin).
+    Solo se recalculan
+    los campos derivados que dependen de campos que cambiaron.
+    
+    Args:
+        proyecto (Mapping): Proyecto actual.
+        cambios (Dict[str, Any]): Cambios normalizados.
+        hoy (str): Fecha del cambio (YYYY-MM-DD).
+        
+    Returns:
+        Dict[str, Any]: Proyecto nuevo (ProyectoCompacto si el almacén es compacto).
+    """
+    nuevo = dict(proyecto)
+    for campo, valor in cambios.items():
+        if valor is None:
+            nuevo.pop(campo, None)
+        else:
+            nuevo[campo] = valor
+    if "estado" in cambios:
+        nuevo = _con_fecha_fin(nuevo, hoy)
+    
+    modificados = [campo for campo in CAMPOS_MODIFICABLES if nuevo.get(campo) != proyecto.get(campo)]
+    actualizar_derivados(nuevo, modificados)
+    
+    if _ALMACEN_COMPACTO:
+        nuevo = ProyectoCompacto(nuevo)
+    return nuevo
+
+
+def _proyectos_existentes(ids: Iterable[int]) -> List[Mapping]:
+    """
+    Busca los proyectos de una lista de IDs, omitiendo los que no existen
+    y los repetidos.
+    
+    Args:
+        ids (Iterable[int]): IDs a buscar.
+        
+    Returns:
+        List[Mapping]: Proyectos encontrados, en el orden de los IDs.
+    """
+    obtener = _MOTOR.obtener if _MOTOR is not None else PROYECTOS.get
+    proyectos = (obtener(id_proyecto) for id_proyecto in dict.fromkeys(ids))
+    return [proyecto for proyecto in proyectos if proyecto is not None]
+
+
+def _seleccionar(ids: Optional[Iterable[int]], predicado: Optional[Callable[[Mapping], bool]],
+                 criterios: Dict[str, Any]) -> List[Mapping]:
+    """
+    Resuelve los proyectos alcanzados por una operación en lote: una lista
+    de IDs, o bien criterios de consultar() y/o un predicado.
+    
+    Args:
+        ids (Optional[Iterable[int]]): IDs exactos; deben existir todos.
+        predicado (Optional[Callable[[Mapping], bool]]): Condición sobre
+            cada proyecto (recibe un mapeo de solo lectura).
+        criterios (Dict[str, Any]): Criterios de consultar().
+        
+    Returns:
+        List[Mapping]: Proyectos seleccionados, tal como están guardados.
+        
+    Raises:
+        ValueError: Si no se indica ninguna selección, se mezclan IDs con
+            filtros, algún ID no existe o está archivado (los archivados no
+            se modifican ni se eliminan) o algún criterio es inválido.
+    """
+    if ids is not None:
+        if predicado is not None or criterios:
+            raise ValueError("Indica una lista de IDs o un filtro, no ambos")
+        ids = list(dict.fromkeys(ids))
+        proyectos = _proyectos_existentes(ids)
+        if len(proyectos) < len(ids):
+            encontrados = {proyecto["id"] for proyecto in proyectos}
+            faltantes = [id_proyecto for id_proyecto in ids if id_proyecto not in encontrados]
+            archivados = [id_proyecto for id_proyecto in faltantes if _ARCHIVO is not None and id_proyecto in _ARCHIVO]
+            if archivados:
+                raise ValueError(
+                    f"Los proyectos {', '.join(map(str, archivados))} están archivados: no se pueden modificar ni eliminar"
+                )
+            raise ValueError(f"No existen los proyectos: {', '.join(map(str, faltantes))}")
+        return proyectos
+    
+    if predicado is None and not criterios:
+        raise ValueError("Indica los IDs, un predicado o criterios de consulta")
+    candidatos = _consultar_activos(_normalizar_criterios(criterios)) if criterios else obtener_proyectos()
+    seleccion = [proyecto for proyecto in candidatos if predicado is None or predicado(proyecto)]
+    if _MOTOR is not None:
+        return seleccion
+    # Las consultas entregan mapeos de solo lectura: se vuelve al registro guardado
+    return [PROYECTOS[proyecto["id"]] for proyecto in seleccion]
+
+
+def _aplicar_reemplazos(reemplazos: Dict[int, Optional[Dict[str, Any]]]) -> None:
+    """
+    Reemplaza (o elimina, si el valor es None) proyectos del almacén en
+    memoria, actualizando índices y totales una sola vez por lote: las
+    claves viejas salen de los índices ordenados en una pasada, los grupos
+    de los índices secundarios que reciben proyectos se rearman en orden de
+    inserción y el registro se reemplaza por una copia (copy-on-write).
+    
+    Args:
+        reemplazos (Dict[int, Optional[Dict[str, Any]]]): ID -> proyecto
+            nuevo, o None para eliminarlo.
+    """
+    global _REGISTRO, _VERSION
+    
+    viejos = {id_proyecto: PROYECTOS[id_proyecto] for id_proyecto in reemplazos}
+    
+    # Índices ordenados: se incorporan las altas pendientes y se quitan las
+    # claves viejas (de a una si son pocas, o filtrando la lista una vez)
+    claves_viejas: Dict[str, set] = {criterio: set() for criterio in _ORDENES}
+    for viejo in viejos.values():
+        for criterio, clave in _claves_orden(viejo).items():
+            claves_viejas[criterio].add(clave)
+    for criterio, quitar in claves_viejas.items():
+        if not quitar:
+            continue
+        orden = _orden_actualizado(criterio)
+        if len(quitar) <= UMBRAL_REORDENAMIENTO:
+            for clave in quitar:
+                del orden[bisect_left(orden, clave)]
+        else:
+            orden[:] = [clave for clave in orden if clave not in quitar]
+    
+    movidos: Dict[str, set] = {campo: set() for campo in CAMPOS_INDEXADOS}
+    for id_proyecto, viejo in viejos.items():
+        nuevo = reemplazos[id_proyecto]
+        _acumular_totales(viejo, -1)
+        for campo in CAMPOS_INDEXADOS:
+            indice = INDICES_SECUNDARIOS[campo]
+            clave_vieja = _clave_indice(viejo, campo)
+            if nuevo is not None and _clave_indice(nuevo, campo) == clave_vieja:
+                # Mismo grupo: se reemplaza en su lugar y conserva el orden
+                indice[clave_vieja][id_proyecto] = nuevo
+                continue
+            grupo = indice[clave_vieja]
+            del grupo[id_proyecto]
+            if not grupo:
+                del indice[clave_vieja]
+            if nuevo is not None:
+                movidos[campo].add(_clave_indice(nuevo, campo))
+        
+        if _INDICE_TEXTO is not None and (
+                nuevo is None or any(viejo.get(campo) != nuevo.get(campo) for campo in ("nombre", "cliente"))):
+            _INDICE_TEXTO.quitar(viejo)
+            if nuevo is not None:
+                _INDICE_TEXTO.agregar(nuevo)
+        
+        if nuevo is None:
+            del PROYECTOS[id_proyecto]
+            continue
+        PROYECTOS[id_proyecto] = nuevo
+        for criterio, clave in _claves_orden(nuevo).items():
+            _ORDENES_PENDIENTES[criterio].append(clave)
+        _acumular_totales(nuevo)
+    
+    # PROYECTOS conserva el orden de inserción: el registro nuevo sale de él
+    _REGISTRO = list(PROYECTOS.values())
+    
+    for campo, claves in movidos.items():
+        if not claves:
+            continue
+        grupos: Dict[Any, Dict[int, Dict[str, Any]]] = {clave: {} for clave in claves}
+        for proyecto in _REGISTRO:
+            grupo = grupos.get(_clave_indice(proyecto, campo))
+            if grupo is not None:
+                grupo[proyecto["id"]] = proyecto
+        INDICES_SECUNDARIOS[campo].update(grupos)
+    
+    _VERSION += 1
+
+
+def _restaurar(registro: List[Dict[str, Any]]) -> None:
+    """
+    Vuelve el almacén en memoria al contenido de un registro anterior
+    (los proyectos viejos nunca se modifican, así que siguen intactos).
+    
+    Args:
+        registro (List[Dict[str, Any]]): Registro previo al lote.
+    """
+    _vaciar_almacen()
+    for proyecto in registro:
+        _indexar_proyecto(proyecto)
+        _acumular_totales(proyecto)
+
+
+def _confirmar_lote(reemplazos: Dict[int, Optional[Dict[str, Any]]],
+                    registro_diario: Optional[Tuple[str, Dict[str, Any]]] = None,
+                    recarga: bool = False) -> None:
+    """
+    Aplica un lote de reemplazos y bajas como una transacción: con SQLite,
+    en una transacción de la base; en memoria, aplicando el lote y anotándolo
+    en el diario, y si algo falla se restaura el registro anterior.
+    
+    Args:
+        reemplazos (Dict[int, Optional[Dict[str, Any]]]): ID -> proyecto
+            nuevo, o None para eliminarlo.
+        registro_diario (Optional[Tuple[str, Dict[str, Any]]]): Operación y
+            datos a anotar en el diario (None al reaplicar el diario).
+        recarga (bool): True para publicar un reemplazo completo (None) en
+            lugar de los pares (anterior, nuevo), como al archivar.
+    """
+    global _VERSION
+    
+    if not reemplazos:
+        return
+    
+    # Las versiones anteriores solo se buscan si alguien sigue los cambios
+    cambios = None
+    if _SUSCRIPTORES and not recarga:
+        cambios = [(anterior, reemplazos[anterior["id"]]) for anterior in _proyectos_existentes(reemplazos)]
+    
+    if _MOTOR is not None:
+        _MOTOR.aplicar_cambios(
+            [proyecto for proyecto in reemplazos.values() if proyecto is not None],
+            [id_proyecto for id_proyecto, proyecto in reemplazos.items() if proyecto is None]
+        )
+        _VERSION += 1
+    else:
+        registro_previo = _REGISTRO
+        try:
+            _aplicar_reemplazos(reemplazos)
+            if _DIARIO is not None and registro_diario is not None:
+                _DIARIO.registrar(*registro_diario)
+                _DIARIO.sincronizar()
+        except BaseException:
+            _restaurar(registro_previo)
+            contar("data_manager.lotes_revertidos")
+            raise
+    
+    if recarga:
+        _notificar(None)
+    elif cambios is not None:
+        _notificar(cambios)
+
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def actualizar_proyectos(cambios: Dict[str, Any], ids: Optional[Iterable[int]] = None,
+                         predicado: Optional[Callable[[Mapping], bool]] = None,
+                         **criterios: Any) -> List[int]:
+    """
+    Modifica en lote los proyectos seleccionados por IDs, por criterios de
+    consultar() y/o por un predicado. El lote se aplica completo o no se
+    aplica: ante un valor inválido o un ID inexistente no cambia nada.
+    Índices y totales se actualizan una vez por lote y el diario recibe un
+    único registro. Si no se indica fecha_actualizacion se usa la de hoy.
+    
+    Args:
+        cambios (Dict[str, Any]): Campo -> valor nuevo (ver CAMPOS_MODIFICABLES).
+        ids (Optional[Iterable[int]]): IDs a modificar.
+        predicado (Optional[Callable[[Mapping], bool]]): Condición adicional.
+        **criterios (Any): Criterios de consultar().
+        
+    Returns:
+        List[int]: IDs modificados.
+        
+    Raises:
+        ValueError: Si los cambios o la selección son inválidos.
+    """
+    cambios = _normalizar_cambios(cambios)
+    hoy = date.today().isoformat()
+    cambios.setdefault("fecha_actualizacion", hoy)
+    
+    seleccion = _seleccionar(ids, predicado, criterios)
+    reemplazos = {proyecto["id"]: _nueva_version(proyecto, cambios, hoy) for proyecto in seleccion}
+    _confirmar_lote(reemplazos, ("modificacion", {"ids": list(reemplazos), "cambios": cambios, "fecha": hoy}))
+    return list(reemplazos)
+
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def eliminar_proyectos(ids: Optional[Iterable[int]] = None,
+                       predicado: Optional[Callable[[Mapping], bool]] = None,
+                       **criterios: Any) -> List[int]:
+    """
+    Elimina en lote los proyectos seleccionados por IDs, por criterios de
+    consultar() y/o por un predicado, como una sola transacción.
+    
+    Args:
+        ids (Optional[Iterable[int]]): IDs a eliminar.
+        predicado (Optional[Callable[[Mapping], bool]]): Condición adicional.
+        **criterios (Any): Criterios de consultar().
         
     Returns:
-        Optional[Dict[str, Any]]: Diccionario del proyecto si existe, None si no existe.
+        List[int]: IDs eliminados.
+        
+    Raises:
+        ValueError: Si la selección es inválida o algún ID no existe.
     """
-    for proyecto in PROYECTOS:
-        if proyecto.get("id") == id_proyecto:
-            return proyecto
-    return None
+    reemplazos = {proyecto["id"]: None for proyecto in _seleccionar(ids, predicado, criterios)}
+    _confirmar_lote(reemplazos, ("baja", {"ids": list(reemplazos)}))
+    return list(reemplazos)
 
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def archivar_finalizados(dias: Optional[int] = None, hoy: Optional[str] = None) -> int:
+    """
+    Mueve al archivo comprimido los proyectos finalizados hace más de cierta
+    cantidad de días (según fecha_fin). Dejan los índices y la memoria, pero
+    siguen contando en los reportes y en filtrar_por_estado(). El lote se
+    escribe en el archivo antes de anotarse en el diario: si el proceso se
+    interrumpe entre ambos, la próxima escritura lo descarta. Todo ocurre
+    con el diario bloqueado en modo exclusivo y después de incorporar lo
+    que otros procesos anotaron (ver _incorporar_cambios_ajenos).
+    
+    Args:
+        dias (Optional[int]): Antigüedad mínima; por defecto la variable de
+            entorno GESTION_DIAS_ARCHIVO o DIAS_ARCHIVO.
+        hoy (Optional[str]): Fecha de referencia YYYY-MM-DD (por defecto, hoy).
+        
+    Returns:
+        int: Cantidad de proyectos archivados.
+        
+    Raises:
+        ValueError: Si los días son negativos, la fecha es inválida o el
+            almacén no admite archivo (motor SQLite o sin persistencia).
+    """
+    if _MOTOR is not None:
+        raise ValueError("El motor SQLite ya guarda los proyectos en disco; el archivo es solo para el motor en memoria")
+    if _DIARIO is None or _ARCHIVO is None:
+        raise ValueError("La persistencia no está inicializada")
+    if dias is None:
+        dias = int(os.environ.get(VARIABLE_DIAS_ARCHIVO, DIAS_ARCHIVO))
+    if dias < 0:
+        raise ValueError(f"Cantidad de días inválida: {dias}")
+    
+    referencia = date.fromisoformat(hoy) if hoy else date.today()
+    corte = (referencia - timedelta(days=dias)).isoformat()
+    
+    # Otros procesos (el servidor, otra ejecución de la CLI) pueden archivar
+    # sobre el mismo archivo: con el diario bloqueado se incorporan antes sus
+    # lotes, para que el lote nuevo se anexe después de sus bloques y no
+    # encima de ellos
+    with _DIARIO.exclusivo():
+        _incorporar_cambios_ajenos()
+        orden, inicio, fin = _tramo_fechas("fecha_fin", None, corte)
+        proyectos = [
+            PROYECTOS[id_proyecto] for _, id_proyecto in islice(orden, inicio, fin)
+            if PROYECTOS[id_proyecto]["estado"] == "Finalizado"
+        ]
+        if not proyectos:
+            return 0
+        
+        bloques, tamano = _ARCHIVO.escribir(proyectos)
+        ids = [proyecto["id"] for proyecto in proyectos]
+        _confirmar_lote(
+            {id_proyecto: None for id_proyecto in ids},
+            ("archivar", {"ids": ids, "bloques": bloques, "tamano": tamano}),
+            recarga=True
+        )
+        _ARCHIVO.incorporar(proyectos, bloques, tamano)
+    contar("data_manager.proyectos_archivados", len(proyectos))
+    return len(proyectos)
+
+
+def _reaplicar_diario(registros_diario: Iterable[Dict[str, Any]],
+                      agregar: Callable[[Iterator[Dict[str, Any]]], Any]) -> None:
+    """
+    Reaplica registros del diario en orden. Las altas consecutivas se
+    entregan juntas a agregar (las repetidas se ignoran por ID); las
+    modificaciones y bajas se aplican a los IDs que existan; los lotes
+    archivados salen del almacén en memoria y se suman al archivo.
+    
+    Args:
+        registros_diario (Iterable[Dict[str, Any]]): Registros leídos del diario.
+        agregar (Callable): Recibe un iterador de proyectos a dar de alta.
+    """
+    for operacion, registros in groupby(registros_diario, key=lambda registro: registro.get("op")):
+        if operacion == "alta":
+            agregar(persistencia.deserializar_proyecto(registro["proyecto"]) for registro in registros)
+            continue
+        for registro in registros:
+            with BLOQUEO.escritura():
+                proyectos = _proyectos_existentes(registro.get("ids", []))
+                if operacion == "modificacion":
+                    cambios = _normalizar_cambios(registro["cambios"])
+                    _confirmar_lote({
+                        proyecto["id"]: _nueva_version(proyecto, cambios, registro["fecha"])
+                        for proyecto in proyectos
+                    })
+                elif operacion == "baja":
+                    _confirmar_lote({proyecto["id"]: None for proyecto in proyectos})
+                elif operacion == "archivar" and _MOTOR is None:
+                    # Con SQLite los archivados se conservan en la base
+                    _confirmar_lote({proyecto["id"]: None for proyecto in proyectos}, recarga=True)
+                    # Un lote que ya cubre el resumen del archivo no se suma dos veces
+                    if _ARCHIVO is not None and registro["tamano"] > _ARCHIVO.tamano:
+                        _ARCHIVO.incorporar(proyectos, registro["bloques"], registro["tamano"])
+
+
+def _filtrar_por_indice(campo: str, valor: Any) -> VistaProyectos:
+    """
+    Obtiene los proyectos cuyo campo indexado coincide con el valor dado.
+    
+    Args:
+        campo (str): Campo indexado ("estado", "cliente" o "prioridad").
+        valor (Any): Clave a buscar en el índice.
+        
+    Returns:
+        VistaProyectos: Proyectos que coinciden, en orden de inserción.
+    """
+    if _MOTOR is not None:
+        return _MOTOR.consultar({campo: [valor]})
+    coincidencias = list(INDICES_SECUNDARIOS[campo].get(valor, {}).values())
+    return VistaProyectos(coincidencias, version=_VERSION)
+
+
+@medir()
+@BLOQUEO.lector
+def filtrar_por_estado(estado: str) -> Sequence:
+    """
+    Filtra los proyectos por estado usando el índice secundario. Si hay
+    proyectos archivados con ese estado, van a continuación de los activos
+    y se leen del archivo a medida que se recorren.
+    
+    Args:
+        estado (str): Estado a filtrar ("Pendiente", "En Progreso", "Finalizado").
+        
+    Returns:
+        Sequence: Proyectos que coinciden con el estado especificado
+        (VistaProyectos, o VistaConArchivados si incluye archivados).
+    """
+    activos = _filtrar_por_indice("estado", estado)
+    if _ARCHIVO is not None and _ARCHIVO.agregados["por_estado"].get(estado):
+        return VistaConArchivados(activos, _ARCHIVO)
+    return activos
+
+
+@medir()
+@BLOQUEO.lector
+def filtrar_por_cliente(cliente: str) -> VistaProyectos:
+    """
+    Filtra los proyectos por cliente usando el índice secundario.
+    
+    Args:
+        cliente (str): Nombre exacto del cliente.
+        
+    Returns:
+        VistaProyectos: Proyectos del cliente especificado.
+    """
+    return _filtrar_por_indice("cliente", cliente)
+
+
+@medir()
+@BLOQUEO.lector
+def filtrar_por_prioridad(nivel: int) -> VistaProyectos:
+    """
+    Filtra los proyectos por nivel de prioridad usando el índice secundario.
+    
+    Args:
+        nivel (int): Nivel de prioridad (1=Alta, 2=Media, 3=Baja).
+        
+    Returns:
+        VistaProyectos: Proyectos con el nivel de prioridad indicado.
+    """
+    return _filtrar_por_indice("prioridad", nivel)
+
+
+@medir()
+@BLOQUEO.lector
+def obtener_proyecto_por_id(id_proyecto: int) -> Optional[Mapping]:
+    """
+    Obtiene un proyecto específico por su ID en tiempo constante. Si el ID
+    está archivado, el proyecto se lee del archivo (ver
+    ArchivoProyectos.buscar).
+    
+    Args:
+        id_proyecto (int): ID del proyecto a buscar.
+        
+    Returns:
+        Optional[Mapping]: Proyecto de solo lectura si existe, None si no existe.
+    """
+    if _MOTOR is not None:
+        proyecto = _MOTOR.obtener(id_proyecto)
+    else:
+        proyecto = PROYECTOS.get(id_proyecto)
+        if proyecto is None and _ARCHIVO is not None:
+            proyecto = _ARCHIVO.buscar(id_proyecto)
+    if proyecto is None:
+        return None
+    return MappingProxyType(proyecto)
+
+
+@medir()
+def buscar_proyectos(texto: str, limite: int = RESULTADOS_POR_DEFECTO, prefijo: bool = True,
+                     incluir_archivados: bool = False) -> Sequence:
+    """
+    Busca proyectos por términos de su nombre o cliente, sin distinguir
+    mayúsculas ni acentos. Deben aparecer todos los términos; el último se
+    completa como prefijo para autocompletar mientras se escribe. Los
+    resultados se ordenan por relevancia (ver busqueda.IndiceTexto.buscar;
+    con SQLite, por bm25 sobre el índice FTS5).
+    
+    El índice de texto en memoria se construye en la primera búsqueda, para
+    que la carga no pague su costo si nadie busca, y desde entonces se
+    mantiene con cada alta, modificación y baja.
+    
+    Los proyectos archivados no están en el índice: con incluir_archivados
+    se recorre el archivo completo, bloque por bloque, y se puntúan con los
+    mismos pesos (ver busqueda.puntaje), así que esa búsqueda cuesta lo que
+    leer el archivo.
+    
+    Args:
+        texto (str): Texto buscado (por ejemplo "landing per").
+        limite (int): Cantidad máxima de resultados.
+        prefijo (bool): False para exigir términos completos.
+        incluir_archivados (bool): True para buscar también entre los archivados.
+        
+    Returns:
+        Sequence: Proyectos de solo lectura, del más relevante al menos.
+    """
+    global _INDICE_TEXTO
+    
+    if _MOTOR is not None:
+        with BLOQUEO.lectura():
+            return _MOTOR.buscar(list(tokenizar(texto)), limite, prefijo)
+    
+    while True:
+        with BLOQUEO.lectura():
+            indice = _INDICE_TEXTO
+            if indice is not None:
+                activos = indice.buscar(texto, limite, prefijo)
+                version = _VERSION
+                archivo = _ARCHIVO if incluir_archivados else None
+                cantidad = len(archivo) if archivo is not None else 0
+                if not cantidad:
+                    return VistaProyectos(activos, version=version)
+                break
+        with BLOQUEO.escritura():
+            if _INDICE_TEXTO is None:
+                indice = IndiceTexto(PROYECTOS, INDICES_SECUNDARIOS["cliente"])
+                for proyecto in _REGISTRO:
+                    indice.agregar(proyecto)
+                _INDICE_TEXTO = indice
+    
+    # El archivo se lee fuera del bloqueo: solo crece, y lo archivado
+    # después de la búsqueda en el índice queda más allá de cantidad
+    terminos = tokenizar(texto)
+    puntuados = (
+        (puntaje(terminos, proyecto, prefijo), proyecto) for proyecto in chain(activos, archivo.proyectos(cantidad))
+    )
+    mejores = heapq.nsmallest(
+        limite, ((-valor, proyecto["id"], proyecto) for valor, proyecto in puntuados if valor)
+    )
+    return VistaProyectos([proyecto for _, _, proyecto in mejores], version=version)
+
+
+# Criterios aceptados por consultar() y explicar_consulta()
+CRITERIOS_CONSULTA = (
+    "estado",
+    "cliente",
+    "prioridad",
+    "horas_min",
+    "horas_max",
+    "progreso_min",
+    "progreso_max",
+    "fecha_desde",
+    "fecha_hasta"
+)
+
+
+def _como_lista(valor: Any) -> List[Any]:
+    """
+    Normaliza un criterio de igualdad a una lista de valores aceptados.
+    
+    Args:
+        valor (Any): Valor único o colección de valores.
+        
+    Returns:
+        List[Any]: Valores aceptados.
+    """
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return list(valor)
+    return [valor]
+
+
+def _nivel_prioridad(valor: Any) -> Any:
+    """
+    Convierte una prioridad expresada por nombre ("Alta") a su nivel numérico.
+    
+    Args:
+        valor (Any): Nivel (int) o nombre de la prioridad.
+        
+    Returns:
+        Any: Nivel numérico, o el valor original si no se reconoce.
+    """
+    if isinstance(valor, str):
+        return PRIORIDADES_VALIDAS.get(valor.strip().capitalize(), valor)
+    return valor
+
+
+def _predicados_residuales(criterios: Dict[str, Any]) -> List[Tuple[str, Callable[[Dict[str, Any]], bool]]]:
+    """
+    Construye los predicados de rango que no tienen índice y se evalúan
+    sobre cada candidato.
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios de la consulta.
+        
+    Returns:
+        List[Tuple[str, Callable]]: Pares (descripción, predicado).
+    """
+    residuales = []
+    rangos = (
+        ("horas_min", "horas_estimadas >= {}", lambda p, v: p.get("horas_estimadas", 0) >= v),
+        ("horas_max", "horas_estimadas <= {}", lambda p, v: p.get("horas_estimadas", 0) <= v),
+        ("progreso_min", "progreso >= {}%", lambda p, v: avance(p) >= v),
+        ("progreso_max", "progreso <= {}%", lambda p, v: avance(p) <= v),
+        ("fecha_desde", "fecha_inicio >= {}", lambda p, v: (p.get("fecha_inicio") or "") >= v),
+        ("fecha_hasta", "fecha_inicio <= {}", lambda p, v: "" < (p.get("fecha_inicio") or "") <= v)
+    )
+    for criterio, descripcion, comparar in rangos:
+        valor = criterios.get(criterio)
+        if valor is not None:
+            residuales.append(
+                (descripcion.format(valor), lambda p, v=valor, c=comparar: c(p, v))
+            )
+    return residuales
+
+
+def _normalizar_criterios(criterios: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Valida los criterios de una consulta y lleva los de igualdad a listas
+    (la prioridad, a niveles numéricos).
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios recibidos.
+        
+    Returns:
+        Dict[str, Any]: Criterios normalizados, sin los que valen None.
+        
+    Raises:
+        ValueError: Si se recibe un criterio desconocido.
+    """
+    desconocidos = set(criterios) - set(CRITERIOS_CONSULTA)
+    if desconocidos:
+        raise ValueError(f"Criterios desconocidos: {', '.join(sorted(desconocidos))}")
+    
+    normalizados = {}
+    for criterio, valor in criterios.items():
+        if valor is None:
+            continue
+        if criterio in CAMPOS_INDEXADOS:
+            valor = _como_lista(valor)
+            if criterio == "prioridad":
+                valor = [_nivel_prioridad(nivel) for nivel in valor]
+        normalizados[criterio] = valor
+    return normalizados
+
+
+def _planificar_consulta(criterios: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Arma el plan de una consulta: qué índices aplican, cuántos candidatos
+    aporta cada uno y qué predicados quedan para evaluar fila a fila.
+    El índice más selectivo (menos candidatos) conduce la consulta y el
+    resto se intersecta por pertenencia en O(1).
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios normalizados de la consulta.
+        
+    Returns:
+        Dict[str, Any]: Plan con las claves "fuentes" (ordenadas por
+        selectividad) y "residuales".
+    """
+    fuentes = []
+    for campo in CAMPOS_INDEXADOS:
+        if campo not in criterios:
+            continue
+        valores = criterios[campo]
+        indice = INDICES_SECUNDARIOS[campo]
+        grupos = [indice.get(valor, {}) for valor in valores]
+        fuentes.append({
+            "campo": campo,
+            "valores": valores,
+            "grupos": grupos,
+            "candidatos": sum(len(grupo) for grupo in grupos)
+        })
+    
+    # El rango de fecha_inicio solo se usa para conducir la consulta: si
+    # otro índice es más selectivo se descarta y el rango se comprueba
+    # como predicado residual (que siempre se evalúa)
+    desde, hasta = criterios.get("fecha_desde"), criterios.get("fecha_hasta")
+    if desde is not None or hasta is not None:
+        orden, inicio, fin = _tramo_fechas("fecha_inicio", desde, hasta)
+        fuentes.append({
+            "campo": "fecha_inicio",
+            "valores": [desde, hasta],
+            "grupos": [],
+            "tramo": (orden, inicio, fin),
+            "candidatos": fin - inicio
+        })
+    
+    fuentes.sort(key=lambda fuente: fuente["candidatos"])
+    fuentes = fuentes[:1] + [fuente for fuente in fuentes[1:] if "tramo" not in fuente]
+    return {"fuentes": fuentes, "residuales": _predicados_residuales(criterios)}
+
+
+def _consultar_activos(criterios: Dict[str, Any]) -> Sequence:
+    """
+    Resuelve una consulta sobre los proyectos activos (ver consultar). Las
+    operaciones en lote y top_proyectos la usan directamente porque solo
+    alcanzan a los activos.
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios normalizados de la consulta.
+        
+    Returns:
+        Sequence: Proyectos activos que cumplen todos los criterios.
+    """
+    if _MOTOR is not None:
+        return _MOTOR.consultar(criterios)
+    
+    plan = _planificar_consulta(criterios)
+    fuentes = plan["fuentes"]
+    residuales = [predicado for _, predicado in plan["residuales"]]
+    
+    if fuentes:
+        conductor, sondeos = fuentes[0], fuentes[1:]
+        if "tramo" in conductor:
+            orden, inicio, fin = conductor["tramo"]
+            candidatos = (PROYECTOS[clave[-1]] for clave in islice(orden, inicio, fin))
+        else:
+            candidatos = chain.from_iterable(grupo.values() for grupo in conductor["grupos"])
+    else:
+        sondeos = []
+        candidatos = PROYECTOS.values()
+    
+    resultado = []
+    for proyecto in candidatos:
+        id_proyecto = proyecto["id"]
+        if not all(any(id_proyecto in grupo for grupo in fuente["grupos"]) for fuente in sondeos):
+            continue
+        if all(predicado(proyecto) for predicado in residuales):
+            resultado.append(proyecto)
+    
+    return VistaProyectos(resultado, version=_VERSION)
+
+
+def _filtro_archivados(criterios: Dict[str, Any]) -> Optional[Callable[[Mapping], bool]]:
+    """
+    Arma la condición que deben cumplir los proyectos archivados para
+    sumarse a una consulta. Los totales del archivo (por estado, por
+    cliente y por fecha de inicio) descartan sin leerlo las consultas que
+    ningún archivado puede cumplir, como las de proyectos no finalizados.
+    
+    Args:
+        criterios (Dict[str, Any]): Criterios normalizados de la consulta.
+        
+    Returns:
+        Optional[Callable[[Mapping], bool]]: Condición sobre cada
+        archivado, o None si no hay archivados que puedan cumplirla.
+    """
+    if _ARCHIVO is None or not len(_ARCHIVO):
+        return None
+    for campo, totales in (("estado", _ARCHIVO.agregados["por_estado"]), ("cliente", _ARCHIVO.por_cliente)):
+        if campo in criterios and not any(totales.get(valor) for valor in criterios[campo]):
+            return None
+    desde, hasta = criterios.get("fecha_desde"), criterios.get("fecha_hasta")
+    if (desde is not None or hasta is not None) and not any(_ARCHIVO.conteos_por_fecha("fecha_inicio", desde, hasta)):
+        return None
+    
+    iguales = [(campo, criterios[campo]) for campo in CAMPOS_INDEXADOS if campo in criterios]
+    residuales = [predicado for _, predicado in _predicados_residuales(criterios)]
+    
+    def filtro(proyecto: Mapping) -> bool:
+        return (all(_clave_indice(proyecto, campo) in valores for campo, valores in iguales)
+                and all(predicado(proyecto) for predicado in residuales))
+    return filtro
+
+
+@medir()
+@BLOQUEO.lector
+def consultar(**criterios: Any) -> Sequence:
+    """
+    Consulta proyectos combinando varios criterios (todos deben cumplirse).
+    
+    Criterios de igualdad, resueltos con índices (aceptan un valor o una lista):
+        estado, cliente, prioridad (nivel 1-3 o nombre "Alta"/"Media"/"Baja").
+    Criterios de rango, evaluados sobre los candidatos:
+        horas_min, horas_max, progreso_min, progreso_max (porcentaje),
+        fecha_desde, fecha_hasta (fecha_inicio en formato YYYY-MM-DD; si es
+        el criterio más selectivo, el índice de fechas conduce la consulta).
+    
+    Si los criterios admiten proyectos archivados (ver _filtro_archivados),
+    los que los cumplen siguen a los activos, leídos del archivo recién
+    cuando se recorre el resultado (ver archivo.VistaConArchivados).
+    
+    Args:
+        **criterios (Any): Criterios de la consulta.
+        
+    Returns:
+        Sequence: Proyectos de solo lectura que cumplen todos los criterios.
+        
+    Raises:
+        ValueError: Si se recibe un criterio desconocido.
+    """
+    criterios = _normalizar_criterios(criterios)
+    activos = _consultar_activos(criterios)
+    filtro = _filtro_archivados(criterios)
+    if filtro is None:
+        return activos
+    return VistaConArchivados(activos, _ARCHIVO, filtro)
+
+
+@BLOQUEO.lector
+def explicar_consulta(**criterios: Any) -> Dict[str, Any]:
+    """
+    Describe el plan que usaría consultar() con los mismos criterios, sin ejecutarlo.
+    
+    Args:
+        **criterios (Any): Criterios de la consulta (ver consultar).
+        
+    Returns:
+        Dict[str, Any]: Estrategia ("indice" o "recorrido_completo"), índice
+        conductor, índices intersectados, predicados residuales, cantidad
+        de candidatos que se evaluarán y archivados que se revisarán. Con
+        el motor SQLite, la consulta SQL y el plan de EXPLAIN QUERY PLAN.
+        
+    Raises:
+        ValueError: Si se recibe un criterio desconocido.
+    """
+    criterios = _normalizar_criterios(criterios)
+    if _MOTOR is not None:
+        return _MOTOR.explicar(criterios)
+    
+    plan = _planificar_consulta(criterios)
+    fuentes = [
+        {"campo": fuente["campo"], "valores": fuente["valores"], "candidatos": fuente["candidatos"]}
+        for fuente in plan["fuentes"]
+    ]
+    
+    return {
+        "estrategia": "indice" if fuentes else "recorrido_completo",
+        "conductor": fuentes[0] if fuentes else None,
+        "intersecciones": fuentes[1:],
+        "residuales": [descripcion for descripcion, _ in plan["residuales"]],
+        "candidatos": fuentes[0]["candidatos"] if fuentes else len(PROYECTOS),
+        "archivados": len(_ARCHIVO) if _filtro_archivados(criterios) is not None else 0,
+        "total_proyectos": len(PROYECTOS)
+    }
+
+
+def _validar_criterio_orden(criterio: str) -> None:
+    """
+    Verifica que el criterio de orden exista.
+    
+    Args:
+        criterio (str): Criterio a validar.
+        
+    Raises:
+        ValueError: Si el criterio no está en CRITERIOS_ORDEN.
+    """
+    if criterio not in CRITERIOS_ORDEN:
+        raise ValueError(f"Criterio de orden inválido: {criterio!r}")
+
+
+@medir()
+@BLOQUEO.lector
+def proyectos_ordenados(criterio: str = "prioridad", descendente: bool = False,
+                        limite: Optional[int] = None) -> VistaProyectos:
+    """
+    Retorna los proyectos ordenados leyendo el índice ordenado, sin ordenar
+    la colección en cada llamada.
+    
+    Args:
+        criterio (str): "prioridad" (nivel y luego menor avance) o "progreso".
+        descendente (bool): True para invertir el orden.
+        limite (Optional[int]): Cantidad máxima de proyectos a retornar.
+        
+    Returns:
+        VistaProyectos: Proyectos en el orden pedido.
+        
+    Raises:
+        ValueError: Si el criterio no existe.
+    """
+    _validar_criterio_orden(criterio)
+    if _MOTOR is not None:
+        return _MOTOR.consultar({}, criterio, descendente, limite)
+    
+    orden = _orden_actualizado(criterio)
+    claves = reversed(orden) if descendente else iter(orden)
+    if limite is not None:
+        claves = islice(claves, limite)
+    return VistaProyectos([PROYECTOS[clave[-1]] for clave in claves], version=_VERSION)
+
+
+@medir()
+@BLOQUEO.lector
+def top_proyectos(k: int = 20, criterio: str = "prioridad", **criterios: Any) -> VistaProyectos:
+    """
+    Retorna los k primeros proyectos según el criterio de orden: por defecto
+    los de mayor prioridad y menor avance. Sin filtros se leen los primeros
+    k elementos del índice ordenado; con filtros (los mismos de consultar)
+    se seleccionan con un heap de tamaño k sobre los candidatos, en O(m log k).
+    
+    Args:
+        k (int): Cantidad de proyectos.
+        criterio (str): "prioridad" o "progreso".
+        **criterios (Any): Filtros opcionales, como en consultar().
+        
+    Returns:
+        VistaProyectos: Hasta k proyectos en orden.
+        
+    Raises:
+        ValueError: Si el criterio de orden o algún filtro no existe.
+    """
+    _validar_criterio_orden(criterio)
+    if _MOTOR is not None:
+        return _MOTOR.consultar(_normalizar_criterios(criterios), criterio, limite=k)
+    if not criterios:
+        return proyectos_ordenados(criterio, limite=k)
+    
+    candidatos = _consultar_activos(_normalizar_criterios(criterios))
+    mejores = heapq.nsmallest(k, candidatos, key=lambda proyecto: _claves_orden(proyecto)[criterio])
+    return VistaProyectos([PROYECTOS[proyecto["id"]] for proyecto in mejores], version=_VERSION)
+
+
+@medir()
+@BLOQUEO.lector
+def proyectos_por_fecha(campo: str = "fecha_inicio", desde: Optional[str] = None,
+                        hasta: Optional[str] = None) -> VistaProyectos:
+    """
+    Retorna los proyectos cuya fecha cae dentro del rango, en orden cronológico.
+    
+    Args:
+        campo (str): "fecha_inicio", "fecha_fin" o "fecha_actualizacion".
+        desde (Optional[str]): Fecha mínima YYYY-MM-DD, inclusive.
+        hasta (Optional[str]): Fecha máxima YYYY-MM-DD, inclusive.
+        
+    Returns:
+        VistaProyectos: Proyectos del rango.
+        
+    Raises:
+        ValueError: Si el campo no es una fecha indexada.
+    """
+    if campo not in CAMPOS_FECHA:
+        raise ValueError(f"Campo de fecha inválido: {campo!r}")
+    if _MOTOR is not None:
+        return _MOTOR.por_fecha(campo, desde, hasta)
+    
+    orden, inicio, fin = _tramo_fechas(campo, desde, hasta)
+    return VistaProyectos([PROYECTOS[clave[-1]] for clave in islice(orden, inicio, fin)], version=_VERSION)
+
+
+def _conteos_por_fecha(campo: str, desde: Optional[str],
+                       hasta: Optional[str]) -> Iterator[Tuple[str, int, int]]:
+    """
+    Agrupa el tramo del índice de fechas por fecha distinta. Como el índice
+    está ordenado, las claves con la misma fecha son consecutivas.
+    
+    Args:
+        campo (str): Campo de CAMPOS_FECHA.
+        desde (Optional[str]): Fecha mínima, inclusive.
+        hasta (Optional[str]): Fecha máxima, inclusive.
+        
+    Yields:
+        Tuple[str, int, int]: Fecha, cantidad de proyectos y tareas completadas.
+    """
+    if _MOTOR is not None:
+        yield from _MOTOR.conteos_por_fecha(campo, desde, hasta)
+        return
+    
+    orden, inicio, fin = _tramo_fechas(campo, desde, hasta)
+    for fecha, claves in groupby(islice(orden, inicio, fin), key=lambda clave: clave[0]):
+        cantidad = tareas = 0
+        for _, id_proyecto in claves:
+            cantidad += 1
+            tareas += PROYECTOS[id_proyecto].get("tareas_completadas", 0)
+        yield fecha, cantidad, tareas
+
+
+@medir()
+@BLOQUEO.lector
+def reporte_por_periodo(periodo: str = "mes", desde: Optional[str] = None,
+                        hasta: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Calcula el rendimiento por semana o mes a partir de los índices de fechas:
+    proyectos iniciados (por fecha_inicio), proyectos finalizados (por
+    fecha_fin) y tareas completadas de los proyectos finalizados en cada
+    período. Solo se recorre el tramo del rango pedido, no toda la colección;
+    con el motor SQLite el agrupamiento por fecha se hace con un GROUP BY.
+    Los proyectos archivados aportan sus conteos diarios sin leer el archivo.
+    
+    Args:
+        periodo (str): "semana" (ISO, AAAA-Www) o "mes" (AAAA-MM).
+        desde (Optional[str]): Fecha mínima YYYY-MM-DD, inclusive.
+        hasta (Optional[str]): Fecha máxima YYYY-MM-DD, inclusive.
+        
+    Returns:
+        List[Dict[str, Any]]: Una fila por período con datos, en orden
+        cronológico, con las claves "periodo", "iniciados", "finalizados"
+        y "tareas_completadas".
+        
+    Raises:
+        ValueError: Si el período no es "semana" ni "mes".
+    """
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido: {periodo!r}")
+    
+    filas: Dict[str, Dict[str, Any]] = {}
+    
+    def fila(clave):
+        if clave not in filas:
+            filas[clave] = {"periodo": clave, "iniciados": 0, "finalizados": 0, "tareas_completadas": 0}
+        return filas[clave]
+    
+    def periodos(campo):
+        conteos = _conteos_por_fecha(campo, desde, hasta)
+        if _ARCHIVO is not None:
+            conteos = chain(conteos, _ARCHIVO.conteos_por_fecha(campo, desde, hasta))
+        for fecha, cantidad, tareas in conteos:
+            try:
+                yield clave_periodo(fecha, periodo), cantidad, tareas
+            except ValueError:
+                contar("data_manager.fechas_invalidas")
+    
+    for clave, cantidad, _ in periodos("fecha_inicio"):
+        fila(clave)["iniciados"] += cantidad
+    for clave, cantidad, tareas in periodos("fecha_fin"):
+        actual = fila(clave)
+        actual["finalizados"] += cantidad
+        actual["tareas_completadas"] += tareas
+    
+    return [filas[clave] for clave in sorted(filas)]
+
+
+@medir()
+@BLOQUEO.lector
+def obtener_agregados() -> Dict[str, Any]:
+    """
+    Retorna una copia de los totales acumulados sin recorrer los proyectos,
+    incluidos los archivados.
+    
+    Returns:
+        Dict[str, Any]: Total de proyectos, tareas completadas, horas estimadas
+        y cantidad de proyectos por estado.
+    """
+    if _MOTOR is not None:
+        return _MOTOR.agregados()
+    
+    copia = dict(AGREGADOS)
+    copia["por_estado"] = dict(AGREGADOS["por_estado"])
+    if _ARCHIVO is not None:
+        _ARCHIVO.sumar_agregados(copia)
+    return copia
+
+
+@BLOQUEO.lector
+def obtener_agregados_por_cliente() -> List[Dict[str, Any]]:
+    """
+    Retorna el reporte por cliente a partir de los totales incrementales,
+    sin recorrer los proyectos e incluyendo los archivados.
+    
+    Returns:
+        List[Dict[str, Any]]: Una fila por cliente, ordenadas por nombre, con
+        "cliente", "proyectos", "horas_estimadas", "tareas_completadas",
+        "avance_promedio" y "por_estado".
+    """
+    por_cliente = _MOTOR.agregados_por_cliente() if _MOTOR is not None else AGREGADOS_POR_CLIENTE
+    if _ARCHIVO is not None and _ARCHIVO.por_cliente:
+        por_cliente = _ARCHIVO.sumar_por_cliente(por_cliente)
+    return [
+        {
+            "cliente": cliente,
+            "proyectos": totales["proyectos"],
+            "horas_estimadas": totales["horas_estimadas"],
+            "tareas_completadas": totales["tareas_completadas"],
+            "avance_promedio": round(totales["suma_avance"] / totales["proyectos"], 2),
+            "por_estado": dict(totales["por_estado"])
+        }
+        for cliente, totales in sorted(por_cliente.items(), key=lambda item: str(item[0]))
+    ]
+
+
+def _totales_cliente_coinciden(calculados: Dict[str, Dict[str, Any]],
+                               acumulados: Dict[str, Dict[str, Any]]) -> bool:
+    """
+    Compara dos conjuntos de totales por cliente. La suma de avances es de
+    punto flotante y se compara con tolerancia, porque sumar y restar en
+    otro orden puede diferir en los últimos decimales.
+    
+    Args:
+        calculados (Dict[str, Dict[str, Any]]): Totales recalculados.
+        acumulados (Dict[str, Dict[str, Any]]): Totales incrementales.
+        
+    Returns:
+        bool: True si coinciden.
+    """
+    if calculados.keys() != acumulados.keys():
+        return False
+    for cliente, totales in calculados.items():
+        otros = acumulados[cliente]
+        if not math.isclose(totales["suma_avance"], otros["suma_avance"], rel_tol=1e-9, abs_tol=1e-6):
+            return False
+        if any(totales[clave] != otros[clave] for clave in totales if clave != "suma_avance"):
+            return False
+    return True
+
+
+@BLOQUEO.lector
+def verificar_agregados() -> bool:
+    """
+    Recalcula los totales (globales y por cliente) recorriendo todos los
+    proyectos y los compara con los totales incrementales.
+    
+    Returns:
+        bool: True si ambos cálculos coinciden.
+    """
+    if _MOTOR is not None:
+        proyectos = _MOTOR.consultar({})
+        return (
+            calcular_agregados(proyectos) == _MOTOR.agregados()
+            and _totales_cliente_coinciden(calcular_agregados_por_cliente(proyectos),
+                                           _MOTOR.agregados_por_cliente())
+        )
+    return (
+        calcular_agregados(PROYECTOS.values()) == AGREGADOS
+        and _totales_cliente_coinciden(calcular_agregados_por_cliente(PROYECTOS.values()),
+                                       AGREGADOS_POR_CLIENTE)
+    )
+
+
+@_tras_la_carga
+@BLOQUEO.escritor
+def usar_almacen_compacto(activar: bool = True) -> None:
+    """
+    Activa o desactiva el almacenamiento compacto de proyectos y convierte
+    los proyectos ya cargados al formato elegido. La API sigue retornando
+    objetos que se leen como diccionarios (get, [], keys, items).
+    
+    Args:
+        activar (bool): True para usar ProyectoCompacto, False para diccionarios.
+    """
+    global _ALMACEN_COMPACTO
+    
+    _ALMACEN_COMPACTO = activar
+    convertir = ProyectoCompacto if activar else dict
+    proyectos = [convertir(proyecto) for proyecto in PROYECTOS.values()]
+    
+    _vaciar_almacen()
+    for proyecto in proyectos:
+        _indexar_proyecto(proyecto)
+        _acumular_totales(proyecto)
+
+
+def _vaciar_almacen() -> None:
+    """
+    Elimina todos los proyectos de los índices y reinicia los totales.
+    Los objetos se vacían en el lugar para que IDS_EXISTENTES siga siendo válido,
+    salvo la lista de registro, que se reemplaza para no vaciar las vistas entregadas.
+    """
+    global _REGISTRO, _VERSION, _INDICE_TEXTO
+    
+    _REGISTRO = []
+    _VERSION += 1
+    _INDICE_TEXTO = None
+    PROYECTOS.clear()
+    for indice in INDICES_SECUNDARIOS.values():
+        indice.clear()
+    for criterio in _ORDENES:
+        _ORDENES[criterio].clear()
+        _ORDENES_PENDIENTES[criterio].clear()
+    AGREGADOS.clear()
+    AGREGADOS.update(crear_agregados_vacios())
+    AGREGADOS_POR_CLIENTE.clear()
+    _notificar(None)
+
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def inicializar_persistencia(ruta_base: Path = persistencia.RUTA_BASE_DATOS,
+                             ruta_diario: Path = persistencia.RUTA_DIARIO,
+                             motor: Optional[str] = None,
+                             ruta_sqlite: Path = RUTA_SQLITE,
+                             en_segundo_plano: bool = False) -> int:
+    """
+    Carga la instantánea database.json, reaplica el diario encima y deja el
+    diario abierto para anexar los cambios siguientes.
+    Si la instantánea no existe se conservan los proyectos pre-cargados.
+    La instantánea se lee en streaming y cada proyecto se indexa al llegar.
+    
+    Con el motor "sqlite" los proyectos quedan en la base SQLite y no en
+    memoria; la primera vez la base se llena con la instantánea y el diario
+    (o con los proyectos pre-cargados si no hay instantánea).
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        ruta_diario (Path): Ruta del diario de cambios.
+        motor (Optional[str]): "memoria" o "sqlite"; por defecto se toma de
+            la variable de entorno GESTION_MOTOR ("memoria" si no está).
+        ruta_sqlite (Path): Ruta de la base SQLite.
+        en_segundo_plano (bool): Con el motor en memoria, carga en un hilo
+            aparte y retorna enseguida; el avance se consulta con
+            estado_carga() y esperar_carga().
+            
+    Returns:
+        int: Cantidad de proyectos cargados (hasta el momento, si la carga
+        sigue en segundo plano).
+        
+    Raises:
+        ValueError: Si el motor no existe.
+    """
+    global _RUTA_BASE_DATOS, _MOTOR, _HILO_CARGA, _SECUENCIA, _ARCHIVO
+    
+    motor = motor or os.environ.get(VARIABLE_MOTOR) or "memoria"
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor!r} (válidos: {', '.join(MOTORES)})")
+    
+    cerrar_persistencia(compactar=False)
+    _RUTA_BASE_DATOS = Path(ruta_base)
+    
+    if motor == "sqlite":
+        proyectos_iniciales = [dict(proyecto) for proyecto in PROYECTOS.values()]
+        _vaciar_almacen()
+        _ARCHIVO = None
+        _MOTOR = AlmacenSQLite(ruta_sqlite)
+        if not _MOTOR.cantidad():
+            if Path(ruta_base).exists():
+                with persistencia.LectorInstantanea(ruta_base) as lector:
+                    _MOTOR.importar(lector)
+                    resumen_archivo = lector.metadata.get("archivo")
+                # Los archivados vuelven a la base, que ya guarda todo en disco
+                if resumen_archivo:
+                    archivo = ArchivoProyectos(persistencia.ruta_archivo(ruta_base), resumen_archivo)
+                    _MOTOR.agregar_lote(list(archivo.proyectos()))
+            else:
+                _MOTOR.agregar_lote(proyectos_iniciales)
+            _reaplicar_diario(persistencia.leer_diario(ruta_diario), lambda proyectos: _MOTOR.agregar_lote(list(proyectos)))
+        _SECUENCIA = persistencia.SecuenciaIds(persistencia.ruta_secuencia(ruta_base), _MOTOR.siguiente_id())
+        _notificar(None)
+        return _MOTOR.cantidad()
+    
+    _actualizar_carga(en_curso=True, cargados=0, total=None, error=None)
+    if not en_segundo_plano:
+        try:
+            _cargar_base(ruta_base, ruta_diario)
+        finally:
+            _actualizar_carga(en_curso=False)
+        return len(PROYECTOS)
+    
+    # Mientras el hilo carga, el menú consulta en paralelo: el bloqueo se
+    # activa durante la carga y vuelve a su estado anterior al terminar
+    bloqueo_previo = BLOQUEO.activo
+    BLOQUEO.activar()
+    _HILO_CARGA = threading.Thread(
+        target=_cargar_en_segundo_plano, args=(ruta_base, ruta_diario, bloqueo_previo),
+        name="carga-proyectos", daemon=True
+    )
+    _HILO_CARGA.start()
+    return len(PROYECTOS)
+
+
+def _cargar_base(ruta_base: Path, ruta_diario: Path) -> None:
+    """
+    Carga la instantánea y el diario (ver _leer_base) y deja el diario
+    abierto.
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        ruta_diario (Path): Ruta del diario de cambios.
+    """
+    global _DIARIO, _SECUENCIA
+    
+    _leer_base(ruta_base, ruta_diario)
+    
+    with BLOQUEO.escritura():
+        _DIARIO = persistencia.Diario(ruta_diario)
+        _SECUENCIA = persistencia.SecuenciaIds(persistencia.ruta_secuencia(ruta_base), siguiente_id())
+
+
+def _leer_base(ruta_base: Path, ruta_diario: Path) -> None:
+    """
+    Lee la instantánea en streaming y agrega los proyectos en tandas, con el
+    bloqueo de escritura tomado una vez por tanda; luego reaplica el diario.
+    Anota en _CARGADO qué versión de la base quedó en memoria.
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        ruta_diario (Path): Ruta del diario de cambios.
+    """
+    global _USUARIOS_BASE, _METADATA_BASE, _ARCHIVO
+    
+    def agregar_en_tandas(proyectos: Iterator[Dict[str, Any]]) -> None:
+        while True:
+            tanda = list(islice(proyectos, PROYECTOS_POR_TANDA))
+            if not tanda:
+                return
+            agregar_proyectos(tanda)
+            _actualizar_carga(cargados=_CARGA["cargados"] + len(tanda))
+    
+    # La firma se toma antes de abrir: si la instantánea cambia durante la
+    # lectura, la compactación lo notará y volverá a leerla
+    _CARGADO["firma"] = _firma_archivo(ruta_base)
+    if Path(ruta_base).exists():
+        with persistencia.LectorInstantanea(ruta_base) as lector:
+            # metadata.total_proyectos permite mostrar el avance de la carga
+            _actualizar_carga(total=lector.total)
+            with BLOQUEO.escritura():
+                _vaciar_almacen()
+                # De los archivados solo se carga el resumen que guardan los metadatos
+                _ARCHIVO = ArchivoProyectos(persistencia.ruta_archivo(ruta_base), lector.metadata.get("archivo"))
+            agregar_en_tandas(lector.proyectos())
+            _USUARIOS_BASE = lector.usuarios
+            _METADATA_BASE = lector.metadata
+    else:
+        with BLOQUEO.escritura():
+            _ARCHIVO = ArchivoProyectos(persistencia.ruta_archivo(ruta_base))
+    
+    # Reaplicar el diario (altas, modificaciones y bajas, en orden). Lo que
+    # se anexe mientras tanto puede leerse dos veces: reaplicarlo no cambia nada
+    _CARGADO["posicion"] = Path(ruta_diario).stat().st_size if Path(ruta_diario).exists() else 0
+    _reaplicar_diario(persistencia.leer_diario(ruta_diario), agregar_en_tandas)
+
+
+def _cargar_en_segundo_plano(ruta_base: Path, ruta_diario: Path, bloqueo_previo: bool) -> None:
+    """
+    Cuerpo del hilo de carga. Si la carga falla, el error queda en
+    estado_carga() y el diario no se abre: así, al salir no se reemplaza
+    la instantánea por una carga incompleta.
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        ruta_diario (Path): Ruta del diario de cambios.
+        bloqueo_previo (bool): Estado del bloqueo antes de la carga.
+    """
+    global _HILO_CARGA
+    
+    try:
+        _cargar_base(ruta_base, ruta_diario)
+    except Exception as e:
+        _actualizar_carga(error=str(e))
+    finally:
+        _actualizar_carga(en_curso=False)
+        BLOQUEO.activar(bloqueo_previo)
+        _HILO_CARGA = None
+
+
+def _actualizar_carga(**cambios: Any) -> None:
+    """
+    Actualiza el estado de la carga y despierta a quienes la esperan.
+    
+    Args:
+        **cambios: Claves de _CARGA y sus valores nuevos.
+    """
+    with _CONDICION_CARGA:
+        _CARGA.update(cambios)
+        _CONDICION_CARGA.notify_all()
+
+
+def estado_carga() -> Dict[str, Any]:
+    """
+    Retorna el avance de la carga de la base de datos.
+    
+    Returns:
+        Dict[str, Any]: en_curso, proyectos cargados, total anunciado en los
+        metadatos (None si se desconoce) y mensaje de error (None si no hubo).
+    """
+    with _CONDICION_CARGA:
+        return dict(_CARGA)
+
+
+def esperar_carga(cantidad: Optional[int] = None, tiempo: Optional[float] = None) -> bool:
+    """
+    Espera a que termine la carga o a que haya al menos cierta cantidad de
+    proyectos cargados.
+    
+    Args:
+        cantidad (Optional[int]): Proyectos cargados suficientes; None espera el final.
+        tiempo (Optional[float]): Segundos máximos de espera; None sin límite.
+        
+    Returns:
+        bool: True si se alcanzó la condición, False si venció el tiempo.
+    """
+    with _CONDICION_CARGA:
+        return _CONDICION_CARGA.wait_for(
+            lambda: not _CARGA["en_curso"] or (cantidad is not None and _CARGA["cargados"] >= cantidad),
+            tiempo
+        )
+
+
+def _firma_archivo(ruta: Path) -> Optional[Tuple[int, int]]:
+    """
+    Identifica una versión de un archivo (cambia si se reemplaza o modifica).
+    
+    Args:
+        ruta (Path): Archivo.
+        
+    Returns:
+        Optional[Tuple[int, int]]: Inodo y fecha de modificación, o None si no existe.
+    """
+    try:
+        estado = os.stat(ruta)
+    except OSError:
+        return None
+    return estado.st_ino, estado.st_mtime_ns
+
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def seguir_cambios_externos(reiniciar: bool = False) -> int:
+    """
+    Incorpora los cambios que otros procesos (el servidor, otra ejecución de
+    la CLI) hicieron en la base desde la llamada anterior y los publica a los
+    suscriptores. En memoria se leen solo los registros nuevos del diario; si
+    otro proceso compactó la base (database.json cambió), se vuelve a cargar.
+    Con SQLite se detecta que la base cambió y se publica una recarga.
+    
+    La primera llamada, o una con reiniciar=True, toma el final actual del
+    diario como punto de partida. Los cambios que este proceso haga después
+    también se leerían del diario, así que mientras se siguen los cambios
+    externos el proceso no debería modificar el almacén.
+    
+    Args:
+        reiniciar (bool): True para tomar el estado actual como punto de partida.
+        
+    Returns:
+        int: Registros del diario aplicados (con SQLite, 1 si la base cambió).
+    """
+    global _DIARIO
+    
+    if _MOTOR is not None:
+        version, anterior = _MOTOR.version_datos(), _SEGUIMIENTO["version"]
+        _SEGUIMIENTO["version"] = version
+        if reiniciar or anterior is None or version == anterior:
+            return 0
+        _notificar(None)
+        return 1
+    
+    if _DIARIO is None:
+        return 0
+    ruta_diario = _DIARIO.ruta
+    if reiniciar or _SEGUIMIENTO["posicion"] is None:
+        _DIARIO.sincronizar()
+        _SEGUIMIENTO.update(posicion=ruta_diario.stat().st_size, firma=_firma_archivo(_RUTA_BASE_DATOS))
+        return 0
+    
+    if (_firma_archivo(_RUTA_BASE_DATOS) != _SEGUIMIENTO["firma"]
+            or ruta_diario.stat().st_size < _SEGUIMIENTO["posicion"]):
+        # Otro proceso consolidó su diario en una instantánea nueva
+        inicializar_persistencia(_RUTA_BASE_DATOS, ruta_diario, motor="memoria")
+        _SEGUIMIENTO.update(posicion=_DIARIO.ruta.stat().st_size, firma=_firma_archivo(_RUTA_BASE_DATOS))
+        return len(PROYECTOS)
+    
+    registros, _SEGUIMIENTO["posicion"] = persistencia.leer_diario_desde(ruta_diario, _SEGUIMIENTO["posicion"])
+    if registros:
+        # Los registros ya están en el diario: se aplican sin volver a anotarlos
+        diario, _DIARIO = _DIARIO, None
+        try:
+            _reaplicar_diario(registros, lambda proyectos: agregar_proyectos(list(proyectos)))
+        finally:
+            _DIARIO = diario
+    return len(registros)
+
+
+@medir()
+@_tras_la_carga
+@BLOQUEO.escritor
+def compactar_base_datos() -> int:
+    """
+    Consolida el estado actual en una instantánea nueva de database.json
+    (escritura atómica) y vacía el diario. Otros procesos pueden estar
+    anexando al mismo diario: con el diario bloqueado, primero se incorporan
+    sus cambios (ver _incorporar_cambios_ajenos) y recién entonces se
+    escribe la instantánea y se vacía el diario, así que no se pierde nada.
+    
+    Returns:
+        int: Cantidad de proyectos escritos en la instantánea.
+    """
+    if _MOTOR is not None:
+        return persistencia.escribir_instantanea(
+            _MOTOR.consultar({}), _MOTOR.usuarios(), _RUTA_BASE_DATOS, _MOTOR.metadata()
+        )
+    
+    if _DIARIO is None:
+        return _escribir_instantanea()
+    
+    with _DIARIO.exclusivo():
+        _incorporar_cambios_ajenos()
+        total = _escribir_instantanea()
+        # El diario solo se vacía cuando la instantánea ya está en disco
+        _DIARIO.truncar()
+        _CARGADO.update(posicion=0, firma=_firma_archivo(_RUTA_BASE_DATOS))
+    return total
+
+
+def _escribir_instantanea() -> int:
+    """
+    Escribe el almacén en memoria como instantánea de database.json.
+    
+    Returns:
+        int: Cantidad de proyectos escritos.
+    """
+    # El resumen del archivo viaja en los metadatos de la instantánea
+    metadata = dict(_METADATA_BASE)
+    metadata.pop("archivo", None)
+    if _ARCHIVO is not None and len(_ARCHIVO):
+        metadata["archivo"] = _ARCHIVO.resumen()
+    
+    return persistencia.escribir_instantanea(
+        PROYECTOS.values(), _USUARIOS_BASE, _RUTA_BASE_DATOS, metadata
+    )
+
+
+def _incorporar_cambios_ajenos() -> int:
+    """
+    Incorpora al almacén lo que otros procesos guardaron desde la carga: los
+    registros anexados al diario después de la posición cargada o, si otro
+    proceso ya compactó (cambió la instantánea o se vació el diario), la base
+    completa. Se llama con el diario bloqueado en modo exclusivo y los
+    registros propios ya escritos, de modo que lo leído incluye también los
+    cambios de este proceso; reaplicarlos no los altera.
+    
+    Returns:
+        int: Registros reaplicados, o proyectos cargados si se releyó la base.
+    """
+    global _DIARIO
+    
+    ruta_diario = _DIARIO.ruta
+    # Lo que se lee ya está en disco: se aplica sin volver a anotarlo
+    diario, _DIARIO = _DIARIO, None
+    try:
+        if (_firma_archivo(_RUTA_BASE_DATOS) != _CARGADO["firma"]
+                or ruta_diario.stat().st_size < _CARGADO["posicion"]):
+            contar("data_manager.recargas_al_compactar")
+            _leer_base(_RUTA_BASE_DATOS, ruta_diario)
+            _notificar(None)
+            return len(PROYECTOS)
+        registros, _CARGADO["posicion"] = persistencia.leer_diario_desde(ruta_diario, _CARGADO["posicion"])
+        _reaplicar_diario(registros, lambda proyectos: agregar_proyectos(list(proyectos)))
+        return len(registros)
+    finally:
+        _DIARIO = diario
+
+
+@_tras_la_carga
+@BLOQUEO.escritor
+def cerrar_persistencia(compactar: bool = True) -> None:
+    """
+    Sincroniza y cierra el diario, compactando antes si se indica, y
+    devuelve a la secuencia los IDs reservados que no se usaron.
+    Con el motor SQLite cierra la base; los cambios ya están en ella.
+    
+    Args:
+        compactar (bool): True para consolidar el diario en database.json.
+    """
+    global _DIARIO, _MOTOR, _SECUENCIA
+    
+    _SEGUIMIENTO.update(posicion=None, firma=None, version=None)
+    if _SECUENCIA is not None:
+        # Los IDs reservados y sin usar vuelven a la secuencia compartida
+        _SECUENCIA.liberar()
+        _SECUENCIA = None
+    if _MOTOR is not None:
+        _MOTOR.cerrar()
+        _MOTOR = None
+        _notificar(None)
+        return
+    if _DIARIO is None:
+        return
+    _DIARIO.sincronizar()
+    if compactar and _DIARIO.ruta.stat().st_size > 0:
+        compactar_base_datos()
+    _DIARIO.cerrar()
+    _DIARIO = None
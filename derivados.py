@@ -0,0 +1,121 @@
+"""
+Campos derivados de los proyectos para el Sistema de Gestión de Proyectos.
+Las métricas que se calculan a partir de otros campos (por ahora, el
+porcentaje de avance) se calculan una vez cuando el proyecto se registra o
+cambia y se guardan en el propio registro, de modo que la tabla, el detalle,
+los índices ordenados y los filtros las leen sin recalcularlas.
+
+Cada campo derivado declara de qué campos depende: al modificar un proyecto
+solo se marcan como sucios, y se recalculan, los derivados afectados. Los
+campos derivados son internos: no se persisten (se reconstruyen al cargar)
+y las salidas (CLI, exportación, servicio HTTP) los quitan con sin_derivados().
+"""
+
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+
+def calcular_porcentaje_avance(tareas_completadas: int, horas_estimadas: int) -> float:
+    """
+    Calcula el porcentaje de avance de un proyecto basado en tareas completadas.
+    
+    Args:
+        tareas_completadas (int): Número de tareas completadas.
+        horas_estimadas (int): Total de horas estimadas del proyecto.
+        
+    Returns:
+        float: Porcentaje de avance (0-100).
+    """
+    if horas_estimadas == 0:
+        return 0.0
+    
+    porcentaje = (tareas_completadas / horas_estimadas) * 100
+    return min(porcentaje, 100.0)  # Limitar a máximo 100%
+
+
+def _calcular_avance(proyecto: Mapping[str, Any]) -> float:
+    """
+    Calcula el campo derivado "avance" de un proyecto.
+    
+    Args:
+        proyecto (Mapping[str, Any]): Proyecto.
+        
+    Returns:
+        float: Porcentaje de avance (0-100).
+    """
+    return calcular_porcentaje_avance(
+        proyecto.get("tareas_completadas", 0),
+        proyecto.get("horas_estimadas", 0)
+    )
+
+
+# Campos derivados: función que los calcula y campos de los que dependen
+CALCULOS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "avance": _calcular_avance
+}
+DEPENDENCIAS: Dict[str, Tuple[str, ...]] = {
+    "avance": ("tareas_completadas", "horas_estimadas")
+}
+CAMPOS_DERIVADOS = tuple(CALCULOS)
+
+
+def derivados_sucios(campos_modificados: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Determina qué campos derivados quedan desactualizados al modificar
+    los campos indicados.
+    
+    Args:
+        campos_modificados (Iterable[str]): Campos que cambiaron.
+        
+    Returns:
+        Tuple[str, ...]: Campos derivados a recalcular.
+    """
+    modificados = set(campos_modificados)
+    return tuple(
+        campo for campo, dependencias in DEPENDENCIAS.items()
+        if modificados.intersection(dependencias)
+    )
+
+
+def actualizar_derivados(proyecto: Dict[str, Any], campos_modificados: Optional[Iterable[str]] = None) -> None:
+    """
+    Recalcula y guarda en el proyecto sus campos derivados.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a actualizar (se modifica).
+        campos_modificados (Optional[Iterable[str]]): Campos que cambiaron;
+            solo se recalculan los derivados que dependen de ellos. None
+            recalcula todos (proyecto nuevo o recién cargado).
+    """
+    sucios = CAMPOS_DERIVADOS if campos_modificados is None else derivados_sucios(campos_modificados)
+    for campo in sucios:
+        proyecto[campo] = CALCULOS[campo](proyecto)
+
+
+def avance(proyecto: Mapping[str, Any]) -> float:
+    """
+    Lee el porcentaje de avance guardado en el proyecto. Los proyectos que
+    no pasaron por el almacén (por ejemplo, recién leídos de un CSV) no lo
+    tienen y se calcula en el momento.
+    
+    Args:
+        proyecto (Mapping[str, Any]): Proyecto.
+        
+    Returns:
+        float: Porcentaje de avance (0-100).
+    """
+    valor = proyecto.get("avance")
+    return _calcular_avance(proyecto) if valor is None else valor
+
+
+def sin_derivados(proyecto: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Copia un proyecto sin sus campos derivados, para persistirlo o
+    entregarlo fuera del programa.
+    
+    Args:
+        proyecto (Mapping[str, Any]): Proyecto.
+        
+    Returns:
+        Dict[str, Any]: Copia con solo los campos propios.
+    """
+    return {clave: valor for clave, valor in proyecto.items() if clave not in CALCULOS}
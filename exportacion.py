@@ -0,0 +1,209 @@
+"""
+Módulo de exportación para el Sistema de Gestión de Proyectos.
+Escribe listados de proyectos y reportes en CSV o JSONL en modo streaming:
+las filas se generan de a una y se escriben en bloques, de modo que la
+memoria usada no depende de la cantidad de proyectos y la salida puede
+encadenarse con otras herramientas.
+"""
+
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Sequence, TextIO
+
+from data_manager import (
+    obtener_proyectos,
+    inicializar_persistencia,
+    cerrar_persistencia
+)
+from derivados import sin_derivados
+from importacion import agrupar_en_lotes
+
+# Formatos de salida disponibles
+FORMATOS = ("csv", "jsonl")
+
+# Columnas del CSV de proyectos: primero las de datos_prueba.csv y luego el
+# resto, de modo que el archivo se puede volver a importar con importacion.py
+COLUMNAS_PROYECTO = (
+    "nombre",
+    "cliente",
+    "estado",
+    "fecha_inicio",
+    "id",
+    "horas_estimadas",
+    "tareas_completadas",
+    "prioridad",
+    "fecha_fin",
+    "fecha_actualizacion"
+)
+
+# Columnas de los reportes exportados
+COLUMNAS_REPORTE = ("indicador", "valor")
+COLUMNAS_PERIODOS = ("periodo", "iniciados", "finalizados", "tareas_completadas")
+
+# Cantidad de filas que se acumulan antes de cada escritura en la salida
+FILAS_POR_ESCRITURA = 1000
+
+
+def fila_proyecto(proyecto: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte un proyecto en una fila plana para el CSV.
+    La prioridad se exporta por su nombre, como la lee importacion.py.
+    
+    Args:
+        proyecto (Dict[str, Any]): Proyecto a exportar.
+        
+    Returns:
+        Dict[str, Any]: Valores de las columnas de COLUMNAS_PROYECTO.
+    """
+    fila = {columna: proyecto.get(columna, "") for columna in COLUMNAS_PROYECTO}
+    prioridad = proyecto.get("prioridad")
+    fila["prioridad"] = prioridad[0] if prioridad else ""
+    return fila
+
+
+def filas_reporte_productividad(agregados: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los indicadores del reporte de productividad, en el mismo orden
+    que reports.mostrar_reporte_productividad.
+    
+    Args:
+        agregados (Dict[str, Any]): Totales de data_manager.obtener_agregados().
+        
+    Yields:
+        Dict[str, Any]: Fila con las claves "indicador" y "valor".
+    """
+    por_estado = agregados["por_estado"]
+    indicadores = (
+        ("total_proyectos", agregados["total_proyectos"]),
+        ("proyectos_finalizados", por_estado.get("Finalizado", 0)),
+        ("proyectos_en_progreso", por_estado.get("En Progreso", 0)),
+        ("proyectos_pendientes", por_estado.get("Pendiente", 0)),
+        ("tareas_completadas", agregados["tareas_completadas"]),
+        ("horas_estimadas", agregados["horas_estimadas"])
+    )
+    for indicador, valor in indicadores:
+        yield {"indicador": indicador, "valor": valor}
+
+
+def exportar_filas(filas: Iterable[Dict[str, Any]], columnas: Sequence[str],
+                   salida: TextIO, formato: str = "csv") -> int:
+    """
+    Escribe filas en CSV (con encabezado) o JSONL, de a bloques de
+    FILAS_POR_ESCRITURA filas por escritura.
+    
+    Args:
+        filas (Iterable[Dict[str, Any]]): Filas a escribir; se consumen de a una.
+        columnas (Sequence[str]): Columnas del CSV, en orden.
+        salida (TextIO): Flujo de salida.
+        formato (str): "csv" o "jsonl".
+        
+    Returns:
+        int: Cantidad de filas escritas.
+        
+    Raises:
+        ValueError: Si el formato no existe.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato!r} (válidos: {', '.join(FORMATOS)})")
+    
+    total = 0
+    if formato == "csv":
+        # El csv.writer escribe en un búfer en memoria que se vuelca por bloque
+        bufer = io.StringIO()
+        escritor = csv.DictWriter(bufer, fieldnames=columnas, extrasaction="ignore", lineterminator="\n")
+        escritor.writeheader()
+        salida.write(bufer.getvalue())
+        for bloque in agrupar_en_lotes(filas, FILAS_POR_ESCRITURA):
+            bufer.seek(0)
+            bufer.truncate()
+            escritor.writerows(bloque)
+            salida.write(bufer.getvalue())
+            total += len(bloque)
+    else:
+        for bloque in agrupar_en_lotes(filas, FILAS_POR_ESCRITURA):
+            salida.write("".join(json.dumps(dict(fila), ensure_ascii=False) + "\n" for fila in bloque))
+            total += len(bloque)
+    return total
+
+
+def exportar_proyectos(proyectos: Iterable[Dict[str, Any]], salida: TextIO, formato: str = "csv") -> int:
+    """
+    Exporta un listado de proyectos (todos, un filtro o una consulta).
+    En JSONL cada línea es el proyecto completo, incluidos los campos que no
+    tienen columna en el CSV (no los derivados, que no son parte del registro).
+    
+    Args:
+        proyectos (Iterable[Dict[str, Any]]): Proyectos a exportar.
+        salida (TextIO): Flujo de salida.
+        formato (str): "csv" o "jsonl".
+        
+    Returns:
+        int: Cantidad de proyectos escritos.
+    """
+    if formato == "csv":
+        filas = (fila_proyecto(proyecto) for proyecto in proyectos)
+    else:
+        filas = (sin_derivados(proyecto) for proyecto in proyectos)
+    return exportar_filas(filas, COLUMNAS_PROYECTO, salida, formato)
+
+
+def exportar_reporte_productividad(agregados: Dict[str, Any], salida: TextIO, formato: str = "csv") -> int:
+    """
+    Exporta el reporte de productividad como filas indicador/valor.
+    
+    Args:
+        agregados (Dict[str, Any]): Totales de data_manager.obtener_agregados().
+        salida (TextIO): Flujo de salida.
+        formato (str): "csv" o "jsonl".
+        
+    Returns:
+        int: Cantidad de indicadores escritos.
+    """
+    return exportar_filas(filas_reporte_productividad(agregados), COLUMNAS_REPORTE, salida, formato)
+
+
+def exportar_reporte_periodos(filas: Iterable[Dict[str, Any]], salida: TextIO, formato: str = "csv") -> int:
+    """
+    Exporta el rendimiento por período de data_manager.reporte_por_periodo().
+    
+    Args:
+        filas (Iterable[Dict[str, Any]]): Filas del reporte.
+        salida (TextIO): Flujo de salida.
+        formato (str): "csv" o "jsonl".
+        
+    Returns:
+        int: Cantidad de períodos escritos.
+    """
+    return exportar_filas(filas, COLUMNAS_PERIODOS, salida, formato)
+
+
+def formato_por_extension(ruta: Path) -> str:
+    """
+    Deduce el formato de exportación a partir de la extensión del archivo.
+    
+    Args:
+        ruta (Path): Archivo de destino.
+        
+    Returns:
+        str: "jsonl" para .jsonl, "csv" en cualquier otro caso.
+    """
+    return "jsonl" if Path(ruta).suffix.lower() == ".jsonl" else "csv"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python exportacion.py archivo.csv|archivo.jsonl")
+        sys.exit(1)
+    
+    ruta = Path(sys.argv[1])
+    inicializar_persistencia()
+    try:
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            total = exportar_proyectos(obtener_proyectos(), archivo, formato_por_extension(ruta))
+    finally:
+        cerrar_persistencia(compactar=False)
+    
+    print(f"\n✅ Exportación finalizada: {total} proyectos escritos en {ruta}.\n")
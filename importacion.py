@@ -0,0 +1,216 @@
+"""
+Módulo de importación masiva para el Sistema de Gestión de Proyectos.
+Lee archivos CSV con la forma de datos_prueba.csv en modo streaming,
+valida cada fila e inserta los proyectos por lotes.
+"""
+
+import csv
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_manager import (
+    agregar_proyectos,
+    reservar_ids,
+    inicializar_persistencia,
+    cerrar_persistencia,
+    IDS_EXISTENTES
+)
+from utils import ESTADOS_VALIDOS, validar_prioridad
+
+# Cantidad de filas que se validan e insertan juntas
+TAMANO_LOTE = 1000
+
+
+def leer_filas(ruta: Path) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Recorre el CSV fila por fila sin cargarlo completo en memoria.
+    
+    Args:
+        ruta (Path): Ruta del archivo CSV con encabezados.
+        
+    Yields:
+        Tuple[int, Dict[str, str]]: Número de línea y fila como diccionario.
+    """
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        lector = csv.DictReader(f)
+        for fila in lector:
+            yield lector.line_num, fila
+
+
+def agrupar_en_lotes(filas: Iterable[Any], tamano: int) -> Iterator[List[Any]]:
+    """
+    Agrupa un iterable en listas de tamaño fijo (la última puede ser menor).
+    
+    Args:
+        filas (Iterable[Any]): Elementos a agrupar.
+        tamano (int): Cantidad de elementos por lote.
+        
+    Yields:
+        List[Any]: Cada lote de elementos.
+    """
+    iterador = iter(filas)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def _leer_entero(fila: Dict[str, str], campo: str) -> int:
+    """
+    Lee un campo numérico opcional de la fila (vacío o ausente equivale a 0).
+    
+    Args:
+        fila (Dict[str, str]): Fila del CSV.
+        campo (str): Nombre de la columna.
+        
+    Returns:
+        int: Valor entero no negativo.
+        
+    Raises:
+        ValueError: Si el valor no es un entero no negativo.
+    """
+    texto = (fila.get(campo) or "").strip()
+    if not texto:
+        return 0
+    valor = int(texto)
+    if valor < 0:
+        raise ValueError(f"{campo} no puede ser negativo")
+    return valor
+
+
+def validar_fila(fila: Dict[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Valida una fila del CSV y la convierte en proyecto (todavía sin ID asignado
+    si la fila no trae la columna id).
+    
+    Args:
+        fila (Dict[str, str]): Fila del CSV.
+        
+    Returns:
+        Tuple[Optional[Dict[str, Any]], Optional[str]]: (proyecto, None) si la fila
+        es válida, o (None, mensaje de error) si no lo es.
+    """
+    nombre = (fila.get("nombre") or "").strip()
+    cliente = (fila.get("cliente") or "").strip()
+    estado = (fila.get("estado") or "").strip()
+    
+    if not nombre or not cliente:
+        return None, "nombre y cliente son obligatorios"
+    if estado not in ESTADOS_VALIDOS:
+        return None, f"estado inválido: '{estado}'"
+    
+    try:
+        horas_estimadas = _leer_entero(fila, "horas_estimadas")
+        tareas_completadas = _leer_entero(fila, "tareas_completadas")
+        id_proyecto = _leer_entero(fila, "id") or None
+    except ValueError as e:
+        return None, str(e)
+    
+    proyecto = {
+        "id": id_proyecto,
+        "nombre": nombre,
+        "cliente": cliente,
+        "estado": estado,
+        "horas_estimadas": horas_estimadas,
+        "tareas_completadas": tareas_completadas,
+        "prioridad": validar_prioridad(fila.get("prioridad") or "")
+    }
+    
+    fecha_inicio = (fila.get("fecha_inicio") or "").strip()
+    if fecha_inicio:
+        try:
+            datetime.strptime(fecha_inicio, "%Y-%m-%d")
+        except ValueError:
+            return None, f"fecha_inicio inválida: '{fecha_inicio}'"
+        proyecto["fecha_inicio"] = fecha_inicio
+    
+    return proyecto, None
+
+
+def importar_csv(ruta: Path, tamano_lote: int = TAMANO_LOTE) -> Iterator[Dict[str, Any]]:
+    """
+    Importa un CSV por lotes con memoria constante.
+    Las filas inválidas o con ID repetido no detienen la importación: se
+    informan en el reporte del lote correspondiente. Las filas sin ID
+    reciben IDs de un rango reservado una sola vez por lote, por encima de
+    los IDs explícitos del lote.
+    
+    Args:
+        ruta (Path): Ruta del archivo CSV.
+        tamano_lote (int): Filas por lote.
+        
+    Yields:
+        Dict[str, Any]: Reporte de cada lote con las claves "lote", "filas",
+        "insertados", "duplicados" y "errores" (lista de (línea, mensaje)).
+    """
+    for numero_lote, filas in enumerate(agrupar_en_lotes(leer_filas(ruta), tamano_lote), start=1):
+        errores = []
+        proyectos = []
+        ids_del_lote = set()
+        sin_id = []
+        duplicados = 0
+        
+        for linea, fila in filas:
+            proyecto, error = validar_fila(fila)
+            if error:
+                errores.append((linea, error))
+                continue
+            
+            if proyecto["id"] is None:
+                sin_id.append(proyecto)
+            elif proyecto["id"] in IDS_EXISTENTES or proyecto["id"] in ids_del_lote:
+                duplicados += 1
+                errores.append((linea, f"ID duplicado: {proyecto['id']}"))
+                continue
+            else:
+                ids_del_lote.add(proyecto["id"])
+            proyectos.append(proyecto)
+        
+        for proyecto, id_proyecto in zip(sin_id, reservar_ids(len(sin_id), max(ids_del_lote, default=0) + 1)):
+            proyecto["id"] = id_proyecto
+        
+        rechazados = agregar_proyectos(proyectos)
+        
+        yield {
+            "lote": numero_lote,
+            "filas": len(filas),
+            "insertados": len(proyectos) - len(rechazados),
+            "duplicados": duplicados + len(rechazados),
+            "errores": errores
+        }
+
+
+def mostrar_reporte_lote(reporte: Dict[str, Any]) -> None:
+    """
+    Muestra el resultado de un lote importado.
+    
+    Args:
+        reporte (Dict[str, Any]): Reporte generado por importar_csv.
+    """
+    print(f"Lote {reporte['lote']:>5}: {reporte['filas']:>6} filas | "
+          f"{reporte['insertados']:>6} insertados | "
+          f"{reporte['duplicados']:>4} duplicados | "
+          f"{len(reporte['errores']):>4} errores")
+    for linea, mensaje in reporte["errores"]:
+        print(f"   ⚠️ Línea {linea}: {mensaje}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Uso: python importacion.py archivo.csv")
+        sys.exit(1)
+    
+    inicializar_persistencia()
+    total_insertados = 0
+    try:
+        for reporte in importar_csv(Path(sys.argv[1])):
+            mostrar_reporte_lote(reporte)
+            total_insertados += reporte["insertados"]
+    finally:
+        cerrar_persistencia()
+    
+    print(f"\n✅ Importación finalizada: {total_insertados} proyectos insertados.\n")
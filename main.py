@@ -6,24 +6,50 @@ Autor: Sistema de Gestión de Proyectos
 Versión: 1.0
 """
 
+import sys
+
 from auth import login
 from data_manager import (
     obtener_proyectos,
     agregar_proyecto,
+    actualizar_proyectos,
+    eliminar_proyectos,
+    consultar,
     filtrar_por_estado,
-    IDS_EXISTENTES
+    top_proyectos,
+    buscar_proyectos,
+    obtener_agregados,
+    obtener_agregados_por_cliente,
+    reporte_por_periodo,
+    inicializar_persistencia,
+    cerrar_persistencia,
+    estado_carga,
+    esperar_carga,
+    asignar_id
 )
 from utils import (
     validar_numero,
-    calcular_total_tareas_completadas,
     ESTADOS_VALIDOS,
     PRIORIDADES_VALIDAS,
+    PERIODOS,
     validar_prioridad
 )
 from reports import (
     mostrar_tabla,
-    mostrar_reporte_productividad
+    mostrar_reporte_productividad,
+    mostrar_reporte_clientes,
+    mostrar_reporte_periodos,
+    mostrar_metricas
 )
+from tablero import Tablero
+import metricas
+
+
+# Filas por página al mostrar tablas en el menú
+TAMANO_PAGINA = 20
+
+# Cantidad de proyectos que muestra el triage si no se indica otra
+TOP_POR_DEFECTO = 20
 
 
 def mostrar_encabezado_principal():
@@ -36,10 +62,29 @@ def mostrar_encabezado_principal():
     print("=" * 70 + "\n")
 
 
+def mostrar_estado_carga():
+    """
+    Muestra el avance de la carga de la base de datos mientras sigue en
+    segundo plano, o el error si la carga falló.
+    """
+    estado = estado_carga()
+    if estado["error"]:
+        print(f"⚠️ No se pudo cargar la base de datos: {estado['error']}")
+        print("   Los cambios de esta sesión no se guardarán.")
+    elif estado["en_curso"]:
+        cargados, total = estado["cargados"], estado["total"]
+        if total:
+            print(f"⏳ Cargando proyectos: {cargados:,} de {total:,} ({cargados * 100 // total}%)"
+                  " - las consultas muestran lo cargado hasta ahora")
+        else:
+            print(f"⏳ Cargando proyectos: {cargados:,} - las consultas muestran lo cargado hasta ahora")
+
+
 def mostrar_menu():
     """
     Muestra el menú principal de opciones.
     """
+    mostrar_estado_carga()
     print("-" * 70)
     print(" " * 20 + "MENÚ PRINCIPAL")
     print("-" * 70)
@@ -47,35 +92,69 @@ def mostrar_menu():
     print("2. Agregar Proyecto")
     print("3. Filtrar por Estado")
     print("4. Reporte de Productividad")
-    print("5. Salir")
+    print("5. Reporte por Período")
+    print("6. Top Proyectos (triage)")
+    print("7. Métricas")
+    print("8. Actualizar o Eliminar Proyectos")
+    print("9. Buscar Proyectos")
+    print("10. Salir")
     print("-" * 70)
 
 
+def navegar_tabla(proyectos):
+    """
+    Muestra los proyectos página por página y permite avanzar o retroceder.
+    
+    Args:
+        proyectos (list): Proyectos a mostrar.
+    """
+    pagina = 1
+    
+    while True:
+        hay_mas = mostrar_tabla(proyectos, tamano_pagina=TAMANO_PAGINA, pagina=pagina)
+        if not hay_mas and pagina == 1:
+            return
+        
+        opciones = []
+        if hay_mas:
+            opciones.append("[s] siguiente")
+        if pagina > 1:
+            opciones.append("[a] anterior")
+        opciones.append("[Enter] volver al menú")
+        
+        eleccion = input(" | ".join(opciones) + ": ").strip().lower()
+        if eleccion == "s" and hay_mas:
+            pagina += 1
+        elif eleccion == "a" and pagina > 1:
+            pagina -= 1
+        else:
+            return
+
+
 def opcion_ver_todos_proyectos():
     """
-    Muestra todos los proyectos en formato de tabla.
+    Muestra todos los proyectos en formato de tabla paginada.
     """
     print("\n📋 VER PROYECTOS")
     proyectos = obtener_proyectos()
-    mostrar_tabla(proyectos)
+    navegar_tabla(proyectos)
 
 
 def opcion_agregar_proyecto():
     """
     Permite al usuario agregar un nuevo proyecto.
-    Pide datos y usa agregar_proyecto de data_manager.
+    Pide datos y usa agregar_proyecto de data_manager; el ID lo asigna
+    data_manager.asignar_id.
     """
     print("\n➕ AGREGAR PROYECTO")
     print("-" * 70)
     
-    # Solicitar datos del proyecto
-    id_proyecto = validar_numero("ID del proyecto: ")
-    
-    # Validar que el ID no exista
-    if id_proyecto in IDS_EXISTENTES:
-        print(f"\n❌ El ID {id_proyecto} ya existe. Por favor, usa otro ID.\n")
-        return
+    # Las altas esperan a que la base esté cargada
+    if estado_carga()["en_curso"]:
+        print("⏳ Esperando a que termine la carga de la base de datos...")
+        esperar_carga()
     
+    # Solicitar datos del proyecto
     nombre = input("Nombre del proyecto: ").strip()
     cliente = input("Cliente: ").strip()
     
@@ -96,7 +175,7 @@ def opcion_agregar_proyecto():
     
     # Crear diccionario del proyecto
     nuevo_proyecto = {
-        "id": id_proyecto,
+        "id": asignar_id(),
         "nombre": nombre,
         "cliente": cliente,
         "estado": estado,
@@ -107,11 +186,91 @@ def opcion_agregar_proyecto():
     
     # Agregar el proyecto
     if agregar_proyecto(nuevo_proyecto):
-        print(f"\n✅ Proyecto '{nombre}' agregado exitosamente.\n")
+        print(f"\n✅ Proyecto '{nombre}' agregado exitosamente con el ID {nuevo_proyecto['id']}.\n")
     else:
         print(f"\n❌ Error al agregar el proyecto. El ID ya existe.\n")
 
 
+def opcion_actualizar_eliminar():
+    """
+    Actualiza o elimina en un solo paso varios proyectos, elegidos por ID
+    o por estado y cliente. El cambio se aplica a todos o a ninguno.
+    """
+    print("\n✏️ ACTUALIZAR O ELIMINAR PROYECTOS")
+    print("-" * 70)
+    
+    # La selección debe ver todos los proyectos: esperar a que estén cargados
+    if estado_carga()["en_curso"]:
+        print("⏳ Esperando a que termine la carga de la base de datos...")
+        esperar_carga()
+    
+    texto_ids = input("IDs separados por coma (Enter para elegir por estado/cliente): ").strip()
+    ids = None
+    criterios = {}
+    if texto_ids:
+        try:
+            ids = [int(parte) for parte in texto_ids.replace(",", " ").split()]
+        except ValueError:
+            print("\n❌ Los IDs deben ser números enteros.\n")
+            return
+        cantidad = len(set(ids))
+    else:
+        print(f"Estados disponibles: {', '.join(sorted(ESTADOS_VALIDOS))}")
+        estado = input("Estado (Enter para todos): ").strip()
+        cliente = input("Cliente (Enter para todos): ").strip()
+        if estado and estado not in ESTADOS_VALIDOS:
+            print("\n❌ Estado inválido.\n")
+            return
+        criterios = {campo: valor for campo, valor in (("estado", estado), ("cliente", cliente)) if valor}
+        if not criterios:
+            print("\n❌ Indica IDs, un estado o un cliente.\n")
+            return
+        cantidad = len(consultar(**criterios))
+        if not cantidad:
+            print("\n❌ Ningún proyecto coincide con la selección.\n")
+            return
+    
+    print(f"\nProyectos seleccionados: {cantidad}")
+    accion = input("¿[a]ctualizar o [e]liminar? ").strip().lower()
+    
+    try:
+        if accion == "a":
+            print("Deja en blanco los campos que no cambian.")
+            cambios = {}
+            estado_nuevo = input(f"Nuevo estado ({'/'.join(sorted(ESTADOS_VALIDOS))}): ").strip()
+            if estado_nuevo:
+                cambios["estado"] = estado_nuevo
+            for campo, etiqueta in (("horas_estimadas", "Horas estimadas"),
+                                    ("tareas_completadas", "Tareas completadas")):
+                valor = input(f"{etiqueta}: ").strip()
+                if valor:
+                    if not valor.isdigit():
+                        print(f"\n❌ {etiqueta} debe ser un número entero positivo.\n")
+                        return
+                    cambios[campo] = int(valor)
+            prioridad = input("Prioridad (Alta/Media/Baja): ").strip()
+            if prioridad:
+                cambios["prioridad"] = prioridad
+            if not cambios:
+                print("\n❌ No se indicó ningún cambio.\n")
+                return
+            if input(f"¿Aplicar los cambios a {cantidad} proyectos? (s/N): ").strip().lower() != "s":
+                print("\nOperación cancelada.\n")
+                return
+            modificados = actualizar_proyectos(cambios, ids, **criterios)
+            print(f"\n✅ {len(modificados)} proyectos actualizados.\n")
+        elif accion == "e":
+            if input(f"¿Eliminar {cantidad} proyectos? (s/N): ").strip().lower() != "s":
+                print("\nOperación cancelada.\n")
+                return
+            eliminados = eliminar_proyectos(ids, **criterios)
+            print(f"\n✅ {len(eliminados)} proyectos eliminados.\n")
+        else:
+            print("\n❌ Opción inválida.\n")
+    except ValueError as e:
+        print(f"\n❌ {e}. No se modificó ningún proyecto.\n")
+
+
 def opcion_filtrar_por_estado():
     """
     Permite filtrar proyectos por estado.
@@ -131,25 +290,129 @@ def opcion_filtrar_por_estado():
     
     if proyectos_filtrados:
         print(f"\n📋 Proyectos con estado '{estado}':")
-        mostrar_tabla(proyectos_filtrados)
+        navegar_tabla(proyectos_filtrados)
     else:
         print(f"\n❌ No se encontraron proyectos con estado '{estado}'.\n")
 
 
 def opcion_reporte_productividad():
     """
-    Muestra el reporte de productividad.
-    Usa la función recursiva de utils.py para mostrar el total de tareas realizadas.
+    Muestra el reporte de productividad y, si se pide, el detalle por cliente
+    o el tablero en vivo. Usa los totales incrementales de data_manager, por
+    lo que no depende de la cantidad de proyectos cargados.
     """
     print("\n📊 REPORTE DE PRODUCTIVIDAD")
     print("-" * 70)
     
-    proyectos = obtener_proyectos()
+    agregados = obtener_agregados()
+    
+    mostrar_reporte_productividad(agregados)
+    
+    if input("¿Ver el detalle por cliente? (s/N): ").strip().lower() == "s":
+        mostrar_reporte_clientes(obtener_agregados_por_cliente())
+    
+    if input("¿Mantener el reporte en vivo? (s/N): ").strip().lower() == "s":
+        # Se actualiza con los cambios a medida que llegan; Ctrl+C vuelve al menú
+        Tablero().ejecutar()
+        print()
+
+
+def opcion_reporte_periodos():
+    """
+    Muestra proyectos iniciados, finalizados y tareas completadas por semana
+    o por mes, opcionalmente dentro de un rango de fechas.
+    """
+    print("\n📅 REPORTE POR PERÍODO")
+    print("-" * 70)
+    
+    periodo = input("Período (semana/mes) [mes]: ").strip().lower() or "mes"
+    if periodo not in PERIODOS:
+        print("\n❌ Período inválido. Usa 'semana' o 'mes'.\n")
+        return
+    
+    desde = input("Desde (YYYY-MM-DD, Enter para sin límite): ").strip() or None
+    hasta = input("Hasta (YYYY-MM-DD, Enter para sin límite): ").strip() or None
+    
+    filas = reporte_por_periodo(periodo, desde, hasta)
+    
+    if filas:
+        mostrar_reporte_periodos(filas, periodo)
+    else:
+        print("\n❌ No hay proyectos con fechas en ese rango.\n")
+
+
+def opcion_top_proyectos():
+    """
+    Muestra los K proyectos de mayor prioridad y menor avance.
+    Pide K (por defecto TOP_POR_DEFECTO) y un estado opcional para acotar la lista.
+    """
+    print("\n🎯 TOP PROYECTOS (TRIAGE)")
+    print("-" * 70)
+    
+    entrada = input(f"¿Cuántos proyectos mostrar? [{TOP_POR_DEFECTO}]: ").strip()
+    k = int(entrada) if entrada.isdigit() and int(entrada) > 0 else TOP_POR_DEFECTO
+    
+    estado = input("Estado a considerar (Enter para todos): ").strip()
+    if estado and estado not in ESTADOS_VALIDOS:
+        print(f"\n❌ Estado inválido. Por favor, ingresa uno de los estados válidos.\n")
+        return
+    
+    criterios = {"estado": estado} if estado else {}
+    proyectos = top_proyectos(k, **criterios)
+    
+    if proyectos:
+        print(f"\n📋 Top {len(proyectos)} por prioridad y menor avance:")
+        navegar_tabla(proyectos)
+    else:
+        print("\n❌ No se encontraron proyectos.\n")
+
+
+def opcion_buscar_proyectos():
+    """
+    Busca proyectos por palabras de su nombre o cliente, sin distinguir
+    mayúsculas ni acentos; la última palabra puede estar incompleta.
+    """
+    print("\n🔎 BUSCAR PROYECTOS")
+    print("-" * 70)
+    
+    texto = input("Texto a buscar (nombre o cliente): ").strip()
+    if not texto:
+        print("\n❌ Ingresa al menos una palabra.\n")
+        return
+    
+    proyectos = buscar_proyectos(texto, TOP_POR_DEFECTO)
+    
+    if proyectos:
+        print(f"\n📋 {len(proyectos)} resultados más relevantes para '{texto}':")
+        navegar_tabla(proyectos)
+    else:
+        print(f"\n❌ No se encontraron proyectos para '{texto}'.\n")
+
+
+def opcion_metricas():
+    """
+    Muestra las métricas de rendimiento y permite activarlas, reiniciarlas
+    o guardarlas en un archivo JSON.
+    """
+    print("\n⏱️ MÉTRICAS")
+    mostrar_metricas(metricas.obtener_metricas())
     
-    # Usar la función recursiva para calcular el total de tareas completadas
-    total_tareas = calcular_total_tareas_completadas(proyectos)
+    accion = "desactivar" if metricas.esta_activo() else "activar"
+    eleccion = input(f"[a] {accion} medición | [r] reiniciar | [g] guardar JSON | [Enter] volver: ").strip().lower()
     
-    mostrar_reporte_productividad(proyectos, total_tareas)
+    if eleccion == "a":
+        metricas.activar(not metricas.esta_activo())
+        print(f"\n✅ Medición {'activada' if metricas.esta_activo() else 'desactivada'}.\n")
+    elif eleccion == "r":
+        metricas.reiniciar_metricas()
+        print("\n✅ Métricas reiniciadas.\n")
+    elif eleccion == "g":
+        ruta = input("Archivo de salida [metricas.json]: ").strip() or "metricas.json"
+        try:
+            metricas.volcar_json(ruta)
+            print(f"\n✅ Métricas guardadas en {ruta}.\n")
+        except OSError as e:
+            print(f"\n❌ No se pudo guardar el archivo: {e}\n")
 
 
 def menu_principal():
@@ -162,7 +425,7 @@ def menu_principal():
     try:
         while True:
             mostrar_menu()
-            opcion = input("Selecciona una opción (1-5): ").strip()
+            opcion = input("Selecciona una opción (1-10): ").strip()
             
             if opcion == "1":
                 opcion_ver_todos_proyectos()
@@ -173,12 +436,22 @@ def menu_principal():
             elif opcion == "4":
                 opcion_reporte_productividad()
             elif opcion == "5":
+                opcion_reporte_periodos()
+            elif opcion == "6":
+                opcion_top_proyectos()
+            elif opcion == "7":
+                opcion_metricas()
+            elif opcion == "8":
+                opcion_actualizar_eliminar()
+            elif opcion == "9":
+                opcion_buscar_proyectos()
+            elif opcion == "10":
                 print("\n" + "=" * 70)
                 print(" " * 20 + "👋 ¡Hasta luego!")
                 print("=" * 70 + "\n")
                 break
             else:
-                print("\n❌ Opción inválida. Por favor, selecciona una opción del 1 al 5.\n")
+                print("\n❌ Opción inválida. Por favor, selecciona una opción del 1 al 10.\n")
     except KeyboardInterrupt:
         print("\n\n⚠️ Operación cancelada. ¡Hasta luego!\n")
 
@@ -186,14 +459,21 @@ def menu_principal():
 def main():
     """
     Función principal del programa.
-    Ejecuta el login y, si es exitoso, inicia el menú principal.
+    Ejecuta el login y, si es exitoso, carga la base de datos persistida
+    en segundo plano e inicia el menú principal en cuanto está la primera
+    página. Al salir consolida el diario en database.json.
     Maneja KeyboardInterrupt para salir gracefully.
     """
     try:
         usuario = login()
         
         if usuario:
-            menu_principal()
+            inicializar_persistencia(en_segundo_plano=True)
+            esperar_carga(TAMANO_PAGINA)
+            try:
+                menu_principal()
+            finally:
+                cerrar_persistencia()
         else:
             print("❌ No se pudo autenticar. El sistema se cerrará.\n")
     except KeyboardInterrupt:
@@ -204,5 +484,9 @@ def main():
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Con argumentos se ejecuta el modo no interactivo (ver cli.py)
+        from cli import ejecutar
+        sys.exit(ejecutar(sys.argv[1:]))
     main()
 
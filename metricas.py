@@ -0,0 +1,216 @@
+"""
+Módulo de métricas para el Sistema de Gestión de Proyectos.
+Instrumentación liviana de tiempos y contadores para las funciones críticas.
+Cuando la medición está desactivada, cada llamada instrumentada solo agrega
+la comprobación de un booleano.
+
+Para medir desde el arranque y guardar las métricas en JSON al salir:
+    GESTION_METRICAS=metricas.json python main.py
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Variable de entorno con la ruta donde volcar las métricas al salir
+VARIABLE_VOLCADO = "GESTION_METRICAS"
+
+# Estado global de la instrumentación
+_ACTIVO = False
+_METRICAS: Dict[str, Dict[str, Any]] = {}
+_CONTADORES: Dict[str, int] = {}
+_BLOQUEO = threading.Lock()
+
+
+def activar(estado: bool = True) -> None:
+    """
+    Activa o desactiva la medición.
+    
+    Args:
+        estado (bool): True para medir, False para desactivar.
+    """
+    global _ACTIVO
+    _ACTIVO = estado
+
+
+def esta_activo() -> bool:
+    """
+    Indica si la medición está activa.
+    
+    Returns:
+        bool: True si se están registrando métricas.
+    """
+    return _ACTIVO
+
+
+def _registrar(nombre: str, segundos: float) -> None:
+    """
+    Acumula una medición de latencia en el histograma de la métrica.
+    Los tramos del histograma son potencias de 2 en microsegundos.
+    
+    Args:
+        nombre (str): Nombre de la métrica.
+        segundos (float): Duración medida.
+    """
+    microsegundos = int(segundos * 1e6)
+    tramo = microsegundos.bit_length()
+    
+    with _BLOQUEO:
+        metrica = _METRICAS.get(nombre)
+        if metrica is None:
+            metrica = _METRICAS[nombre] = {
+                "llamadas": 0,
+                "total_s": 0.0,
+                "min_us": microsegundos,
+                "max_us": microsegundos,
+                "histograma": {}
+            }
+        metrica["llamadas"] += 1
+        metrica["total_s"] += segundos
+        metrica["min_us"] = min(metrica["min_us"], microsegundos)
+        metrica["max_us"] = max(metrica["max_us"], microsegundos)
+        metrica["histograma"][tramo] = metrica["histograma"].get(tramo, 0) + 1
+
+
+def medir(nombre: Optional[str] = None) -> Callable:
+    """
+    Decorador que registra la latencia y la cantidad de llamadas de una función.
+    
+    Args:
+        nombre (Optional[str]): Nombre de la métrica (por defecto módulo.función).
+        
+    Returns:
+        Callable: Decorador a aplicar sobre la función.
+    """
+    def decorador(funcion: Callable) -> Callable:
+        etiqueta = nombre or f"{funcion.__module__}.{funcion.__qualname__}"
+        
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _ACTIVO:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _registrar(etiqueta, time.perf_counter() - inicio)
+        
+        return envoltura
+    
+    return decorador
+
+
+@contextmanager
+def cronometro(nombre: str) -> Iterator[None]:
+    """
+    Administrador de contexto que mide la duración de un bloque de código.
+    
+    Args:
+        nombre (str): Nombre de la métrica.
+    """
+    if not _ACTIVO:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registrar(nombre, time.perf_counter() - inicio)
+
+
+def contar(nombre: str, cantidad: int = 1) -> None:
+    """
+    Incrementa un contador de eventos.
+    
+    Args:
+        nombre (str): Nombre del contador.
+        cantidad (int): Valor a sumar.
+    """
+    if not _ACTIVO:
+        return
+    with _BLOQUEO:
+        _CONTADORES[nombre] = _CONTADORES.get(nombre, 0) + cantidad
+
+
+def _percentil(histograma: Dict[int, int], llamadas: int, percentil: float) -> int:
+    """
+    Estima un percentil a partir del histograma (límite superior del tramo).
+    
+    Args:
+        histograma (Dict[int, int]): Tramo -> cantidad de llamadas.
+        llamadas (int): Total de llamadas.
+        percentil (float): Percentil buscado (0-100).
+        
+    Returns:
+        int: Latencia estimada en microsegundos.
+    """
+    objetivo = llamadas * percentil / 100
+    acumulado = 0
+    for tramo in sorted(histograma):
+        acumulado += histograma[tramo]
+        if acumulado >= objetivo:
+            return (1 << tramo) - 1 if tramo else 0
+    return 0
+
+
+def obtener_metricas() -> Dict[str, Any]:
+    """
+    Retorna un resumen de todas las métricas registradas.
+    
+    Returns:
+        Dict[str, Any]: Claves "activo", "latencias" (por función: llamadas,
+        total, promedio, mínimo, máximo, p50, p99 e histograma) y "contadores".
+    """
+    with _BLOQUEO:
+        latencias = {}
+        for nombre, metrica in sorted(_METRICAS.items()):
+            llamadas = metrica["llamadas"]
+            latencias[nombre] = {
+                "llamadas": llamadas,
+                "total_ms": round(metrica["total_s"] * 1000, 3),
+                "promedio_us": round(metrica["total_s"] * 1e6 / llamadas, 1),
+                "min_us": metrica["min_us"],
+                "max_us": metrica["max_us"],
+                "p50_us": _percentil(metrica["histograma"], llamadas, 50),
+                "p99_us": _percentil(metrica["histograma"], llamadas, 99),
+                "histograma_us": {
+                    f"<{1 << tramo}": cantidad
+                    for tramo, cantidad in sorted(metrica["histograma"].items())
+                }
+            }
+        return {
+            "activo": _ACTIVO,
+            "latencias": latencias,
+            "contadores": dict(sorted(_CONTADORES.items()))
+        }
+
+
+def reiniciar_metricas() -> None:
+    """
+    Borra todas las métricas y contadores registrados.
+    """
+    with _BLOQUEO:
+        _METRICAS.clear()
+        _CONTADORES.clear()
+
+
+def volcar_json(ruta: str) -> None:
+    """
+    Guarda el resumen de métricas en un archivo JSON.
+    
+    Args:
+        ruta (str): Ruta del archivo de salida.
+    """
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(obtener_metricas(), f, indent=4, ensure_ascii=False)
+
+
+# Activación desde el entorno: se mide desde el arranque y se vuelca al salir
+if os.environ.get(VARIABLE_VOLCADO):
+    activar()
+    atexit.register(volcar_json, os.environ[VARIABLE_VOLCADO])
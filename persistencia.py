@@ -0,0 +1,737 @@
+"""
+Módulo de persistencia para el Sistema de Gestión de Proyectos.
+Guarda cada cambio en un diario de solo anexado (database.journal) y
+consolida periódicamente el diario en una instantánea (database.json).
+La secuencia de IDs compartida entre procesos (database.ids) y el archivo
+de proyectos finalizados (database.archivo.jsonl.gz) se guardan junto a la
+instantánea.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from derivados import sin_derivados
+from metricas import contar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Rutas por defecto, en el directorio del proyecto
+RUTA_BASE_DATOS = Path(__file__).parent / "database.json"
+RUTA_DIARIO = Path(__file__).parent / "database.journal"
+
+# Caracteres que se leen del archivo por vez al recorrer una instantánea
+CARACTERES_POR_LECTURA = 1 << 20
+
+# Espacios en blanco permitidos entre los elementos de un documento JSON
+_ESPACIOS = re.compile(r"[ \t\n\r]*")
+
+# Parámetros del commit agrupado: se hace fsync cada N registros
+# o cuando pasa el intervalo indicado desde el último fsync
+REGISTROS_POR_FSYNC = 64
+INTERVALO_FSYNC = 0.5
+
+# IDs que reserva cada proceso de una vez al asignarlos de a uno
+IDS_POR_BLOQUE = 64
+
+
+def deserializar_proyecto(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte un proyecto leído de JSON al formato en memoria.
+    JSON no tiene tuplas, así que la prioridad llega como lista.
+    
+    Args:
+        datos (Dict[str, Any]): Proyecto tal como se leyó del archivo.
+        
+    Returns:
+        Dict[str, Any]: Proyecto con la prioridad como tupla (nombre, nivel).
+    """
+    prioridad = datos.get("prioridad")
+    if isinstance(prioridad, list):
+        datos["prioridad"] = tuple(prioridad)
+    return datos
+
+
+class Diario:
+    """
+    Diario de solo anexado en formato JSON Lines (un registro por línea).
+    Agrupa las escrituras y sincroniza a disco en lotes (commit agrupado),
+    de modo que cada alta cuesta O(1) en lugar de reescribir la base completa.
+    
+    Varios procesos pueden anexar al mismo diario: cada uno escribe sus
+    registros con el archivo bloqueado en modo compartido, y la compactación
+    lo bloquea en modo exclusivo (ver exclusivo()) para que ningún registro
+    llegue entre la lectura del final del diario y su vaciado.
+    """
+    
+    def __init__(self, ruta: Path = RUTA_DIARIO,
+                 registros_por_fsync: int = REGISTROS_POR_FSYNC,
+                 intervalo_fsync: float = INTERVALO_FSYNC):
+        """
+        Abre (o crea) el archivo del diario en modo anexado.
+        
+        Args:
+            ruta (Path): Ruta del archivo del diario.
+            registros_por_fsync (int): Registros pendientes que fuerzan un fsync.
+            intervalo_fsync (float): Segundos máximos entre dos fsync.
+        """
+        self.ruta = Path(ruta)
+        self.registros_por_fsync = registros_por_fsync
+        self.intervalo_fsync = intervalo_fsync
+        self._archivo = open(self.ruta, "ab")
+        # Registros anotados que todavía no se escribieron en el archivo
+        self._pendientes: List[bytes] = []
+        self._ultimo_fsync = time.monotonic()
+        self._exclusivo = False
+    
+    def registrar(self, operacion: str, datos: Dict[str, Any]) -> None:
+        """
+        Anota un registro en el diario y sincroniza si se completó el lote.
+        
+        Args:
+            operacion (str): Tipo de operación (por ejemplo "alta").
+            datos (Dict[str, Any]): Contenido del registro.
+        """
+        registro = {"op": operacion, **datos}
+        self._pendientes.append((json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8"))
+        
+        if (len(self._pendientes) >= self.registros_por_fsync
+                or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync):
+            self.sincronizar()
+    
+    def sincronizar(self) -> None:
+        """
+        Escribe los registros pendientes, con el archivo bloqueado en modo
+        compartido, y fuerza su escritura física.
+        """
+        if self._archivo.closed or not self._pendientes:
+            return
+        datos = b"".join(self._pendientes)
+        descriptor = self._archivo.fileno()
+        if not self._exclusivo:
+            _bloquear_archivo(descriptor, compartido=True)
+        try:
+            self._archivo.write(datos)
+            self._archivo.flush()
+            os.fsync(descriptor)
+        finally:
+            if not self._exclusivo:
+                _bloquear_archivo(descriptor, False)
+        contar("persistencia.fsync")
+        self._pendientes = []
+        self._ultimo_fsync = time.monotonic()
+    
+    @contextmanager
+    def exclusivo(self) -> Iterator[None]:
+        """
+        Bloquea el diario en modo exclusivo: mientras dura, ningún otro
+        proceso anexa registros. Los pendientes de este proceso se escriben
+        al entrar.
+        """
+        descriptor = self._archivo.fileno()
+        _bloquear_archivo(descriptor)
+        self._exclusivo = True
+        try:
+            self.sincronizar()
+            yield
+        finally:
+            self._exclusivo = False
+            _bloquear_archivo(descriptor, False)
+    
+    def truncar(self) -> None:
+        """
+        Vacía el diario después de consolidarlo en una instantánea. Debe
+        llamarse dentro de exclusivo() si otros procesos comparten el diario.
+        """
+        self.sincronizar()
+        self._archivo.truncate(0)
+        self._archivo.seek(0)
+    
+    def cerrar(self) -> None:
+        """
+        Sincroniza los registros pendientes y cierra el archivo.
+        """
+        if not self._archivo.closed:
+            self.sincronizar()
+            self._archivo.close()
+
+
+def ruta_secuencia(ruta_base: Path = RUTA_BASE_DATOS) -> Path:
+    """
+    Ruta del archivo de la secuencia de IDs que acompaña a una instantánea.
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        
+    Returns:
+        Path: Misma ruta con extensión .ids (database.ids).
+    """
+    return Path(ruta_base).with_suffix(".ids")
+
+
+def ruta_archivo(ruta_base: Path = RUTA_BASE_DATOS) -> Path:
+    """
+    Ruta del archivo comprimido de proyectos finalizados (ver archivo.py)
+    que acompaña a una instantánea.
+    
+    Args:
+        ruta_base (Path): Ruta de la instantánea.
+        
+    Returns:
+        Path: database.archivo.jsonl.gz en el directorio de la instantánea.
+    """
+    ruta_base = Path(ruta_base)
+    return ruta_base.with_name(ruta_base.stem + ".archivo.jsonl.gz")
+
+
+def _bloquear_archivo(descriptor: int, bloquear: bool = True, compartido: bool = False) -> None:
+    """
+    Toma o libera el bloqueo de un archivo entre procesos; si otro proceso
+    tiene un bloqueo incompatible, espera a que lo libere.
+    
+    Args:
+        descriptor (int): Descriptor del archivo abierto.
+        bloquear (bool): True para tomar el bloqueo, False para liberarlo.
+        compartido (bool): True para un bloqueo compartido (varios procesos
+            a la vez, pero ninguno exclusivo); en Windows es exclusivo.
+    """
+    if fcntl is not None:
+        if not bloquear:
+            fcntl.flock(descriptor, fcntl.LOCK_UN)
+        else:
+            fcntl.flock(descriptor, fcntl.LOCK_SH if compartido else fcntl.LOCK_EX)
+    else:
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(descriptor, msvcrt.LK_LOCK if bloquear else msvcrt.LK_UNLCK, 1)
+
+
+class SecuenciaIds:
+    """
+    Asigna IDs de proyecto sin repetirlos entre procesos ni entre hilos.
+    El archivo de la secuencia guarda el primer ID que nadie reservó; cada
+    proceso reserva con el archivo bloqueado un bloque de IDs consecutivos y
+    después los entrega desde memoria, así que las altas no consultan el
+    archivo ni el almacén por cada proyecto.
+    
+    Los bloques empiezan de un ID y se duplican hasta ids_por_bloque, de modo
+    que la reserva acompaña a la cantidad de altas: una ejecución de la CLI
+    que agrega un proyecto reserva uno solo. Al cerrar, liberar() devuelve
+    lo que quedó sin usar si ningún proceso reservó después; si no, esos IDs
+    quedan como huecos en la numeración.
+    
+    Sin ruta la secuencia vive solo en memoria (almacén sin persistencia).
+    """
+    
+    def __init__(self, ruta: Optional[Path], minimo: int = 1, ids_por_bloque: int = IDS_POR_BLOQUE):
+        """
+        Abre la secuencia y la adelanta hasta el mínimo si quedó por detrás
+        (archivo nuevo, dañado o una instantánea restaurada con IDs mayores).
+        
+        Args:
+            ruta (Optional[Path]): Archivo de la secuencia; None para no persistirla.
+            minimo (int): Primer ID libre según el almacén.
+            ids_por_bloque (int): Tamaño máximo de los bloques de siguiente().
+        """
+        self.ruta = None if ruta is None else Path(ruta)
+        self.ids_por_bloque = ids_por_bloque
+        self._bloqueo = threading.Lock()
+        # Bloque propio [_proximo, _limite), tamaño del próximo bloque y
+        # primer ID no reservado visto en el archivo
+        self._proximo = self._limite = 0
+        self._tamano_bloque = 1
+        self._reservado = 0
+        with self._bloqueo:
+            self._reservar_en_archivo(0, minimo)
+    
+    def _leer(self, descriptor: int) -> int:
+        """
+        Lee el valor del archivo de la secuencia (0 si está vacío o dañado:
+        el mínimo que da el almacén es suficiente).
+        
+        Args:
+            descriptor (int): Descriptor del archivo, ya bloqueado.
+            
+        Returns:
+            int: Primer ID no reservado según el archivo.
+        """
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        try:
+            return int(os.read(descriptor, 32) or 0)
+        except ValueError:
+            return 0
+    
+    def _escribir(self, descriptor: int, valor: int) -> None:
+        """
+        Reemplaza el valor del archivo de la secuencia y lo sincroniza.
+        
+        Args:
+            descriptor (int): Descriptor del archivo, ya bloqueado.
+            valor (int): Primer ID no reservado.
+        """
+        datos = f"{valor}\n".encode("ascii")
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        os.write(descriptor, datos)
+        os.ftruncate(descriptor, len(datos))
+        os.fsync(descriptor)
+    
+    def _reservar_en_archivo(self, cantidad: int, minimo: int) -> int:
+        """
+        Reserva IDs consecutivos en el archivo de la secuencia, con el archivo
+        bloqueado para que otro proceso no reserve los mismos. Debe llamarse
+        con el bloqueo de la instancia tomado.
+        
+        Args:
+            cantidad (int): IDs a reservar (0 solo adelanta la secuencia).
+            minimo (int): Primer ID aceptable para la reserva.
+            
+        Returns:
+            int: Primer ID reservado.
+        """
+        if self.ruta is None:
+            inicio = max(self._reservado, minimo)
+        else:
+            descriptor = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _bloquear_archivo(descriptor)
+                leido = self._leer(descriptor)
+                inicio = max(leido, minimo)
+                if inicio + cantidad != leido:
+                    self._escribir(descriptor, inicio + cantidad)
+                    contar("persistencia.reservas_ids")
+                _bloquear_archivo(descriptor, False)
+            finally:
+                os.close(descriptor)
+        self._reservado = inicio + cantidad
+        return inicio
+    
+    def _reservar_bloque(self, minimo: int) -> None:
+        """
+        Reserva el próximo bloque propio, duplicando el tamaño del anterior
+        hasta ids_por_bloque. Debe llamarse con el bloqueo de la instancia tomado.
+        
+        Args:
+            minimo (int): Primer ID aceptable para el bloque.
+        """
+        tamano = self._tamano_bloque
+        self._tamano_bloque = min(tamano * 2, self.ids_por_bloque)
+        self._proximo = self._reservar_en_archivo(tamano, minimo)
+        self._limite = self._proximo + tamano
+    
+    def siguiente(self) -> int:
+        """
+        Entrega el próximo ID del bloque propio, reservando otro bloque
+        cuando se agota.
+        
+        Returns:
+            int: ID para un proyecto nuevo.
+        """
+        with self._bloqueo:
+            if self._proximo >= self._limite:
+                self._reservar_bloque(0)
+            id_proyecto = self._proximo
+            self._proximo += 1
+            return id_proyecto
+    
+    def reservar(self, cantidad: int, minimo: int = 0) -> range:
+        """
+        Reserva de una vez un rango de IDs consecutivos, por ejemplo para un
+        lote de importación.
+        
+        Args:
+            cantidad (int): IDs a reservar.
+            minimo (int): Primer ID aceptable (por ejemplo, por encima de los
+                IDs explícitos del lote).
+                
+        Returns:
+            range: IDs reservados, de uso exclusivo de quien los pidió.
+        """
+        if cantidad <= 0:
+            return range(0)
+        with self._bloqueo:
+            inicio = self._reservar_en_archivo(cantidad, minimo)
+            return range(inicio, inicio + cantidad)
+    
+    def registrar(self, id_proyecto: int) -> None:
+        """
+        Informa un ID usado en un alta. Los IDs que salieron de alguna
+        reserva no cuestan más que una comparación; un ID explícito por
+        encima de todo lo reservado adelanta la secuencia para que nadie lo
+        vuelva a entregar, tomando como bloque propio los IDs que le siguen:
+        así una serie de IDs explícitos consecutivos (un CSV con IDs) escribe
+        el archivo una vez por bloque.
+        
+        Args:
+            id_proyecto (int): ID del proyecto agregado.
+        """
+        with self._bloqueo:
+            if id_proyecto >= self._reservado:
+                # Quizás lo reservó otro proceso: basta con releer el archivo
+                self._reservar_en_archivo(0, 0)
+                if id_proyecto >= self._reservado:
+                    self._reservar_bloque(id_proyecto + 1)
+            if self._proximo <= id_proyecto < self._limite:
+                self._proximo = id_proyecto + 1
+    
+    def liberar(self) -> None:
+        """
+        Devuelve a la secuencia los IDs del bloque propio que no se usaron,
+        siempre que ningún proceso haya reservado después (el archivo sigue
+        en el final del bloque). Se llama al cerrar la persistencia.
+        """
+        with self._bloqueo:
+            if self.ruta is None or self._proximo >= self._limite:
+                return
+            descriptor = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _bloquear_archivo(descriptor)
+                if self._leer(descriptor) == self._limite:
+                    self._escribir(descriptor, self._proximo)
+                    contar("persistencia.ids_liberados", self._limite - self._proximo)
+                _bloquear_archivo(descriptor, False)
+            finally:
+                os.close(descriptor)
+            self._limite = self._proximo
+
+
+def leer_instantanea(ruta: Path = RUTA_BASE_DATOS) -> Optional[Dict[str, Any]]:
+    """
+    Lee la instantánea completa de la base de datos.
+    
+    Args:
+        ruta (Path): Ruta del archivo database.json.
+        
+    Returns:
+        Optional[Dict[str, Any]]: Contenido del archivo, o None si no existe.
+    """
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return None
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LectorInstantanea:
+    """
+    Lector incremental de database.json. Lee el archivo por bloques y
+    decodifica el arreglo "proyectos" de a un elemento, de modo que la
+    memoria usada no depende del tamaño del archivo y los proyectos pueden
+    indexarse a medida que llegan.
+    
+    Los objetos "usuarios" y "metadata" que aparecen antes de "proyectos"
+    quedan disponibles al crear el lector (las instantáneas nuevas escriben
+    primero los metadatos, así que total_proyectos se conoce de entrada);
+    los que aparecen después, al terminar de recorrer proyectos().
+    """
+    
+    def __init__(self, ruta: Path = RUTA_BASE_DATOS):
+        """
+        Abre la instantánea y lee el documento hasta el inicio de los proyectos.
+        
+        Args:
+            ruta (Path): Ruta del archivo database.json.
+            
+        Raises:
+            OSError: Si el archivo no se puede abrir.
+            json.JSONDecodeError: Si el documento no es un objeto JSON válido.
+        """
+        self.usuarios: Dict[str, str] = {}
+        self.metadata: Dict[str, Any] = {}
+        self._archivo = open(ruta, "r", encoding="utf-8")
+        self._decodificador = json.JSONDecoder()
+        self._bufer = ""
+        self._posicion = 0
+        self._agotado = False
+        self._sin_lote = False
+        self._claves = 0
+        self._terminado = False
+        try:
+            self._esperar("{")
+            self._hay_proyectos = self._leer_hasta_proyectos()
+        except BaseException:
+            self.cerrar()
+            raise
+    
+    def __enter__(self) -> "LectorInstantanea":
+        return self
+    
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+    
+    @property
+    def total(self) -> Optional[int]:
+        """
+        Cantidad de proyectos anunciada en metadata.total_proyectos.
+        
+        Returns:
+            Optional[int]: Total anunciado, o None si todavía no se leyó.
+        """
+        total = self.metadata.get("total_proyectos")
+        return total if isinstance(total, int) else None
+    
+    def proyectos(self) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre los proyectos en el orden del archivo. Al terminar lee el
+        resto del documento y cierra el archivo.
+        
+        Yields:
+            Dict[str, Any]: Cada proyecto con la prioridad como tupla.
+            
+        Raises:
+            json.JSONDecodeError: Si el documento está incompleto o mal formado.
+        """
+        if self._hay_proyectos:
+            self._hay_proyectos = False
+            self._esperar("[")
+            if self._siguiente() == "]":
+                self._posicion += 1
+            else:
+                while True:
+                    # Camino rápido: los proyectos completos del búfer se
+                    # decodifican juntos; si no hay un corte válido, de a uno
+                    for proyecto in self._lote() or (self._valor(),):
+                        yield deserializar_proyecto(proyecto)
+                    if self._esperar(",]") == "]":
+                        break
+        # Una clave "proyectos" repetida se decodifica y se descarta
+        while self._leer_hasta_proyectos():
+            self._valor()
+        self.cerrar()
+    
+    def cerrar(self) -> None:
+        """
+        Cierra el archivo.
+        """
+        self._archivo.close()
+    
+    def _cargar(self) -> bool:
+        """
+        Descarta lo ya decodificado del búfer y agrega el siguiente bloque.
+        
+        Returns:
+            bool: False si el archivo ya no tiene más contenido.
+        """
+        if self._agotado:
+            return False
+        bloque = self._archivo.read(CARACTERES_POR_LECTURA)
+        self._bufer = self._bufer[self._posicion:] + bloque
+        self._posicion = 0
+        self._agotado = not bloque
+        self._sin_lote = False
+        return bool(bloque)
+    
+    def _lote(self) -> List[Any]:
+        """
+        Decodifica de una vez los elementos completos que quedan en el búfer.
+        El corte se busca en el último "}," y se valida decodificando
+        "[" + tramo + "]", que solo es un arreglo válido si el tramo termina
+        justo al final de un elemento: un corte dentro de un texto o de un
+        objeto anidado produce un error. Como json.load, json.loads comparte
+        un solo objeto por cada nombre de campo repetido dentro del lote.
+        
+        Returns:
+            List[Any]: Elementos decodificados, o vacía si no hay un corte válido.
+        """
+        if self._sin_lote:
+            return []
+        corte = self._bufer.rfind("},", self._posicion)
+        try:
+            if corte < 0:
+                raise ValueError
+            lote = json.loads("[" + self._bufer[self._posicion:corte + 1] + "]")
+        except ValueError:
+            # No se reintenta hasta leer el bloque siguiente
+            self._sin_lote = True
+            return []
+        self._posicion = corte + 1
+        return lote
+    
+    def _siguiente(self) -> str:
+        """
+        Salta los espacios en blanco y retorna el próximo carácter sin consumirlo.
+        
+        Returns:
+            str: Próximo carácter, o "" al final del archivo.
+        """
+        while True:
+            self._posicion = _ESPACIOS.match(self._bufer, self._posicion).end()
+            if self._posicion < len(self._bufer):
+                return self._bufer[self._posicion]
+            if not self._cargar():
+                return ""
+    
+    def _esperar(self, permitidos: str) -> str:
+        """
+        Consume el próximo carácter, que debe ser uno de los permitidos.
+        
+        Args:
+            permitidos (str): Caracteres válidos en esta posición.
+            
+        Returns:
+            str: Carácter consumido.
+            
+        Raises:
+            json.JSONDecodeError: Si aparece otro carácter.
+        """
+        caracter = self._siguiente()
+        if not caracter or caracter not in permitidos:
+            raise json.JSONDecodeError(f"Se esperaba {' o '.join(permitidos)}", self._bufer, self._posicion)
+        self._posicion += 1
+        return caracter
+    
+    def _valor(self) -> Any:
+        """
+        Decodifica el próximo valor JSON, leyendo más bloques si el valor
+        queda cortado al final del búfer.
+        
+        Returns:
+            Any: Valor decodificado.
+            
+        Raises:
+            json.JSONDecodeError: Si el valor es inválido.
+        """
+        if self._posicion >= len(self._bufer) or self._bufer[self._posicion] in " \t\n\r":
+            self._siguiente()
+        while True:
+            try:
+                valor, fin = self._decodificador.raw_decode(self._bufer, self._posicion)
+            except json.JSONDecodeError:
+                if self._cargar():
+                    continue
+                raise
+            # Un número al final del búfer puede continuar en el bloque siguiente
+            if fin == len(self._bufer) and self._cargar():
+                continue
+            self._posicion = fin
+            return valor
+    
+    def _leer_hasta_proyectos(self) -> bool:
+        """
+        Lee los pares clave-valor del objeto principal hasta encontrar la
+        clave "proyectos" o el cierre del objeto.
+        
+        Returns:
+            bool: True si el lector quedó al comienzo del arreglo de proyectos.
+        """
+        while not self._terminado:
+            if self._claves:
+                self._terminado = self._esperar(",}") == "}"
+            elif self._siguiente() == "}":
+                self._posicion += 1
+                self._terminado = True
+            if self._terminado:
+                return False
+            clave = self._valor()
+            self._esperar(":")
+            self._claves += 1
+            if clave == "proyectos":
+                return True
+            valor = self._valor()
+            if clave == "usuarios":
+                self.usuarios = valor
+            elif clave == "metadata":
+                self.metadata = valor
+        return False
+
+
+def leer_diario(ruta: Path = RUTA_DIARIO) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los registros del diario en orden.
+    Una última línea incompleta (escritura interrumpida) se descarta.
+    
+    Args:
+        ruta (Path): Ruta del archivo del diario.
+        
+    Yields:
+        Dict[str, Any]: Cada registro con su clave "op".
+    """
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                # Solo puede ocurrir en la última línea tras una caída
+                break
+
+
+def leer_diario_desde(ruta: Path, posicion: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Lee los registros completos anexados al diario a partir de una posición
+    (en bytes). Una línea todavía incompleta queda para la próxima lectura.
+    
+    Args:
+        ruta (Path): Ruta del archivo del diario.
+        posicion (int): Posición desde la que leer.
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: Registros leídos y posición siguiente
+        a la última línea completa.
+    """
+    ruta = Path(ruta)
+    if not ruta.exists():
+        return [], posicion
+    with open(ruta, "rb") as f:
+        f.seek(posicion)
+        datos = f.read()
+    fin = datos.rfind(b"\n") + 1
+    registros = [json.loads(linea) for linea in datos[:fin].splitlines() if linea.strip()]
+    return registros, posicion + fin
+
+
+def escribir_instantanea(proyectos: Iterable[Dict[str, Any]],
+                         usuarios: Dict[str, str],
+                         ruta: Path = RUTA_BASE_DATOS,
+                         metadata: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Escribe una instantánea nueva de forma atómica: primero en un archivo
+    temporal sincronizado a disco y luego lo renombra sobre el original.
+    
+    Args:
+        proyectos (Iterable[Dict[str, Any]]): Proyectos a guardar.
+        usuarios (Dict[str, str]): Usuarios a guardar.
+        ruta (Path): Ruta del archivo database.json.
+        metadata (Optional[Dict[str, Any]]): Metadatos previos a conservar.
+        
+    Returns:
+        int: Cantidad de proyectos escritos.
+    """
+    ruta = Path(ruta)
+    lista_proyectos = [sin_derivados(proyecto) for proyecto in proyectos]
+    metadata = dict(metadata or {})
+    metadata.setdefault("version", "1.0.0")
+    metadata.setdefault("fecha_creacion", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    metadata["fecha_compactacion"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    metadata["total_proyectos"] = len(lista_proyectos)
+    metadata["total_usuarios"] = len(usuarios)
+    
+    # Los metadatos van primero para que LectorInstantanea conozca el total
+    # de proyectos antes de empezar a leerlos
+    database = {
+        "metadata": metadata,
+        "usuarios": usuarios,
+        "proyectos": lista_proyectos
+    }
+    
+    ruta_temporal = ruta.with_name(ruta.name + ".tmp")
+    with open(ruta_temporal, "w", encoding="utf-8") as f:
+        json.dump(database, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ruta_temporal, ruta)
+    
+    return len(lista_proyectos)
@@ -0,0 +1,116 @@
+"""
+Representación compacta de proyectos para el Sistema de Gestión de Proyectos.
+Cada proyecto se guarda en un objeto con __slots__ en lugar de un diccionario,
+y los valores repetidos (estado, cliente, prioridad) se comparten entre registros.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+
+# Campos con almacenamiento propio, en el orden en que se exponen
+CAMPOS = (
+    "id",
+    "nombre",
+    "cliente",
+    "estado",
+    "horas_estimadas",
+    "tareas_completadas",
+    "prioridad",
+    "fecha_inicio",
+    "fecha_fin",
+    "fecha_actualizacion",
+    "avance"
+)
+
+# Catálogos de valores categóricos: cada valor distinto existe una sola vez
+# en memoria y todos los registros apuntan al mismo objeto
+_CATEGORIAS: Dict[str, str] = {}
+_PRIORIDADES: Dict[Tuple[str, int], Tuple[str, int]] = {}
+
+
+def _categoria(valor: Any) -> Any:
+    """
+    Retorna la instancia compartida de un valor categórico de texto.
+    
+    Args:
+        valor (Any): Valor a codificar (estado, cliente o fecha).
+        
+    Returns:
+        Any: El objeto canónico para ese valor.
+    """
+    if not isinstance(valor, str):
+        return valor
+    return _CATEGORIAS.setdefault(valor, valor)
+
+
+def _prioridad(valor: Any) -> Any:
+    """
+    Retorna la tupla de prioridad compartida equivalente al valor dado.
+    
+    Args:
+        valor (Any): Prioridad como tupla o lista (nombre, nivel).
+        
+    Returns:
+        Any: Tupla canónica (nombre, nivel), o el valor original si es None.
+    """
+    if valor is None:
+        return None
+    clave = tuple(valor)
+    return _PRIORIDADES.setdefault(clave, clave)
+
+
+class ProyectoCompacto(Mapping):
+    """
+    Registro de proyecto con __slots__ que se comporta como un diccionario
+    (get, [], keys, items, dict(...)), de modo que reportes y demás
+    consumidores lo usan sin cambios. Los campos con valor None se
+    consideran ausentes, igual que una clave que no está en el diccionario.
+    """
+    
+    __slots__ = CAMPOS + ("_extra",)
+    
+    def __init__(self, datos: Dict[str, Any]):
+        """
+        Construye el registro a partir de un diccionario de proyecto.
+        
+        Args:
+            datos (Dict[str, Any]): Proyecto en formato diccionario.
+        """
+        for campo in CAMPOS:
+            self[campo] = datos.get(campo)
+        extra = {clave: valor for clave, valor in datos.items() if clave not in CAMPOS}
+        self._extra = extra or None
+    
+    def __getitem__(self, clave: str) -> Any:
+        if clave in CAMPOS:
+            valor = getattr(self, clave)
+            if valor is not None:
+                return valor
+        elif self._extra and clave in self._extra:
+            return self._extra[clave]
+        raise KeyError(clave)
+    
+    def __setitem__(self, clave: str, valor: Any) -> None:
+        if clave in ("cliente", "estado", "fecha_inicio", "fecha_fin", "fecha_actualizacion"):
+            valor = _categoria(valor)
+        elif clave == "prioridad":
+            valor = _prioridad(valor)
+        elif clave not in CAMPOS:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[clave] = valor
+            return
+        setattr(self, clave, valor)
+    
+    def __iter__(self) -> Iterator[str]:
+        for campo in CAMPOS:
+            if getattr(self, campo) is not None:
+                yield campo
+        if self._extra:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"ProyectoCompacto({dict(self)!r})"
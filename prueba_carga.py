@@ -0,0 +1,292 @@
+"""
+Prueba de carga del servicio HTTP/JSON (servidor.py).
+Levanta el servidor en un proceso aparte sobre una base sintética temporal
+(o usa uno ya iniciado con --url), lanza varios clientes concurrentes con
+conexiones persistentes y mide pedidos por segundo y latencias.
+
+Uso:
+    python prueba_carga.py                            # 8 clientes, 10 s, 10.000 proyectos
+    python prueba_carga.py --clientes 16 --duracion 30 --escrituras 0.2
+    python prueba_carga.py --motor sqlite
+    python prueba_carga.py --url http://127.0.0.1:8080
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from restore_database import crear_base_datos_json
+from utils import ESTADOS_VALIDOS
+
+# Credenciales con las que se autentican los clientes
+USUARIO = "admin"
+CONTRASENA = "1234"
+
+# Tiempo máximo de espera para que el servidor empiece a aceptar conexiones
+ESPERA_ARRANQUE = 30.0
+
+
+def _puerto_libre() -> int:
+    """
+    Pide al sistema operativo un puerto TCP libre.
+    
+    Returns:
+        int: Número de puerto.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _esperar_servidor(host: str, puerto: int, proceso: subprocess.Popen) -> None:
+    """
+    Espera a que el servidor acepte conexiones.
+    
+    Args:
+        host (str): Dirección del servidor.
+        puerto (int): Puerto del servidor.
+        proceso (subprocess.Popen): Proceso del servidor.
+        
+    Raises:
+        RuntimeError: Si el proceso termina o no responde a tiempo.
+    """
+    limite = time.monotonic() + ESPERA_ARRANQUE
+    while time.monotonic() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError("el servidor terminó antes de aceptar conexiones")
+        try:
+            socket.create_connection((host, puerto), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("el servidor no respondió a tiempo")
+
+
+def _percentil(latencias: List[float], percentil: float) -> float:
+    """
+    Calcula un percentil exacto sobre latencias ya ordenadas.
+    
+    Args:
+        latencias (List[float]): Latencias ordenadas de menor a mayor.
+        percentil (float): Percentil buscado (0-100).
+        
+    Returns:
+        float: Latencia del percentil.
+    """
+    if not latencias:
+        return 0.0
+    posicion = min(len(latencias) - 1, int(len(latencias) * percentil / 100))
+    return latencias[posicion]
+
+
+class Cliente(threading.Thread):
+    """
+    Cliente que repite pedidos sobre una conexión persistente hasta el final
+    de la prueba. La mezcla es: alta (según la fracción de escrituras) y, en
+    el resto, búsqueda por ID, listado filtrado por estado o reporte.
+    """
+    
+    def __init__(self, host: str, puerto: int, fin: float, escrituras: float,
+                 max_id: int, semilla: int):
+        super().__init__(daemon=True)
+        self.host = host
+        self.puerto = puerto
+        self.fin = fin
+        self.escrituras = escrituras
+        self.max_id = max_id
+        self.aleatorio = random.Random(semilla)
+        self.latencias: List[float] = []
+        self.errores: Dict[Any, int] = {}
+        autorizacion = base64.b64encode(f"{USUARIO}:{CONTRASENA}".encode()).decode()
+        self.encabezados = {"Authorization": f"Basic {autorizacion}"}
+    
+    def _pedido(self) -> tuple:
+        """
+        Elige el próximo pedido de la mezcla.
+        
+        Returns:
+            tuple: (método, ruta, cuerpo o None).
+        """
+        eleccion = self.aleatorio.random()
+        if eleccion < self.escrituras:
+            cuerpo = json.dumps({
+                "nombre": "Carga",
+                "cliente": f"Cliente {self.aleatorio.randint(1, 50)}",
+                "estado": "Pendiente",
+                "horas_estimadas": self.aleatorio.randint(10, 200),
+                "prioridad": "Media"
+            })
+            return "POST", "/proyectos", cuerpo
+        eleccion = self.aleatorio.random()
+        if eleccion < 0.6:
+            return "GET", f"/proyectos/{self.aleatorio.randint(1, self.max_id)}", None
+        if eleccion < 0.9:
+            estado = self.aleatorio.choice(sorted(ESTADOS_VALIDOS))
+            return "GET", f"/proyectos?estado={estado.replace(' ', '+')}&limite=20", None
+        return "GET", "/reporte", None
+    
+    def run(self) -> None:
+        conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=30)
+        try:
+            while time.perf_counter() < self.fin:
+                metodo, ruta, cuerpo = self._pedido()
+                encabezados = dict(self.encabezados)
+                if cuerpo is not None:
+                    encabezados["Content-Type"] = "application/json"
+                inicio = time.perf_counter()
+                try:
+                    conexion.request(metodo, ruta, body=cuerpo, headers=encabezados)
+                    respuesta = conexion.getresponse()
+                    respuesta.read()
+                    estado = respuesta.status
+                except (OSError, http.client.HTTPException) as e:
+                    estado = type(e).__name__
+                    conexion.close()
+                    conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=30)
+                self.latencias.append(time.perf_counter() - inicio)
+                if estado not in (200, 201):
+                    self.errores[estado] = self.errores.get(estado, 0) + 1
+        finally:
+            conexion.close()
+
+
+def ejecutar_prueba(host: str, puerto: int, clientes: int, duracion: float,
+                    escrituras: float, max_id: int, semilla: int) -> Dict[str, Any]:
+    """
+    Lanza los clientes concurrentes y resume los resultados.
+    
+    Args:
+        host (str): Dirección del servidor.
+        puerto (int): Puerto del servidor.
+        clientes (int): Cantidad de clientes simultáneos.
+        duracion (float): Segundos de prueba.
+        escrituras (float): Fracción de pedidos que son altas (0-1).
+        max_id (int): Mayor ID consultado en las búsquedas por ID.
+        semilla (int): Semilla de la mezcla de pedidos.
+        
+    Returns:
+        Dict[str, Any]: Pedidos, pedidos por segundo, latencias (ms) y errores.
+    """
+    inicio = time.perf_counter()
+    hilos = [
+        Cliente(host, puerto, inicio + duracion, escrituras, max_id, semilla + numero)
+        for numero in range(clientes)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    
+    latencias = sorted(latencia for hilo in hilos for latencia in hilo.latencias)
+    errores: Dict[str, int] = {}
+    for hilo in hilos:
+        for estado, cantidad in hilo.errores.items():
+            errores[str(estado)] = errores.get(str(estado), 0) + cantidad
+    
+    return {
+        "pedidos": len(latencias),
+        "pedidos_por_segundo": len(latencias) / transcurrido,
+        "p50_ms": _percentil(latencias, 50) * 1000,
+        "p90_ms": _percentil(latencias, 90) * 1000,
+        "p99_ms": _percentil(latencias, 99) * 1000,
+        "max_ms": (latencias[-1] if latencias else 0.0) * 1000,
+        "errores": errores
+    }
+
+
+def mostrar_resultados(resultados: Dict[str, Any], clientes: int, duracion: float) -> None:
+    """
+    Muestra el resumen de la prueba de carga.
+    
+    Args:
+        resultados (Dict[str, Any]): Resultado de ejecutar_prueba().
+        clientes (int): Cantidad de clientes usados.
+        duracion (float): Segundos de prueba.
+    """
+    print("=" * 60)
+    print(f"{'PRUEBA DE CARGA':^60}")
+    print("=" * 60)
+    print(f"{'Clientes:':<30} {clientes:>15}")
+    print(f"{'Duración:':<30} {duracion:>13.1f} s")
+    print(f"{'Pedidos:':<30} {resultados['pedidos']:>15,}")
+    print(f"{'Pedidos por segundo:':<30} {resultados['pedidos_por_segundo']:>15,.1f}")
+    print(f"{'Latencia p50:':<30} {resultados['p50_ms']:>12.2f} ms")
+    print(f"{'Latencia p90:':<30} {resultados['p90_ms']:>12.2f} ms")
+    print(f"{'Latencia p99:':<30} {resultados['p99_ms']:>12.2f} ms")
+    print(f"{'Latencia máxima:':<30} {resultados['max_ms']:>12.2f} ms")
+    errores = resultados["errores"]
+    print(f"{'Errores:':<30} {sum(errores.values()):>15,}  {errores if errores else ''}")
+    print("=" * 60)
+
+
+def main(argumentos: List[str]) -> int:
+    """
+    Ejecuta la prueba de carga según los argumentos de línea de comandos.
+    
+    Args:
+        argumentos (List[str]): Argumentos (sin el nombre del programa).
+        
+    Returns:
+        int: 0 si todos los pedidos respondieron bien, 1 si hubo errores.
+    """
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio HTTP/JSON.")
+    parser.add_argument("--url", help="servidor ya iniciado (por defecto se levanta uno temporal)")
+    parser.add_argument("--proyectos", type=int, default=10_000,
+                        help="tamaño de la base sintética del servidor temporal")
+    parser.add_argument("--clientes", type=int, default=8)
+    parser.add_argument("--duracion", type=float, default=10.0, help="segundos")
+    parser.add_argument("--escrituras", type=float, default=0.1, help="fracción de altas (0-1)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--motor", choices=("memoria", "sqlite"), default="memoria",
+                        help="motor de almacenamiento del servidor temporal")
+    parser.add_argument("--json", action="store_true", help="imprime el resultado en JSON")
+    args = parser.parse_args(argumentos)
+    
+    proceso: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory() as directorio:
+        if args.url:
+            url = urlsplit(args.url)
+            host, puerto = url.hostname, url.port or 80
+        else:
+            host, puerto = "127.0.0.1", _puerto_libre()
+            ruta_base = Path(directorio) / "database.json"
+            crear_base_datos_json(max(0, args.proyectos - 3), args.semilla, ruta_base, mostrar_resumen=False)
+            proceso = subprocess.Popen(
+                [sys.executable, str(Path(__file__).parent / "servidor.py"),
+                 "--host", host, "--puerto", str(puerto),
+                 "--base-datos", str(ruta_base), "--diario", str(Path(directorio) / "database.journal"),
+                 "--motor", args.motor, "--sqlite", str(Path(directorio) / "database.sqlite")],
+                stdout=subprocess.DEVNULL
+            )
+        try:
+            if proceso is not None:
+                _esperar_servidor(host, puerto, proceso)
+            resultados = ejecutar_prueba(host, puerto, args.clientes, args.duracion,
+                                         args.escrituras, max(1, args.proyectos), args.semilla)
+        finally:
+            if proceso is not None:
+                proceso.send_signal(signal.SIGINT)
+                proceso.wait(timeout=60)
+    
+    if args.json:
+        print(json.dumps(resultados, indent=4))
+    else:
+        mostrar_resultados(resultados, args.clientes, args.duracion)
+    return 1 if resultados["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,69 +3,225 @@ Módulo de reportes para el Sistema de Gestión de Proyectos.
 Genera reportes formateados usando f-strings con alineación.
 """
 
+import sys
+from collections.abc import Sequence
+from itertools import islice
 
-def mostrar_tabla(lista_proyectos):
+from metricas import medir
+from derivados import avance
+
+# Ancho de las columnas de texto de la tabla; los valores más largos se recortan
+ANCHO_CLIENTE = 25
+ANCHO_NOMBRE = 30
+ANCHO_ESTADO = 15
+
+# Cantidad de filas que se acumulan antes de cada escritura en la salida
+FILAS_POR_BLOQUE = 1000
+
+
+def _truncar(texto, ancho):
+    """
+    Recorta un texto para que ocupe como máximo el ancho de su columna.
+    
+    Args:
+        texto: Valor a mostrar (se convierte a str).
+        ancho (int): Ancho máximo de la columna.
+        
+    Returns:
+        str: Texto original o recortado terminado en "…".
+    """
+    texto = str(texto)
+    if len(texto) <= ancho:
+        return texto
+    return texto[:ancho - 1] + "…"
+
+
+def formatear_fila(proyecto):
+    """
+    Formatea un proyecto como una fila de la tabla, con columnas de ancho fijo.
+    
+    Args:
+        proyecto (dict): Diccionario con información del proyecto.
+        
+    Returns:
+        str: Fila formateada (sin salto de línea).
+    """
+    id_proyecto = proyecto.get("id", "N/A")
+    cliente = _truncar(proyecto.get("cliente", "N/A"), ANCHO_CLIENTE)
+    nombre = _truncar(proyecto.get("nombre", "N/A"), ANCHO_NOMBRE)
+    estado = _truncar(proyecto.get("estado", "N/A"), ANCHO_ESTADO)
+    
+    # Porcentaje de avance (Progreso %), ya calculado en el registro
+    porcentaje_avance = avance(proyecto)
+    
+    return (f"{id_proyecto:<5} | {cliente:<{ANCHO_CLIENTE}} | {nombre:<{ANCHO_NOMBRE}} | "
+            f"{estado:<{ANCHO_ESTADO}} | {porcentaje_avance:>6.1f}%")
+
+
+def _obtener_pagina(lista_proyectos, tamano_pagina, pagina):
+    """
+    Obtiene los proyectos de una página sin recorrer ni copiar el resto.
+    Las secuencias se recortan directamente; cualquier otro iterable se
+    consume de forma perezosa solo hasta el final de la página.
+    
+    Args:
+        lista_proyectos (Iterable): Proyectos a paginar.
+        tamano_pagina (int): Filas por página.
+        pagina (int): Número de página (empieza en 1).
+        
+    Returns:
+        tuple: (proyectos de la página, True si hay más páginas).
+    """
+    inicio = (pagina - 1) * tamano_pagina
+    fin = inicio + tamano_pagina
+    
+    if isinstance(lista_proyectos, Sequence):
+        return lista_proyectos[inicio:fin], fin < len(lista_proyectos)
+    
+    # Se lee una fila extra solo para saber si existe una página siguiente
+    filas = list(islice(lista_proyectos, inicio, fin + 1))
+    return filas[:tamano_pagina], len(filas) > tamano_pagina
+
+
+@medir()
+def mostrar_tabla(lista_proyectos, tamano_pagina=None, pagina=1, salida=None):
     """
     Muestra una tabla formateada de proyectos usando f-strings con alineación.
     Encabezados: ID, Cliente, Proyecto, Estado, Progreso %
     
+    La salida se arma en bloques y se escribe una vez por página (o cada
+    FILAS_POR_BLOQUE filas si no se pagina), en lugar de un print por fila.
+    
     Args:
-        lista_proyectos (list): Lista de diccionarios con información de proyectos.
+        lista_proyectos (Iterable): Proyectos a mostrar (lista o cualquier iterable).
+        tamano_pagina (int, optional): Filas por página. None muestra todo.
+        pagina (int): Página a mostrar cuando se pagina (empieza en 1).
+        salida (TextIO, optional): Flujo de salida. Por defecto sys.stdout.
+        
+    Returns:
+        bool: True si existen más páginas después de la mostrada.
     """
-    if not lista_proyectos:
-        print("\n❌ No hay proyectos para mostrar.\n")
-        return
+    salida = salida or sys.stdout
+    hay_mas = False
+    pie = None
+    
+    if tamano_pagina:
+        pie = f"Página {pagina}"
+        if isinstance(lista_proyectos, Sequence):
+            total_paginas = max(1, -(-len(lista_proyectos) // tamano_pagina))
+            pie += f" de {total_paginas}"
+        lista_proyectos, hay_mas = _obtener_pagina(lista_proyectos, tamano_pagina, pagina)
+    
+    filas = iter(lista_proyectos)
+    primera = next(filas, None)
+    if primera is None:
+        salida.write("\n❌ No hay proyectos para mostrar.\n\n")
+        return False
     
     # Encabezado de la tabla
-    print("\n" + "=" * 100)
-    print(f"{'ID':<5} | {'Cliente':<25} | {'Proyecto':<30} | {'Estado':<15} | {'Progreso %':<10}")
-    print("=" * 100)
+    bloque = [
+        "",
+        "=" * 100,
+        f"{'ID':<5} | {'Cliente':<{ANCHO_CLIENTE}} | {'Proyecto':<{ANCHO_NOMBRE}} | "
+        f"{'Estado':<{ANCHO_ESTADO}} | {'Progreso %':<10}",
+        "=" * 100,
+        formatear_fila(primera)
+    ]
     
-    # Filas de datos
-    for proyecto in lista_proyectos:
-        id_proyecto = proyecto.get("id", "N/A")
-        cliente = proyecto.get("cliente", "N/A")
-        nombre = proyecto.get("nombre", "N/A")
-        estado = proyecto.get("estado", "N/A")
-        
-        # Calcular porcentaje de avance (Progreso %)
-        tareas_completadas = proyecto.get("tareas_completadas", 0)
-        horas_estimadas = proyecto.get("horas_estimadas", 1)
-        porcentaje_avance = (tareas_completadas / horas_estimadas * 100) if horas_estimadas > 0 else 0
-        porcentaje_avance = min(porcentaje_avance, 100.0)
-        
-        # Formatear con f-strings y alineación
-        print(f"{id_proyecto:<5} | {cliente:<25} | {nombre:<30} | {estado:<15} | {porcentaje_avance:>6.1f}%")
+    # Filas de datos, escritas en bloques
+    for proyecto in filas:
+        bloque.append(formatear_fila(proyecto))
+        if len(bloque) >= FILAS_POR_BLOQUE:
+            salida.write("\n".join(bloque) + "\n")
+            bloque = []
     
-    print("=" * 100 + "\n")
+    bloque.append("=" * 100)
+    if pie:
+        bloque.append(pie)
+    salida.write("\n".join(bloque) + "\n\n")
+    
+    return hay_mas
 
 
-def mostrar_reporte_productividad(lista_proyectos, total_tareas):
+@medir()
+def mostrar_reporte_productividad(agregados):
     """
     Muestra un reporte de productividad con estadísticas generales.
+    Los totales llegan ya calculados, por lo que el reporte no recorre los proyectos.
     
     Args:
-        lista_proyectos (list): Lista de proyectos.
-        total_tareas (int): Total de tareas completadas calculado recursivamente.
+        agregados (dict): Totales de data_manager.obtener_agregados().
     """
     print("\n" + "=" * 60)
     print(" " * 15 + "📊 REPORTE DE PRODUCTIVIDAD")
     print("=" * 60)
     
-    total_proyectos = len(lista_proyectos)
-    proyectos_finalizados = len([p for p in lista_proyectos if p["estado"] == "Finalizado"])
-    proyectos_en_progreso = len([p for p in lista_proyectos if p["estado"] == "En Progreso"])
-    proyectos_pendientes = len([p for p in lista_proyectos if p["estado"] == "Pendiente"])
+    por_estado = agregados["por_estado"]
     
-    print(f"\n{'Total de Proyectos:':<30} {total_proyectos:>5}")
-    print(f"{'Proyectos Finalizados:':<30} {proyectos_finalizados:>5}")
-    print(f"{'Proyectos en Progreso:':<30} {proyectos_en_progreso:>5}")
-    print(f"{'Proyectos Pendientes:':<30} {proyectos_pendientes:>5}")
-    print(f"{'Total Tareas Completadas:':<30} {total_tareas:>5}")
+    print(f"\n{'Total de Proyectos:':<30} {agregados['total_proyectos']:>5}")
+    print(f"{'Proyectos Finalizados:':<30} {por_estado.get('Finalizado', 0):>5}")
+    print(f"{'Proyectos en Progreso:':<30} {por_estado.get('En Progreso', 0):>5}")
+    print(f"{'Proyectos Pendientes:':<30} {por_estado.get('Pendiente', 0):>5}")
+    print(f"{'Total Tareas Completadas:':<30} {agregados['tareas_completadas']:>5}")
+    print(f"{'Total Horas Estimadas:':<30} {agregados['horas_estimadas']:>5}")
     
     print("\n" + "=" * 60 + "\n")
 
 
+@medir()
+def mostrar_reporte_clientes(filas):
+    """
+    Muestra el reporte por cliente: proyectos, horas, tareas, avance
+    promedio y proyectos por estado. Las filas llegan ya totalizadas.
+    
+    Args:
+        filas (list): Filas de data_manager.obtener_agregados_por_cliente().
+    """
+    print("\n" + "=" * 100)
+    print(" " * 38 + "👥 REPORTE POR CLIENTE")
+    print("=" * 100)
+    print(f"{'Cliente':<{ANCHO_CLIENTE}} | {'Proyectos':>9} | {'Horas':>8} | {'Tareas':>8} | "
+          f"{'Avance %':>8} | {'Pend.':>5} | {'Prog.':>5} | {'Fin.':>5}")
+    print("-" * 100)
+    
+    for fila in filas:
+        por_estado = fila["por_estado"]
+        print(f"{_truncar(fila['cliente'], ANCHO_CLIENTE):<{ANCHO_CLIENTE}} | {fila['proyectos']:>9} | "
+              f"{fila['horas_estimadas']:>8} | {fila['tareas_completadas']:>8} | "
+              f"{fila['avance_promedio']:>8.1f} | {por_estado.get('Pendiente', 0):>5} | "
+              f"{por_estado.get('En Progreso', 0):>5} | {por_estado.get('Finalizado', 0):>5}")
+    
+    print("=" * 100 + "\n")
+
+
+def mostrar_reporte_periodos(filas, periodo):
+    """
+    Muestra el rendimiento por período: proyectos iniciados, finalizados y
+    tareas completadas de los proyectos finalizados en cada período.
+    
+    Args:
+        filas (list): Filas de data_manager.reporte_por_periodo().
+        periodo (str): "semana" o "mes", para el encabezado.
+    """
+    print("\n" + "=" * 60)
+    print(f"{f'📅 RENDIMIENTO POR {periodo.upper()}':^60}")
+    print("=" * 60)
+    print(f"{'Período':<12} {'Iniciados':>12} {'Finalizados':>12} {'Tareas':>12}")
+    print("-" * 60)
+    
+    total_iniciados = total_finalizados = total_tareas = 0
+    for fila in filas:
+        print(f"{fila['periodo']:<12} {fila['iniciados']:>12} {fila['finalizados']:>12} {fila['tareas_completadas']:>12}")
+        total_iniciados += fila["iniciados"]
+        total_finalizados += fila["finalizados"]
+        total_tareas += fila["tareas_completadas"]
+    
+    print("-" * 60)
+    print(f"{'Total':<12} {total_iniciados:>12} {total_finalizados:>12} {total_tareas:>12}")
+    print("=" * 60 + "\n")
+
+
+@medir()
 def mostrar_detalle_proyecto(proyecto):
     """
     Muestra el detalle completo de un proyecto.
@@ -77,8 +233,7 @@ def mostrar_detalle_proyecto(proyecto):
     print(" " * 15 + "📋 DETALLE DEL PROYECTO")
     print("=" * 60)
     
-    porcentaje_avance = (proyecto["tareas_completadas"] / proyecto["horas_estimadas"] * 100) if proyecto["horas_estimadas"] > 0 else 0
-    porcentaje_avance = min(porcentaje_avance, 100.0)
+    porcentaje_avance = avance(proyecto)
     
     prioridad_nombre, prioridad_num = proyecto.get("prioridad", ("N/A", 0))
     
@@ -93,3 +248,34 @@ def mostrar_detalle_proyecto(proyecto):
     
     print("\n" + "=" * 60 + "\n")
 
+
+def mostrar_metricas(metricas):
+    """
+    Muestra la tabla de latencias y contadores de la instrumentación.
+    
+    Args:
+        metricas (dict): Resumen de metricas.obtener_metricas().
+    """
+    print("\n" + "=" * 100)
+    print(" " * 38 + "⏱️ MÉTRICAS DE RENDIMIENTO")
+    print("=" * 100)
+    print(f"{'Estado de la medición:':<25} {'activa' if metricas['activo'] else 'desactivada'}")
+    
+    latencias = metricas["latencias"]
+    if not latencias:
+        print("\nTodavía no hay mediciones registradas.")
+    else:
+        print(f"\n{'Función':<42} | {'Llamadas':>9} | {'Total ms':>10} | {'Prom. µs':>10} | "
+              f"{'p50 µs':>8} | {'p99 µs':>8}")
+        print("-" * 100)
+        for nombre, datos in latencias.items():
+            print(f"{_truncar(nombre, 42):<42} | {datos['llamadas']:>9} | {datos['total_ms']:>10.2f} | "
+                  f"{datos['promedio_us']:>10.1f} | {datos['p50_us']:>8} | {datos['p99_us']:>8}")
+    
+    if metricas["contadores"]:
+        print(f"\n{'Contador':<42} | {'Valor':>9}")
+        print("-" * 54)
+        for nombre, valor in metricas["contadores"].items():
+            print(f"{_truncar(nombre, 42):<42} | {valor:>9}")
+    
+    print("=" * 100 + "\n")
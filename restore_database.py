@@ -4,30 +4,121 @@ Genera el archivo database.json con los datos iniciales del sistema.
 """
 
 import json
+import random
+import sys
 from datetime import datetime, timedelta
+from itertools import accumulate
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
 
+# Catálogos para generar proyectos sintéticos realistas
+TIPOS_PROYECTO = (
+    "E-commerce", "Landing Page", "Blog Corporativo", "App Móvil", "Portal Web",
+    "Intranet", "API REST", "Rediseño Web", "Tienda Online", "Dashboard"
+)
+CLIENTES_BASE = (
+    "Nike", "Abogado Perez", "Tech Solutions", "Café Andino", "Clínica Sur",
+    "Inmobiliaria Norte", "Librería Central", "Panadería Rosa", "Gimnasio Activo",
+    "Constructora Vega"
+)
+ESTADOS_SINTETICOS = (("Pendiente", 3), ("En Progreso", 4), ("Finalizado", 3))
+PRIORIDADES_SINTETICAS = (["Alta", 1], ["Media", 2], ["Baja", 3])
 
-def generar_fecha_inicio(dias_atras: int) -> str:
+
+def generar_fecha_inicio(dias_atras: int, referencia: Optional[datetime] = None) -> str:
     """
     Genera una fecha de inicio reciente.
     
     Args:
         dias_atras (int): Días hacia atrás desde hoy.
+        referencia (Optional[datetime]): Fecha desde la que se cuenta (por defecto, ahora).
         
     Returns:
         str: Fecha en formato ISO (YYYY-MM-DD).
     """
-    fecha = datetime.now() - timedelta(days=dias_atras)
+    fecha = (referencia or datetime.now()) - timedelta(days=dias_atras)
     return fecha.strftime("%Y-%m-%d")
 
 
-def crear_base_datos_json():
+def generar_proyectos_sinteticos(cantidad: int, semilla: int = 42, id_inicial: int = 1,
+                                 referencia: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Genera proyectos de prueba reproducibles (misma semilla, mismos datos).
+    Los clientes siguen una distribución desigual, como en una agencia real,
+    y las fechas son coherentes con el estado de cada proyecto.
+    
+    Args:
+        cantidad (int): Cantidad de proyectos a generar.
+        semilla (int): Semilla del generador aleatorio.
+        id_inicial (int): ID del primer proyecto generado.
+        referencia (Optional[datetime]): Fecha "hoy" usada para las fechas relativas.
+        
+    Yields:
+        Dict[str, Any]: Proyecto con el mismo formato que database.json.
+    """
+    aleatorio = random.Random(semilla)
+    referencia = referencia or datetime.now()
+    hoy = referencia.strftime("%Y-%m-%d")
+    estados = [estado for estado, _ in ESTADOS_SINTETICOS]
+    # Pesos acumulados calculados una vez: choices() con weights los
+    # recalcularía en cada llamada, O(clientes) por proyecto
+    acumulados_estados = list(accumulate(peso for _, peso in ESTADOS_SINTETICOS))
+    
+    # Unos pocos clientes concentran la mayoría de los proyectos
+    clientes = list(CLIENTES_BASE) + [f"Cliente {numero:04d}" for numero in range(1, max(2, cantidad // 50))]
+    acumulados_clientes = list(accumulate(1 / posicion for posicion in range(1, len(clientes) + 1)))
+    
+    for desplazamiento in range(cantidad):
+        id_proyecto = id_inicial + desplazamiento
+        estado = aleatorio.choices(estados, cum_weights=acumulados_estados)[0]
+        horas_estimadas = aleatorio.randint(5, 400)
+        dias_inicio = aleatorio.randint(1, 730)
+        
+        if estado == "Finalizado":
+            tareas_completadas = horas_estimadas
+        elif estado == "En Progreso":
+            tareas_completadas = aleatorio.randint(1, horas_estimadas)
+        else:
+            tareas_completadas = 0
+        
+        proyecto = {
+            "id": id_proyecto,
+            "nombre": f"{aleatorio.choice(TIPOS_PROYECTO)} {id_proyecto}",
+            "cliente": aleatorio.choices(clientes, cum_weights=acumulados_clientes)[0],
+            "estado": estado,
+            "horas_estimadas": horas_estimadas,
+            "tareas_completadas": tareas_completadas,
+            "prioridad": list(aleatorio.choice(PRIORIDADES_SINTETICAS)),
+            "fecha_inicio": generar_fecha_inicio(dias_inicio, referencia)
+        }
+        if estado == "Finalizado":
+            proyecto["fecha_fin"] = generar_fecha_inicio(aleatorio.randint(0, dias_inicio - 1), referencia)
+        proyecto["fecha_actualizacion"] = hoy
+        
+        yield proyecto
+
+
+def crear_base_datos_json(proyectos_sinteticos: int = 0, semilla: int = 42,
+                          archivo_json: Optional[Path] = None, mostrar_resumen: bool = True):
     """
     Crea el archivo database.json con los datos iniciales del sistema.
+    Opcionalmente agrega proyectos sintéticos para pruebas de carga.
+    
+    Args:
+        proyectos_sinteticos (int): Cantidad de proyectos generados a agregar.
+        semilla (int): Semilla para generar los proyectos sintéticos.
+        archivo_json (Optional[Path]): Ruta de salida (por defecto, database.json del proyecto).
+        mostrar_resumen (bool): Si es False no se imprime el resumen.
     """
-    # Estructura de la base de datos
+    # Estructura de la base de datos (los metadatos primero, para que la
+    # carga en streaming conozca el total de proyectos antes de leerlos)
     database = {
+        "metadata": {
+            "version": "1.0.0",
+            "fecha_creacion": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_proyectos": 3,
+            "total_usuarios": 2
+        },
         "usuarios": {
             "admin": "1234",
             "jacqueline": "dev2025"
@@ -67,23 +158,26 @@ def crear_base_datos_json():
                 "fecha_fin": generar_fecha_inicio(10),  # Finalizado hace 10 días
                 "fecha_actualizacion": datetime.now().strftime("%Y-%m-%d")
             }
-        ],
-        "metadata": {
-            "version": "1.0.0",
-            "fecha_creacion": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_proyectos": 3,
-            "total_usuarios": 2
-        }
+        ]
     }
     
+    # Proyectos sintéticos a continuación de los iniciales
+    database["proyectos"].extend(
+        generar_proyectos_sinteticos(proyectos_sinteticos, semilla, id_inicial=len(database["proyectos"]) + 1)
+    )
+    database["metadata"]["total_proyectos"] = len(database["proyectos"])
+    
     # Ruta del archivo JSON (en el directorio del proyecto)
-    archivo_json = Path(__file__).parent / "database.json"
+    archivo_json = archivo_json or Path(__file__).parent / "database.json"
     
     try:
         # Escribir el archivo JSON con formato legible
         with open(archivo_json, 'w', encoding='utf-8') as f:
             json.dump(database, f, indent=4, ensure_ascii=False)
         
+        if not mostrar_resumen:
+            return True
+        
         print("=" * 70)
         print(" " * 15 + "✅ BASE DE DATOS RESTAURADA")
         print("=" * 70)
@@ -95,9 +189,11 @@ def crear_base_datos_json():
         for usuario, _ in database['usuarios'].items():
             print(f"   - {usuario}")
         print(f"\n📋 Proyectos restaurados:")
-        for proyecto in database['proyectos']:
+        for proyecto in database['proyectos'][:10]:
             print(f"   - ID {proyecto['id']}: {proyecto['nombre']} ({proyecto['cliente']})")
             print(f"     Estado: {proyecto['estado']} | Prioridad: {proyecto['prioridad'][0]}")
+        if len(database['proyectos']) > 10:
+            print(f"   ... y {len(database['proyectos']) - 10} proyectos más")
         print("\n" + "=" * 70)
         print("✅ Restauración completada exitosamente.\n")
         
@@ -109,5 +205,6 @@ def crear_base_datos_json():
 
 
 if __name__ == "__main__":
-    crear_base_datos_json()
+    # Uso: python restore_database.py [cantidad_de_proyectos_sinteticos]
+    crear_base_datos_json(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
 
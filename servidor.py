@@ -0,0 +1,317 @@
+"""
+Servicio HTTP/JSON del Sistema de Gestión de Proyectos.
+Permite que varios operadores trabajen a la vez sobre el mismo almacén. Cada
+pedido se atiende en su propio hilo; data_manager protege el almacén con un
+bloqueo de lectores-escritor, de modo que las consultas corren en paralelo
+y las altas se aplican de a una.
+
+Autenticación HTTP Basic con las cuentas de auth.USUARIOS.
+
+Rutas:
+    GET  /proyectos             lista; filtros opcionales ?estado=&cliente=&prioridad=
+                                (repetibles) y los rangos de data_manager.consultar,
+                                paginación con ?limite=&desplazamiento=; "total" es
+                                null si el resultado incluye archivados (contarlos
+                                obligaría a leer el archivo) y "hay_mas" indica si
+                                quedan páginas
+    GET  /proyectos/<id>        un proyecto
+    POST /proyectos             alta (cuerpo JSON; el id es opcional)
+    GET  /buscar                búsqueda por nombre o cliente: ?q=&limite=&exacto=1&archivados=1
+    GET  /reporte               reporte de productividad
+    GET  /reporte/clientes      totales por cliente
+
+Uso:
+    python servidor.py                    # http://127.0.0.1:8080
+    python servidor.py --puerto 9000
+    python servidor.py --motor sqlite
+"""
+
+import argparse
+import base64
+import json
+import sys
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import data_manager
+import persistencia
+from archivo import VistaConArchivados
+from auth import verificar_credenciales
+from busqueda import RESULTADOS_POR_DEFECTO
+from derivados import sin_derivados
+from cli import ErrorOperacion, construir_proyecto
+
+# Dirección por defecto: solo accesible desde la propia máquina
+HOST = "127.0.0.1"
+PUERTO = 8080
+
+# Tamaño máximo aceptado para el cuerpo de un alta
+MAX_CUERPO = 64 * 1024
+
+# Conversión de los parámetros de rango de la URL
+_RANGOS = {
+    "horas_min": int,
+    "horas_max": int,
+    "progreso_min": float,
+    "progreso_max": float,
+    "fecha_desde": str,
+    "fecha_hasta": str
+}
+
+
+def criterios_desde_url(parametros: Dict[str, List[str]]) -> Tuple[Dict[str, Any], int, Optional[int]]:
+    """
+    Convierte los parámetros de la URL en criterios de consulta y paginación.
+    
+    Args:
+        parametros (Dict[str, List[str]]): Resultado de parse_qs.
+        
+    Returns:
+        Tuple[Dict[str, Any], int, Optional[int]]: Criterios para
+        data_manager.consultar, desplazamiento y límite.
+        
+    Raises:
+        ValueError: Si un parámetro no existe o su valor es inválido.
+    """
+    criterios: Dict[str, Any] = {}
+    desplazamiento, limite = 0, None
+    for nombre, valores in parametros.items():
+        if nombre in ("estado", "cliente", "prioridad"):
+            criterios[nombre] = valores
+        elif nombre in _RANGOS:
+            criterios[nombre] = _RANGOS[nombre](valores[-1])
+        elif nombre == "desplazamiento":
+            desplazamiento = max(0, int(valores[-1]))
+        elif nombre == "limite":
+            limite = max(0, int(valores[-1]))
+        else:
+            raise ValueError(f"parámetro desconocido: {nombre}")
+    return criterios, desplazamiento, limite
+
+
+class ManejadorProyectos(BaseHTTPRequestHandler):
+    """
+    Atiende los pedidos HTTP traduciéndolos a llamadas de data_manager.
+    Usa HTTP/1.1 para que los clientes reutilicen la conexión.
+    """
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "GestionProyectos/1.0"
+    
+    # Encabezados y cuerpo se escriben por separado: sin TCP_NODELAY el
+    # algoritmo de Nagle retiene el cuerpo hasta el ACK demorado del cliente
+    disable_nagle_algorithm = True
+    
+    # Si es False no se escribe una línea de registro por pedido
+    registrar_pedidos = False
+    
+    def log_message(self, formato: str, *args: Any) -> None:
+        if self.registrar_pedidos:
+            super().log_message(formato, *args)
+    
+    def _responder(self, estado: HTTPStatus, datos: Any) -> None:
+        """
+        Envía una respuesta JSON.
+        
+        Args:
+            estado (HTTPStatus): Código de estado HTTP.
+            datos (Any): Contenido serializable a JSON.
+        """
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if estado == HTTPStatus.UNAUTHORIZED:
+            self.send_header("WWW-Authenticate", 'Basic realm="proyectos"')
+        self.end_headers()
+        self.wfile.write(cuerpo)
+    
+    def _error(self, estado: HTTPStatus, mensaje: str) -> None:
+        """
+        Envía una respuesta de error con el formato {"ok": false, "error": ...}.
+        
+        Args:
+            estado (HTTPStatus): Código de estado HTTP.
+            mensaje (str): Descripción del error.
+        """
+        self._responder(estado, {"ok": False, "error": mensaje})
+    
+    def _autenticado(self) -> bool:
+        """
+        Verifica las credenciales HTTP Basic del pedido.
+        
+        Returns:
+            bool: True si el usuario y la contraseña son válidos.
+        """
+        encabezado = self.headers.get("Authorization", "")
+        if not encabezado.startswith("Basic "):
+            return False
+        try:
+            usuario, _, contrasena = base64.b64decode(encabezado[6:]).decode("utf-8").partition(":")
+        except (ValueError, UnicodeDecodeError):
+            return False
+        return verificar_credenciales(usuario, contrasena)
+    
+    def _leer_cuerpo(self) -> Dict[str, Any]:
+        """
+        Lee y decodifica el cuerpo JSON del pedido.
+        
+        Returns:
+            Dict[str, Any]: Objeto recibido.
+            
+        Raises:
+            ErrorOperacion: Si el cuerpo falta, es demasiado grande o no es un objeto JSON.
+        """
+        longitud = int(self.headers.get("Content-Length") or 0)
+        if not 0 < longitud <= MAX_CUERPO:
+            raise ErrorOperacion("cuerpo vacío o demasiado grande")
+        try:
+            datos = json.loads(self.rfile.read(longitud))
+        except ValueError:
+            raise ErrorOperacion("el cuerpo no es JSON válido")
+        if not isinstance(datos, dict):
+            raise ErrorOperacion("el cuerpo debe ser un objeto JSON")
+        return datos
+    
+    def do_GET(self) -> None:
+        if not self._autenticado():
+            self._error(HTTPStatus.UNAUTHORIZED, "credenciales inválidas")
+            return
+        
+        url = urlsplit(self.path)
+        partes = [parte for parte in url.path.split("/") if parte]
+        
+        try:
+            if partes == ["proyectos"]:
+                criterios, desplazamiento, limite = criterios_desde_url(parse_qs(url.query))
+                if criterios:
+                    proyectos = data_manager.consultar(**criterios)
+                else:
+                    proyectos = data_manager.obtener_proyectos()
+                fin = None if limite is None else desplazamiento + limite
+                if isinstance(proyectos, VistaConArchivados):
+                    # Contar los archivados que cumplen los filtros leería el
+                    # archivo completo en cada pedido: la página se arma
+                    # recorriendo la vista, más un proyecto para saber si sigue
+                    pagina = list(islice(proyectos, desplazamiento, None if fin is None else fin + 1))
+                    total, hay_mas = None, fin is not None and len(pagina) > limite
+                    pagina = pagina[:limite]
+                else:
+                    pagina = proyectos[desplazamiento:fin]
+                    total, hay_mas = len(proyectos), fin is not None and fin < len(proyectos)
+                self._responder(HTTPStatus.OK, {
+                    "total": total,
+                    "hay_mas": hay_mas,
+                    "proyectos": [sin_derivados(proyecto) for proyecto in pagina]
+                })
+            elif len(partes) == 2 and partes[0] == "proyectos":
+                proyecto = data_manager.obtener_proyecto_por_id(int(partes[1]))
+                if proyecto is None:
+                    self._error(HTTPStatus.NOT_FOUND, f"no existe el proyecto {partes[1]}")
+                else:
+                    self._responder(HTTPStatus.OK, sin_derivados(proyecto))
+            elif partes == ["buscar"]:
+                parametros = parse_qs(url.query)
+                proyectos = data_manager.buscar_proyectos(
+                    parametros.get("q", [""])[-1],
+                    int(parametros.get("limite", [RESULTADOS_POR_DEFECTO])[-1]),
+                    parametros.get("exacto", ["0"])[-1] in ("", "0"),
+                    parametros.get("archivados", ["0"])[-1] not in ("", "0")
+                )
+                self._responder(HTTPStatus.OK, {"proyectos": [sin_derivados(proyecto) for proyecto in proyectos]})
+            elif partes == ["reporte"]:
+                self._responder(HTTPStatus.OK, data_manager.obtener_agregados())
+            elif partes == ["reporte", "clientes"]:
+                self._responder(HTTPStatus.OK, data_manager.obtener_agregados_por_cliente())
+            else:
+                self._error(HTTPStatus.NOT_FOUND, f"ruta desconocida: {url.path}")
+        except (ValueError, TypeError) as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+    
+    def do_POST(self) -> None:
+        if not self._autenticado():
+            self._error(HTTPStatus.UNAUTHORIZED, "credenciales inválidas")
+            return
+        
+        if urlsplit(self.path).path.rstrip("/") != "/proyectos":
+            self._error(HTTPStatus.NOT_FOUND, f"ruta desconocida: {self.path}")
+            return
+        
+        try:
+            # El ID sale del bloque reservado por este proceso (data_manager.asignar_id),
+            # así que los hilos no compiten por él ni hace falta comprobarlo antes
+            proyecto = construir_proyecto(self._leer_cuerpo())
+            agregado = data_manager.agregar_proyecto(proyecto)
+        except ErrorOperacion as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        
+        if agregado:
+            self._responder(HTTPStatus.CREATED, {"ok": True, "id": proyecto["id"]})
+        else:
+            self._error(HTTPStatus.CONFLICT, f"el ID {proyecto['id']} ya existe")
+
+
+def crear_servidor(host: str = HOST, puerto: int = PUERTO) -> ThreadingHTTPServer:
+    """
+    Crea el servidor y activa el bloqueo del almacén. La persistencia debe
+    inicializarse antes con data_manager.inicializar_persistencia().
+    
+    Args:
+        host (str): Dirección donde escuchar.
+        puerto (int): Puerto TCP (0 elige uno libre).
+        
+    Returns:
+        ThreadingHTTPServer: Servidor listo para serve_forever().
+    """
+    data_manager.BLOQUEO.activar()
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorProyectos)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argumentos: List[str]) -> int:
+    """
+    Inicia el servicio hasta recibir Ctrl+C.
+    
+    Args:
+        argumentos (List[str]): Argumentos de línea de comandos (sin el programa).
+        
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del Sistema de Gestión de Proyectos.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--base-datos", type=Path, default=persistencia.RUTA_BASE_DATOS)
+    parser.add_argument("--diario", type=Path, default=persistencia.RUTA_DIARIO)
+    parser.add_argument("--motor", choices=data_manager.MOTORES,
+                        help="motor de almacenamiento (por defecto GESTION_MOTOR o memoria)")
+    parser.add_argument("--sqlite", type=Path, default=data_manager.RUTA_SQLITE,
+                        help="ruta de la base del motor sqlite")
+    parser.add_argument("--registrar", action="store_true", help="muestra una línea por pedido")
+    args = parser.parse_args(argumentos)
+    
+    ManejadorProyectos.registrar_pedidos = args.registrar
+    cantidad = data_manager.inicializar_persistencia(args.base_datos, args.diario, args.motor, args.sqlite)
+    servidor = crear_servidor(args.host, args.puerto)
+    host, puerto = servidor.server_address[:2]
+    print(f"🌐 Sirviendo {cantidad:,} proyectos en http://{host}:{puerto} (Ctrl+C para detener)", flush=True)
+    
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️ Deteniendo el servidor...")
+    finally:
+        servidor.server_close()
+        data_manager.cerrar_persistencia()
+        data_manager.BLOQUEO.activar(False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
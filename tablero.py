@@ -0,0 +1,186 @@
+"""
+Tablero en vivo para el Sistema de Gestión de Proyectos.
+Mantiene el reporte de productividad abierto y al día sin recalcularlo:
+se suscribe a los cambios de data_manager, aplica a sus totales solo la
+diferencia de cada cambio (restando la versión anterior del proyecto y
+sumando la nueva) y redibuja como máximo una vez por intervalo, de modo que
+el costo de cada actualización no depende de la cantidad de proyectos.
+
+Los cambios de otros procesos (el servidor, la CLI) se incorporan leyendo
+los registros nuevos del diario con data_manager.seguir_cambios_externos().
+
+Uso:
+    python tablero.py                  # redibuja como máximo cada 2 segundos
+    python tablero.py --intervalo 5
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from data_manager import (
+    BLOQUEO,
+    obtener_agregados,
+    suscribir_cambios,
+    cancelar_suscripcion,
+    seguir_cambios_externos,
+    estado_carga,
+    inicializar_persistencia,
+    cerrar_persistencia
+)
+from reports import mostrar_reporte_productividad
+from utils import acumular_proyecto
+
+# Segundos mínimos entre dos redibujos
+INTERVALO_REDIBUJO = 2.0
+
+# Secuencia ANSI que lleva el cursor al inicio y borra la pantalla
+LIMPIAR_PANTALLA = "\033[H\033[J"
+
+
+class Tablero:
+    """
+    Totales del reporte de productividad mantenidos con los cambios que
+    publica data_manager. Los cambios llegan desde el hilo que escribe y se
+    encolan; el hilo del tablero los aplica al redibujar.
+    """
+    
+    def __init__(self, intervalo: float = INTERVALO_REDIBUJO,
+                 dibujar: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Prepara el tablero sin suscribirlo todavía.
+        
+        Args:
+            intervalo (float): Segundos mínimos entre dos redibujos.
+            dibujar (Optional[Callable]): Recibe los totales en cada redibujo;
+                por defecto limpia la consola y muestra el reporte.
+        """
+        self.intervalo = intervalo
+        self.dibujar = dibujar or self._dibujar_en_consola
+        self.agregados: Dict[str, Any] = {}
+        self.cambios_aplicados = 0
+        self._pendientes: deque = deque()
+        self._aviso = threading.Event()
+    
+    def _recibir(self, cambios: Optional[List[Any]]) -> None:
+        """
+        Encola un cambio publicado por data_manager (ver suscribir_cambios).
+        
+        Args:
+            cambios (Optional[List[Any]]): Pares (anterior, nuevo) o None.
+        """
+        self._pendientes.append(cambios)
+        self._aviso.set()
+    
+    def iniciar(self) -> None:
+        """
+        Toma los totales actuales y se suscribe a los cambios. Ambas cosas
+        ocurren con el bloqueo de lectura tomado, así que ningún cambio queda
+        fuera de la copia inicial ni se cuenta dos veces.
+        """
+        with BLOQUEO.lectura():
+            self.agregados = obtener_agregados()
+            suscribir_cambios(self._recibir)
+        if not estado_carga()["en_curso"]:
+            seguir_cambios_externos(reiniciar=True)
+    
+    def detener(self) -> None:
+        """
+        Cancela la suscripción a los cambios.
+        """
+        cancelar_suscripcion(self._recibir)
+    
+    def aplicar_pendientes(self) -> bool:
+        """
+        Aplica a los totales los cambios encolados desde la última llamada.
+        Si entre ellos hay un reemplazo completo del almacén, se releen los
+        totales, que ya incluyen todos los cambios encolados.
+        
+        Returns:
+            bool: True si se aplicó algún cambio.
+        """
+        # Con el bloqueo de lectura no se confirman cambios nuevos mientras
+        # tanto: la cola vaciada es exactamente lo que falta en los totales
+        with BLOQUEO.lectura():
+            lotes = []
+            while self._pendientes:
+                lotes.append(self._pendientes.popleft())
+            if any(cambios is None for cambios in lotes):
+                self.agregados = obtener_agregados()
+                return True
+        
+        for cambios in lotes:
+            for anterior, nuevo in cambios:
+                if anterior is not None:
+                    acumular_proyecto(self.agregados, anterior, -1)
+                if nuevo is not None:
+                    acumular_proyecto(self.agregados, nuevo)
+            self.cambios_aplicados += len(cambios)
+        return bool(lotes)
+    
+    def _dibujar_en_consola(self, agregados: Dict[str, Any]) -> None:
+        """
+        Limpia la consola y muestra el reporte de productividad.
+        
+        Args:
+            agregados (Dict[str, Any]): Totales a mostrar.
+        """
+        print(LIMPIAR_PANTALLA, end="")
+        mostrar_reporte_productividad(agregados)
+        print(f"🔄 Actualizado a las {datetime.now():%H:%M:%S} · "
+              f"{self.cambios_aplicados} cambios aplicados · Ctrl+C para salir")
+    
+    def ejecutar(self, duracion: Optional[float] = None) -> None:
+        """
+        Dibuja el tablero y lo redibuja cuando hay cambios, como máximo una
+        vez por intervalo, hasta que vence la duración o se interrumpe con
+        Ctrl+C.
+        
+        Args:
+            duracion (Optional[float]): Segundos a ejecutar; None sin límite.
+        """
+        fin = None if duracion is None else time.monotonic() + duracion
+        
+        def acotar(segundos: float) -> float:
+            # Ninguna espera pasa del final de la ejecución
+            if fin is not None:
+                segundos = min(segundos, fin - time.monotonic())
+            return max(0.0, segundos)
+        
+        self.iniciar()
+        try:
+            self.dibujar(self.agregados)
+            ultimo_dibujo = time.monotonic()
+            while fin is None or time.monotonic() < fin:
+                # Un cambio local despierta antes; los externos se buscan por intervalo
+                self._aviso.wait(acotar(self.intervalo))
+                self._aviso.clear()
+                time.sleep(acotar(ultimo_dibujo + self.intervalo - time.monotonic()))
+                # Mientras la base se carga, los cambios ya llegan por la suscripción
+                if not estado_carga()["en_curso"]:
+                    seguir_cambios_externos()
+                if self.aplicar_pendientes():
+                    self.dibujar(self.agregados)
+                    ultimo_dibujo = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.detener()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reporte de productividad en vivo.")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_REDIBUJO,
+                        help="segundos mínimos entre redibujos")
+    args = parser.parse_args()
+    
+    inicializar_persistencia()
+    try:
+        Tablero(args.intervalo).ejecutar()
+    finally:
+        cerrar_persistencia(compactar=False)
+    sys.exit(0)
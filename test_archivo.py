@@ -0,0 +1,72 @@
+"""
+Pruebas del archivo de proyectos finalizados: un ID archivado sigue
+reservado y se puede consultar, pero no modificar ni eliminar.
+
+Ejecutar con:
+    python -m unittest test_archivo
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import data_manager
+
+
+class PruebaIdsArchivados(unittest.TestCase):
+    """
+    Get, alta, modificación y baja de un ID archivado, con la persistencia
+    en un directorio temporal.
+    """
+    
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        ruta = Path(self.directorio.name)
+        data_manager.inicializar_persistencia(ruta / "database.json", ruta / "database.journal", motor="memoria")
+        
+        self.id_archivado = data_manager.siguiente_id() + 100
+        self.id_activo = self.id_archivado + 1
+        base = {
+            "cliente": "Cliente de Prueba",
+            "horas_estimadas": 10,
+            "tareas_completadas": 10,
+            "prioridad": ("Alta", 1),
+            "fecha_inicio": "2020-01-01"
+        }
+        rechazados = data_manager.agregar_proyectos([
+            dict(base, id=self.id_archivado, nombre="Blog Archivado", estado="Finalizado", fecha_fin="2020-02-01"),
+            dict(base, id=self.id_activo, nombre="Blog Activo", estado="En Progreso")
+        ])
+        self.assertEqual(rechazados, [])
+        self.assertGreater(data_manager.archivar_finalizados(dias=0, hoy="2020-03-01"), 0)
+    
+    def tearDown(self):
+        data_manager.cerrar_persistencia(compactar=False)
+        self.directorio.cleanup()
+    
+    def test_obtener_lee_el_archivo(self):
+        proyecto = data_manager.obtener_proyecto_por_id(self.id_archivado)
+        self.assertIsNotNone(proyecto)
+        self.assertEqual(proyecto["nombre"], "Blog Archivado")
+        self.assertEqual(proyecto["estado"], "Finalizado")
+        self.assertIsNone(data_manager.obtener_proyecto_por_id(self.id_activo + 1))
+    
+    def test_alta_con_id_archivado(self):
+        proyecto = dict(data_manager.obtener_proyecto_por_id(self.id_activo), id=self.id_archivado)
+        self.assertFalse(data_manager.agregar_proyecto(proyecto))
+        self.assertIn(self.id_archivado, data_manager.IDS_EXISTENTES)
+    
+    def test_actualizar_id_archivado(self):
+        with self.assertRaisesRegex(ValueError, "archivados"):
+            data_manager.actualizar_proyectos({"horas_estimadas": 20}, [self.id_archivado])
+        self.assertEqual(data_manager.obtener_proyecto_por_id(self.id_archivado)["horas_estimadas"], 10)
+    
+    def test_eliminar_lista_con_id_archivado(self):
+        with self.assertRaisesRegex(ValueError, f"{self.id_archivado} están archivados"):
+            data_manager.eliminar_proyectos([self.id_activo, self.id_archivado])
+        # El lote se aplica completo o no se aplica
+        self.assertIsNotNone(data_manager.obtener_proyecto_por_id(self.id_activo))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,19 @@
 """
 Módulo de utilidades para el Sistema de Gestión de Proyectos.
-Contiene funciones de validación y funciones recursivas.
+Contiene funciones de validación y funciones de cálculo de agregados.
 """
 
+from datetime import date
+from functools import reduce
+from typing import Any, Dict, Iterable
+
+from derivados import avance, calcular_porcentaje_avance
+from metricas import medir
+
 # Constantes para estados y prioridades
 ESTADOS_VALIDOS = {"Pendiente", "En Progreso", "Finalizado"}
 PRIORIDADES_VALIDAS = {"Alta": 1, "Media": 2, "Baja": 3}
+PERIODOS = ("semana", "mes")
 
 
 def validar_numero(mensaje: str) -> int:
@@ -37,60 +45,153 @@ def validar_numero(mensaje: str) -> int:
             raise
 
 
-def calcular_total_tareas_completadas(lista_proyectos: list) -> int:
+@medir()
+def calcular_total_tareas_completadas(lista_proyectos: Iterable[Dict[str, Any]]) -> int:
     """
-    Función recursiva que calcula el total de tareas completadas
-    de todos los proyectos en la lista.
+    Calcula el total de tareas completadas de todos los proyectos.
     
-    REQUISITO: No usa bucles for ni la función sum().
+    REQUISITO: No usa bucles for ni la función sum(). Se pliega la lista con
+    reduce para que el cálculo sea iterativo: la versión recursiva copiaba la
+    lista en cada llamada (O(n²)) y superaba el límite de recursión con más
+    de ~1000 proyectos.
     
     Args:
-        lista_proyectos (list): Lista de diccionarios de proyectos.
+        lista_proyectos (Iterable[Dict[str, Any]]): Proyectos a totalizar.
         
     Returns:
         int: Total de tareas completadas en todos los proyectos.
     """
-    # Caso base: lista vacía
-    if not lista_proyectos:
-        return 0
+    return reduce(
+        lambda total, proyecto: total + proyecto.get("tareas_completadas", 0),
+        lista_proyectos,
+        0
+    )
+
+
+def crear_agregados_vacios() -> Dict[str, Any]:
+    """
+    Crea la estructura de totales acumulados usada por los reportes.
     
-    # Caso recursivo: suma el primer elemento y llama recursivamente al resto
-    primer_proyecto = lista_proyectos[0]
-    tareas_primer_proyecto = primer_proyecto.get("tareas_completadas", 0)
-    resto_proyectos = lista_proyectos[1:]
+    Returns:
+        Dict[str, Any]: Totales en cero con un contador por cada estado válido.
+    """
+    return {
+        "total_proyectos": 0,
+        "tareas_completadas": 0,
+        "horas_estimadas": 0,
+        "por_estado": {estado: 0 for estado in ESTADOS_VALIDOS}
+    }
+
+
+def acumular_proyecto(agregados: Dict[str, Any], proyecto: Dict[str, Any], signo: int = 1) -> None:
+    """
+    Suma (signo=1) o resta (signo=-1) un proyecto de los totales acumulados.
     
-    return tareas_primer_proyecto + calcular_total_tareas_completadas(resto_proyectos)
+    Args:
+        agregados (Dict[str, Any]): Totales creados con crear_agregados_vacios.
+        proyecto (Dict[str, Any]): Proyecto a sumar o restar.
+        signo (int): 1 para sumar, -1 para restar.
+    """
+    agregados["total_proyectos"] += signo
+    agregados["tareas_completadas"] += signo * proyecto.get("tareas_completadas", 0)
+    agregados["horas_estimadas"] += signo * proyecto.get("horas_estimadas", 0)
+    por_estado = agregados["por_estado"]
+    estado = proyecto.get("estado")
+    por_estado[estado] = por_estado.get(estado, 0) + signo
 
 
-def validar_estado(estado: str) -> bool:
+@medir()
+def calcular_agregados(lista_proyectos: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Valida que el estado ingresado sea uno de los permitidos.
+    Recalcula desde cero los totales de una colección de proyectos.
+    Se usa para verificar los totales que se mantienen de forma incremental.
     
     Args:
-        estado (str): Estado a validar.
+        lista_proyectos (Iterable[Dict[str, Any]]): Proyectos a totalizar.
         
     Returns:
-        bool: True si el estado es válido, False en caso contrario.
+        Dict[str, Any]: Totales con la misma forma que crear_agregados_vacios.
     """
-    return estado in ESTADOS_VALIDOS
+    agregados = crear_agregados_vacios()
+    for proyecto in lista_proyectos:
+        acumular_proyecto(agregados, proyecto)
+    return agregados
+
+
+def crear_totales_cliente() -> Dict[str, Any]:
+    """
+    Crea los totales acumulados de un cliente.
+    
+    Returns:
+        Dict[str, Any]: Cantidad de proyectos, horas estimadas, tareas
+        completadas, suma de los porcentajes de avance y proyectos por estado.
+    """
+    return {
+        "proyectos": 0,
+        "horas_estimadas": 0,
+        "tareas_completadas": 0,
+        "suma_avance": 0.0,
+        "por_estado": {estado: 0 for estado in ESTADOS_VALIDOS}
+    }
+
+
+def acumular_cliente(por_cliente: Dict[str, Dict[str, Any]], proyecto: Dict[str, Any], signo: int = 1) -> None:
+    """
+    Suma (signo=1) o resta (signo=-1) un proyecto de los totales de su cliente.
+    El cliente desaparece de los totales cuando se queda sin proyectos.
+    
+    Args:
+        por_cliente (Dict[str, Dict[str, Any]]): Totales por cliente (se modifica).
+        proyecto (Dict[str, Any]): Proyecto a sumar o restar.
+        signo (int): 1 para sumar, -1 para restar.
+    """
+    cliente = proyecto.get("cliente")
+    totales = por_cliente.get(cliente)
+    if totales is None:
+        totales = por_cliente[cliente] = crear_totales_cliente()
+    
+    tareas = proyecto.get("tareas_completadas", 0)
+    horas = proyecto.get("horas_estimadas", 0)
+    totales["proyectos"] += signo
+    totales["horas_estimadas"] += signo * horas
+    totales["tareas_completadas"] += signo * tareas
+    totales["suma_avance"] += signo * avance(proyecto)
+    por_estado = totales["por_estado"]
+    estado = proyecto.get("estado")
+    por_estado[estado] = por_estado.get(estado, 0) + signo
+    
+    if totales["proyectos"] == 0:
+        del por_cliente[cliente]
 
 
-def calcular_porcentaje_avance(tareas_completadas: int, horas_estimadas: int) -> float:
+def calcular_agregados_por_cliente(lista_proyectos: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
-    Calcula el porcentaje de avance de un proyecto basado en tareas completadas.
+    Recalcula desde cero los totales por cliente de una colección de proyectos.
+    Se usa para verificar los totales que se mantienen de forma incremental.
     
     Args:
-        tareas_completadas (int): Número de tareas completadas.
-        horas_estimadas (int): Total de horas estimadas del proyecto.
+        lista_proyectos (Iterable[Dict[str, Any]]): Proyectos a totalizar.
         
     Returns:
-        float: Porcentaje de avance (0-100).
+        Dict[str, Dict[str, Any]]: Totales de cada cliente (ver crear_totales_cliente).
     """
-    if horas_estimadas == 0:
-        return 0.0
+    por_cliente: Dict[str, Dict[str, Any]] = {}
+    for proyecto in lista_proyectos:
+        acumular_cliente(por_cliente, proyecto)
+    return por_cliente
+
+
+def validar_estado(estado: str) -> bool:
+    """
+    Valida que el estado ingresado sea uno de los permitidos.
     
-    porcentaje = (tareas_completadas / horas_estimadas) * 100
-    return min(porcentaje, 100.0)  # Limitar a máximo 100%
+    Args:
+        estado (str): Estado a validar.
+        
+    Returns:
+        bool: True si el estado es válido, False en caso contrario.
+    """
+    return estado in ESTADOS_VALIDOS
 
 
 def validar_prioridad(prioridad: str) -> tuple:
@@ -109,3 +210,26 @@ def validar_prioridad(prioridad: str) -> tuple:
     
     return (prioridad_normalizada, PRIORIDADES_VALIDAS[prioridad_normalizada])
 
+
+def clave_periodo(fecha: str, periodo: str) -> str:
+    """
+    Convierte una fecha YYYY-MM-DD en la clave del período que la contiene.
+    Las claves ordenan cronológicamente como texto.
+    
+    Args:
+        fecha (str): Fecha en formato YYYY-MM-DD.
+        periodo (str): "semana" (semana ISO) o "mes".
+        
+    Returns:
+        str: "AAAA-Www" para semanas o "AAAA-MM" para meses.
+        
+    Raises:
+        ValueError: Si la fecha no es válida o el período no existe.
+    """
+    dia = date.fromisoformat(fecha)
+    if periodo == "mes":
+        return f"{dia.year:04d}-{dia.month:02d}"
+    if periodo == "semana":
+        anio, semana, _ = dia.isocalendar()
+        return f"{anio:04d}-W{semana:02d}"
+    raise ValueError(f"Período inválido: {periodo!r}")